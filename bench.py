@@ -0,0 +1,455 @@
+# -*- coding: utf-8 -*-
+"""
+Offline benchmarks for Mira Bot hot paths.
+
+Nothing here talks to Telegram or Google: the Bot API is a local httpx
+MockTransport and the spreadsheet is an in-process fake with configurable
+latency that counts calls per operation.
+
+    python bench.py classifier                 # classifier latency vs vocabulary size
+    python bench.py logging                    # per-update request-path logging cost
+    python bench.py ingest                     # per-update CPU to parse and route a webhook body
+    python bench.py webhook --updates 2000     # replay synthetic updates into webhook()
+    python bench.py scheduler --users 5000     # one DailyScheduler tick over N users
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import string
+import logging
+import asyncio
+import argparse
+import tempfile
+import threading
+import timeit
+from collections import Counter
+from urllib.parse import parse_qs
+
+# Keep every file the bot writes out of the working tree.
+_BENCH_DIR = tempfile.mkdtemp(prefix="mira-bench-")
+for _key, _name in [("STATE_DB_PATH", "state.db"), ("STORE_DB_PATH", "store.db"),
+                    ("MEDIA_CACHE_PATH", "media.json"), ("LOG_SPILL_PATH", "spill.ndjson"),
+                    ("LEADER_LOCK_PATH", "leader.lock"), ("SNAPSHOT_PATH", "snapshot.json")]:
+    os.environ.setdefault(_key, os.path.join(_BENCH_DIR, _name))
+os.environ.setdefault("STORE_BACKEND", "memory")
+os.environ.setdefault("WEBHOOK_URL", "https://bench.invalid")
+
+import httpx  # noqa: E402
+from telegram import Update  # noqa: E402
+from telegram.request import HTTPXRequest  # noqa: E402
+
+import main  # noqa: E402
+
+SAMPLE_MESSAGES = [
+    "Beer 350ml x 5",
+    "I really want a drink tonight",
+    "အရက်သောက်ချင်တယ်",
+    "ဘီယာ 650ml x 3",
+    "Good morning! Feeling great today, day 12 and counting.",
+    "Red Wine 150 ml × 2",
+    "Had a long day at work, but I went for a run instead of the bar.",
+    "/status",
+]
+
+
+def _percentiles(values):
+    values = sorted(values)
+    if not values:
+        return 0.0, 0.0
+    return (values[int(0.50 * (len(values) - 1))] * 1000,
+            values[int(0.99 * (len(values) - 1))] * 1000)
+
+
+def _per_message_us(fn, messages, repeat=5, number=200):
+    best = min(timeit.repeat(lambda: [fn(m) for m in messages], repeat=repeat, number=number))
+    return best / (number * len(messages)) * 1e6
+
+
+# --- Google Sheets stand-in -------------------------------------------------
+class FakeWorksheet:
+    """The subset of gspread.Worksheet the store uses, with per-call latency."""
+
+    def __init__(self, title, latency, calls):
+        self.title = title
+        self.latency = latency
+        self.calls = calls
+        self.data = []
+        self.lock = threading.Lock()
+
+    def _call(self, op):
+        self.calls[f"{self.title}.{op}"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def append_row(self, row, **kwargs):
+        return self.append_rows([row])
+
+    def append_rows(self, rows, **kwargs):
+        self._call("append_rows")
+        with self.lock:
+            first = len(self.data) + 1
+            self.data.extend([str(v) for v in r] for r in rows)
+            return {"updates": {"updatedRange": f"{self.title}!A{first}:Z{len(self.data)}"}}
+
+    def col_values(self, col):
+        self._call("col_values")
+        return [r[col - 1] if len(r) >= col else "" for r in self.data]
+
+    def get(self, range_name):
+        self._call("get")
+        m = re.match(r"[A-Z]+(\d+)(?::[A-Z]+(\d+))?", range_name)
+        first = int(m.group(1))
+        last = int(m.group(2) or first)
+        return [list(r) for r in self.data[first - 1:last]]
+
+    def row_values(self, row):
+        self._call("row_values")
+        return list(self.data[row - 1]) if row <= len(self.data) else []
+
+    def update(self, values, range_name):
+        self._call("update")
+        m = re.match(r"([A-Z]+)(\d+)", range_name)
+        r = self.data[int(m.group(2)) - 1]
+        col = ord(m.group(1)) - ord("A")
+        r.extend([""] * (col + len(values[0]) - len(r)))
+        r[col:col + len(values[0])] = [str(v) for v in values[0]]
+
+    def update_cell(self, row, col, value):
+        self._call("update_cell")
+        r = self.data[row - 1]
+        r.extend([""] * (col - len(r)))
+        r[col - 1] = str(value)
+
+    def batch_update(self, updates):
+        self._call("batch_update")
+        for u in updates:
+            row = int(re.match(r"[A-Z]+(\d+)", u["range"]).group(1))
+            self.data[row - 1] = [str(v) for v in u["values"][0]]
+
+    def get_all_values(self):
+        self._call("get_all_values")
+        return [list(r) for r in self.data]
+
+
+class FakeSpreadsheet:
+    def __init__(self, latency):
+        self.calls = Counter()
+        self.latency = latency
+        self.sheets = {}
+
+    def worksheet(self, title):
+        if title not in self.sheets:
+            raise main.WorksheetNotFound(title)
+        return self.sheets[title]
+
+    def add_worksheet(self, title, rows, cols):
+        self.sheets[title] = FakeWorksheet(title, self.latency, self.calls)
+        return self.sheets[title]
+
+    def open(self, name):
+        return self
+
+
+def use_store(kind, latency, workers=1):
+    """Point main.store at a fresh backend; returns the fake sheet for 'sheets'."""
+    main.WORKERS = workers
+    sheet = None
+    if kind == "sheets":
+        sheet = FakeSpreadsheet(latency)
+        main.GS_AVAILABLE = True
+        main.GOOGLE_CREDENTIALS = "{}"
+        main.gspread.service_account_from_dict = lambda creds: sheet
+    main.STORE_BACKEND = kind
+    main.store.ready.wait()
+    main.store.set_backend(main.connect_store())
+    if sheet:
+        sheet.calls.clear()
+    return sheet
+
+
+# --- Telegram Bot API stand-in ----------------------------------------------
+class FakeBotAPI:
+    """Answers Bot API methods locally after `latency` seconds and counts them."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = Counter()
+        self.message_id = 0
+
+    def _payload(self, request):
+        body = request.content.decode() if request.content else ""
+        if "json" in request.headers.get("content-type", ""):
+            return json.loads(body or "{}")
+        return {k: v[0] for k, v in parse_qs(body).items()}
+
+    async def __call__(self, request):
+        method = request.url.path.rsplit("/", 1)[-1]
+        self.calls[method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        payload = self._payload(request)
+        if method == "getMe":
+            result = {"id": 1, "is_bot": True, "first_name": "Mira", "username": "mira_bench_bot"}
+        elif method == "getWebhookInfo":
+            result = {"url": "", "has_custom_certificate": False, "pending_update_count": 0}
+        elif method in ("sendMessage", "sendPhoto"):
+            self.message_id += 1
+            chat_id = int(str(payload.get("chat_id", 1)).strip('"'))
+            result = {"message_id": self.message_id, "date": int(time.time()),
+                      "chat": {"id": chat_id, "type": "private"}}
+            if method == "sendPhoto":
+                result["photo"] = [{"file_id": f"photo-{hash(payload.get('photo')) & 0xffff}",
+                                    "file_unique_id": "u", "width": 1, "height": 1}]
+        else:
+            result = True
+        return httpx.Response(200, json={"ok": True, "result": result})
+
+
+class FakeRequest(HTTPXRequest):
+    def __init__(self, api, **kwargs):
+        self.api = api
+        super().__init__(**kwargs)
+
+    def _build_client(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.api), **{
+            k: v for k, v in self._client_kwargs.items() if k in ("timeout", "limits")})
+
+
+def start_fake_bot(api_latency):
+    """Run the real Application on its own loop against the fake Bot API."""
+    api = FakeBotAPI(api_latency)
+    main.TELEGRAM_TOKEN = "123456:BENCH"
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    app = main.build_application(request=FakeRequest(api, connection_pool_size=64))
+    asyncio.run_coroutine_threadsafe(main.init_bot(app), loop).result()
+    main.bot_app, main.bot_loop = app, loop
+    main.bot_ready.set()
+    api.calls.clear()
+    return api, app, loop
+
+
+def synthetic_update(update_id, chat_id, text):
+    msg = {"message_id": update_id, "date": int(time.time()),
+           "chat": {"id": chat_id, "type": "private"},
+           "from": {"id": chat_id, "is_bot": False, "first_name": "User", "username": f"u{chat_id}"},
+           "text": text}
+    if text.startswith("/"):
+        msg["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+    return {"update_id": update_id, "message": msg}
+
+
+# --- benchmarks -------------------------------------------------------------
+def bench_classifier(args):
+    print(f"{'vocab':>7} {'trie regex us/msg':>19} {'naive us/msg':>13}")
+    relapse_re = re.compile(r"([A-Za-z\u1000-\u109F ]+)\s*(\d+ml)?\s*[x×*]\s*(\d+)", re.I)
+    for size in args.sizes:
+        rnd = random.Random(7)
+        extra = ["".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(4, 12))) for _ in range(size)]
+        clf = main.MessageClassifier(main.CRAVING_KEYWORDS + extra, main.BEVERAGES)
+        keywords = [k.lower() for k in main.CRAVING_KEYWORDS + extra]
+
+        def naive(text):
+            t = text.lower()
+            if any(k in t for k in keywords):
+                return "craving"
+            return relapse_re.search(text)
+
+        # _classify bypasses the LRU cache so every call does the full scan.
+        fast = _per_message_us(clf._classify, SAMPLE_MESSAGES)
+        slow = _per_message_us(naive, SAMPLE_MESSAGES)
+        print(f"{len(keywords):>7} {fast:>19.2f} {slow:>13.2f}")
+
+
+def bench_logging(args):
+    import io
+    bot = main.Application.builder().token("123456:BENCH").build().bot
+    updates = [Update.de_json(synthetic_update(i, 1000 + i, SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)]), bot)
+               for i in range(200)]
+    data = [u.to_dict() for u in updates]
+    sink = logging.StreamHandler(io.StringIO())
+    old_logger, new_logger = logging.getLogger("bench.old"), logging.getLogger("bench.new")
+    for lg in (old_logger, new_logger):
+        lg.propagate = False
+        lg.handlers = [sink]
+
+    def old_path():
+        for u in updates:
+            old_logger.info(f"📩 Incoming update: {u.to_dict()}")
+
+    def new_path():
+        for u, d in zip(updates, data):
+            if new_logger.isEnabledFor(logging.DEBUG):
+                chat = u.effective_chat
+                new_logger.debug("📩 Incoming update %s", u.update_id, extra={
+                    "update_id": u.update_id, "chat_id": chat.id if chat else None,
+                    "kind": next((k for k in d if k != "update_id"), None)})
+
+    def run(label, fn):
+        best = min(timeit.repeat(fn, repeat=5, number=5)) / (5 * len(updates)) * 1e6
+        print(f"{label:<44} {best:>8.2f} us/update")
+
+    old_logger.setLevel(logging.INFO)
+    sink.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    run("before: INFO f-string of update.to_dict()", old_path)
+    new_logger.setLevel(logging.INFO)
+    run("after: debug record, logger at INFO", new_path)
+    new_logger.setLevel(logging.DEBUG)
+    sink.setFormatter(main.JsonFormatter(main.LOG_JSON_FIELDS))
+    run("after: DEBUG enabled, JSON (orjson)", new_path)
+    new_logger.addFilter(main.SampleFilter(0.01))
+    run("after: DEBUG enabled, JSON, 1% sampled", new_path)
+
+
+def synthetic_mix(count):
+    """Webhook bodies in a realistic mix: text, commands, and updates no handler takes."""
+    rnd = random.Random(3)
+    texts = SAMPLE_MESSAGES + ["/start", "/stats", "/help"]
+    bodies = []
+    for i in range(count):
+        data = synthetic_update(i + 1, 10_000 + rnd.randrange(200), rnd.choice(texts))
+        roll = rnd.random()
+        if roll < 0.15:
+            msg = data["message"]
+            del msg["text"]
+            msg["sticker"] = {"file_id": "CAACAgIAAx", "file_unique_id": "AgAD", "width": 512, "height": 512,
+                              "is_animated": False, "is_video": False, "type": "regular"}
+        elif roll < 0.25:
+            data["edited_message"] = dict(data.pop("message"), edit_date=int(time.time()))
+        bodies.append(json.dumps(data).encode())
+    return bodies
+
+
+def bench_ingest(args):
+    bot = main.Application.builder().token("123456:BENCH").build().bot
+    bodies = synthetic_mix(args.updates)
+
+    def old_path():
+        # Previous webhook(): stdlib JSON, then a full Update for every body.
+        for raw in bodies:
+            Update.de_json(json.loads(raw), bot)
+
+    def new_path():
+        for raw in bodies:
+            data = main.parse_update(raw)
+            if data and main.route_update(data):
+                Update.de_json(data, bot)
+
+    routed = Counter(main.route_update(main.parse_update(raw)) for raw in bodies)
+    print(f"updates: {len(bodies)}  routes: {dict(routed)}  orjson: {main.orjson is not None}")
+    for label, fn in [("before: json.loads + Update.de_json", old_path),
+                      ("after: parse_update + route_update (+ de_json if routed)", new_path)]:
+        best = min(timeit.repeat(fn, repeat=5, number=1)) / len(bodies) * 1e6
+        print(f"{label:<58} {best:>8.2f} us/update")
+
+
+def bench_webhook(args):
+    sheet = use_store(args.store, args.sheets_latency, args.workers)
+    api, app, loop = start_fake_bot(args.api_latency)
+    client = main.flask_app.test_client()
+    rnd = random.Random(1)
+    texts = SAMPLE_MESSAGES + ["/start", "/stats"]
+    payloads = [json.dumps(synthetic_update(i + 1, 10_000 + rnd.randrange(args.chats), rnd.choice(texts)))
+                for i in range(args.updates)]
+
+    latencies, busy = [], 0
+    started = time.perf_counter()
+    for body in payloads:
+        while True:
+            t0 = time.perf_counter()
+            resp = client.post(main.WEBHOOK_PATH, data=body, content_type="application/json")
+            latencies.append(time.perf_counter() - t0)
+            if resp.status_code != 503:
+                break
+            busy += 1
+            time.sleep(0.001)
+    accepted = time.perf_counter() - started
+    while main.WEBHOOK_INFLIGHT.values.get((), 0) > 0:
+        time.sleep(0.001)
+    drained = time.perf_counter() - started
+    main.log_writer.flush()
+    if hasattr(main.store.backend, "flush"):
+        main.store.backend.flush()
+
+    p50, p99 = _percentiles(latencies)
+    print(f"updates: {args.updates} from {args.chats} chats, store={args.store}, busy retries={busy}")
+    print(f"webhook throughput: {args.updates / accepted:,.0f} req/s   end-to-end: {args.updates / drained:,.0f} updates/s")
+    print(f"webhook latency: p50 {p50:.3f} ms   p99 {p99:.3f} ms")
+    print(f"Bot API calls: {dict(api.calls)}")
+    if sheet:
+        print(f"Sheets calls: {dict(sheet.calls)}")
+
+
+def bench_scheduler(args):
+    sheet = use_store(args.store, 0, args.workers)
+    hhmm = main.datetime.now(main.TIMEZONE).strftime("%H:%M")
+    for i in range(args.users):
+        cid = 10_000 + i
+        main.store.ensure_user(cid, f"u{cid}")
+        main.store.set_last_sober(cid, (main.date.today() - main.timedelta(days=i % 40)).isoformat())
+        main.store.set_reminder_time(cid, "morning", hhmm)  # everyone is due this minute
+    if hasattr(main.store.backend, "flush"):
+        main.store.backend.flush()
+    if sheet:
+        sheet.calls.clear()
+        for ws in sheet.sheets.values():
+            ws.latency = args.sheets_latency
+
+    api, app, loop = start_fake_bot(args.api_latency)
+    sched = main.DailyScheduler(loop, app)
+    sched.broadcaster = main.Broadcaster(rate=args.rate, concurrency=args.concurrency)
+    now = time.time()
+
+    t0 = time.perf_counter()
+    sched.sync_users()
+    sync = time.perf_counter() - t0
+    due = sched._wait_due(now + 1)
+    t0 = time.perf_counter()
+    sched.fire(due)
+    fire = time.perf_counter() - t0
+
+    print(f"users: {args.users}, store={args.store}, due entries: {len(due)}")
+    print(f"sync_users: {sync * 1000:.1f} ms   fire (incl. broadcast): {fire * 1000:.1f} ms")
+    print(f"messages: {sum(api.calls.values())} sent, {len(due) / fire:,.0f} users/s")
+    print(f"Bot API calls: {dict(api.calls)}")
+    if sheet:
+        print(f"Sheets calls: {dict(sheet.calls)}")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("classifier", help="classifier latency vs vocabulary size")
+    p.add_argument("--sizes", type=int, nargs="+", default=[0, 100, 1000, 10000])
+    p.set_defaults(func=bench_classifier)
+
+    p = sub.add_parser("logging", help="request-path logging cost per update")
+    p.set_defaults(func=bench_logging)
+
+    p = sub.add_parser("ingest", help="per-update CPU to parse and route a webhook body")
+    p.add_argument("--updates", type=int, default=2000)
+    p.set_defaults(func=bench_ingest)
+
+    for name, func, count in [("webhook", bench_webhook, "--updates"), ("scheduler", bench_scheduler, "--users")]:
+        p = sub.add_parser(name)
+        p.add_argument(count, type=int, default=1000)
+        p.add_argument("--store", choices=["memory", "sqlite", "sheets"], default="sheets")
+        p.add_argument("--workers", type=int, default=1, help="WEB_CONCURRENCY to emulate (>1 disables the cache)")
+        p.add_argument("--sheets-latency", type=float, default=0.0, help="seconds per fake Sheets call")
+        p.add_argument("--api-latency", type=float, default=0.0, help="seconds per fake Bot API call")
+        p.set_defaults(func=func)
+    sub.choices["webhook"].add_argument("--chats", type=int, default=200)
+    sub.choices["scheduler"].add_argument("--rate", type=float, default=1e6, help="broadcast msgs/s")
+    sub.choices["scheduler"].add_argument("--concurrency", type=int, default=32)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main_cli(sys.argv[1:])
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""Test setup shared by every test module; runs before main is imported."""
+
+import os
+import tempfile
+
+# Keep every file the bot writes out of the working tree.
+_TEST_DIR = tempfile.mkdtemp(prefix="mira-test-")
+for _key, _name in [("STATE_DB_PATH", "state.db"), ("STORE_DB_PATH", "store.db"),
+                    ("MEDIA_CACHE_PATH", "media.json"), ("LOG_SPILL_PATH", "spill.ndjson"),
+                    ("LEADER_LOCK_PATH", "leader.lock"), ("SNAPSHOT_PATH", "snapshot.json")]:
+    os.environ.setdefault(_key, os.path.join(_TEST_DIR, _name))
+os.environ.setdefault("STORE_BACKEND", "memory")
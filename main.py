@@ -3,336 +3,507 @@
 Mira Alcohol-Free Bot (v8)
 ----------------------------------------
 ✅ Telegram bot + Flask Webhook (Render compatible)
+✅ Optional ASGI mode (SERVER_MODE=asgi) on a single event loop
+✅ Webhook secret token check (WEBHOOK_SECRET)
 ✅ Google Sheets optional integration
 ✅ Daily motivational photos + milestone rewards
+✅ Per-user time zones (/timezone) for reminders and streaks
 ✅ Safe event loop + Gunicorn production-ready
 """
 
 import os
+import sys
 import json
+import hmac
 import random
 import logging
 import threading
 import re
 import time
+import atexit
+import asyncio
+import sqlite3
+import queue
+import heapq
+import itertools
+import shlex
+from array import array
+from functools import lru_cache, partial, wraps
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+from collections import namedtuple, deque, OrderedDict
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
 from datetime import datetime, date, time as dtime, timedelta
 import pytz
 
+STARTED_AT = time.monotonic()
+startup_timings = {}
+
 from flask import Flask, request
 from telegram import Update
+from telegram.error import TelegramError, RetryAfter, NetworkError, BadRequest
 from telegram.ext import Application, CommandHandler, MessageHandler, filters
 
+try:
+    import fcntl
+except ImportError:  # non-POSIX: no cross-process lock, every process leads
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # --- Optional Google Sheets ---
 try:
     import gspread
-    from gspread.exceptions import WorksheetNotFound, CellNotFound
+    from gspread.exceptions import WorksheetNotFound
     GS_AVAILABLE = True
 except Exception:
     GS_AVAILABLE = False
 
+
+def _detect_workers():
+    """(worker processes sharing this host's store, how that was decided).
+
+    WEB_CONCURRENCY wins. Under gunicorn or uvicorn, `-w N` / `--workers N`
+    is read from the command line or GUNICORN_CMD_ARGS; without it both
+    default to one worker. Only a gunicorn config file (`-c`, or
+    ./gunicorn.conf.py) can hide the count; then several workers are
+    assumed, so the store takes the shared, uncached path instead of
+    per-process caches that would overwrite each other.
+    """
+    if os.getenv("WEB_CONCURRENCY"):
+        return int(os.environ["WEB_CONCURRENCY"]), "WEB_CONCURRENCY"
+    server = os.path.basename(sys.argv[0] if sys.argv else "")
+    if not any(name in server for name in ("gunicorn", "uvicorn")) and \
+            "gunicorn" not in os.environ.get("SERVER_SOFTWARE", "").lower():
+        return 1, "no multi-worker server"
+    args = sys.argv[1:] + shlex.split(os.getenv("GUNICORN_CMD_ARGS", ""))
+    config = os.path.exists("gunicorn.conf.py") and "gunicorn" in server
+    for i, arg in enumerate(args):
+        if arg in ("-w", "--workers") and i + 1 < len(args):
+            value = args[i + 1]
+        elif arg.startswith("--workers="):
+            value = arg.split("=", 1)[1]
+        elif arg.startswith("-w") and len(arg) > 2:
+            value = arg[2:]
+        else:
+            config = config or arg in ("-c", "--config") or arg.startswith(("--config=", "-c"))
+            continue
+        if value.isdigit():
+            return int(value), f"{server} {arg}"
+    if config:
+        return 2, f"{server} config file may set workers; assuming several"
+    return 1, f"{server} default"
+
+
 # === CONFIG ===
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 WEBHOOK_URL_BASE = os.getenv("WEBHOOK_URL", "https://mira-bot-v2.onrender.com")
 WEBHOOK_PATH = "/webhook"
 WEBHOOK_URL = WEBHOOK_URL_BASE.rstrip("/") + WEBHOOK_PATH
+# Sent by Telegram in X-Telegram-Bot-Api-Secret-Token on every webhook call
+# (1-256 chars of A-Z, a-z, 0-9, _ and -); requests without it get 403.
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
 GOOGLE_SHEET_NAME = os.getenv("GOOGLE_SHEET_NAME", "MiraNotificationDB")
 GOOGLE_CREDENTIALS = os.getenv("GOOGLE_CREDENTIALS")
 TIMEZONE = pytz.timezone("Asia/Yangon")
 PORT = int(os.environ.get("PORT", 8080))
+# Write-back cache: seconds between flushes to Sheets (0 = write-through),
+# and the max number of unflushed users before an early flush is forced.
+STORE_FLUSH_INTERVAL = float(os.getenv("STORE_FLUSH_INTERVAL", "5"))
+STORE_MAX_DIRTY = int(os.getenv("STORE_MAX_DIRTY", "50"))
+# Outbound broadcast limits (Telegram allows ~30 msg/s globally).
+BROADCAST_RATE = float(os.getenv("BROADCAST_RATE", "25"))
+BROADCAST_CONCURRENCY = int(os.getenv("BROADCAST_CONCURRENCY", "8"))
+BROADCAST_RETRIES = int(os.getenv("BROADCAST_RETRIES", "3"))
+MEDIA_CACHE_PATH = os.getenv("MEDIA_CACHE_PATH", "media_cache.json")
+# A reminder whose time passed less than this long ago (e.g. during a
+# restart) is still delivered; older ones roll over to the next day.
+REMINDER_GRACE = timedelta(minutes=int(os.getenv("REMINDER_GRACE_MINUTES", "60")))
+SCHEDULER_RESYNC = int(os.getenv("SCHEDULER_RESYNC", "600"))
+SCHEDULER_BULK_READ = int(os.getenv("SCHEDULER_BULK_READ", "50"))
+# Streaks advance every MILESTONE_INTERVAL seconds; queued milestone messages
+# are sent every MILESTONE_POLL seconds, failures retried with backoff up to
+# MILESTONE_RETRIES times.
+MILESTONE_INTERVAL = int(os.getenv("MILESTONE_INTERVAL", "600"))
+MILESTONE_POLL = int(os.getenv("MILESTONE_POLL", "30"))
+MILESTONE_RETRIES = int(os.getenv("MILESTONE_RETRIES", "5"))
+STATE_DB_PATH = os.getenv("STATE_DB_PATH", "mira_state.db")
+# Deliveries are recorded this often (seconds) while a broadcast runs, so a
+# restart mid-broadcast resends at most the last interval's messages.
+DELIVERY_FLUSH_INTERVAL = float(os.getenv("DELIVERY_FLUSH_INTERVAL", "1"))
+# Updates handed to the bot loop but not finished yet; beyond this the
+# webhook answers 503 so Telegram retries later.
+WEBHOOK_MAX_INFLIGHT = int(os.getenv("WEBHOOK_MAX_INFLIGHT", "100"))
+# Updates processed at once across all chats; one chat's updates still run in order.
+UPDATE_CONCURRENCY = int(os.getenv("UPDATE_CONCURRENCY", "16"))
+# Inbound protection: recently seen update_ids are dropped (Telegram retries
+# slow deliveries), and each chat gets CHAT_RATE updates/s with CHAT_BURST burst.
+DEDUP_SIZE = int(os.getenv("DEDUP_SIZE", "4096"))
+CHAT_RATE = float(os.getenv("CHAT_RATE", "1"))
+CHAT_BURST = float(os.getenv("CHAT_BURST", "5"))
+THROTTLE_NOTICE_INTERVAL = float(os.getenv("THROTTLE_NOTICE_INTERVAL", "60"))
+# "flask" (legacy: Flask/gunicorn + bot thread) or "asgi" (single event loop,
+# run with `python main.py` or `uvicorn main:asgi_app`).
+SERVER_MODE = os.getenv("SERVER_MODE", "flask").lower()
+# Several gunicorn workers share one host: only the holder of this lock runs
+# the scheduler and registers the webhook; the others take over if it dies.
+WORKERS, WORKERS_SOURCE = _detect_workers()
+LEADER_LOCK_PATH = os.getenv("LEADER_LOCK_PATH", "mira_leader.lock")
+LEADER_RETRY = int(os.getenv("LEADER_RETRY", "15"))
+# Store backend: "sheets", "sqlite" or "memory". Empty picks Sheets when
+# credentials are set, else SQLite for multiple workers, else memory.
+STORE_BACKEND = os.getenv("STORE_BACKEND", "").lower()
+STORE_DB_PATH = os.getenv("STORE_DB_PATH", "mira_store.db")
+# The in-memory store is snapshotted here every SNAPSHOT_INTERVAL seconds
+# (when changed) and at exit, and reloaded on start. Empty disables it.
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "mira_snapshot.json")
+SNAPSHOT_INTERVAL = float(os.getenv("SNAPSHOT_INTERVAL", "60"))
+# Relapse log rows are queued and written in one batch per interval; rows
+# that still fail after retries are spilled here and replayed later.
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "2"))
+LOG_SPILL_PATH = os.getenv("LOG_SPILL_PATH", "relapse_spill.ndjson")
+# Handlers reach the store through a bounded thread pool with per-call
+# timeouts; after STORE_BREAKER_FAILURES consecutive errors calls fail fast
+# for STORE_BREAKER_COOLDOWN seconds and reads use the last known data.
+# Writes that fail are retried every STORE_RETRY_INTERVAL seconds.
+STORE_WORKERS = int(os.getenv("STORE_WORKERS", "4"))
+STORE_TIMEOUT = float(os.getenv("STORE_TIMEOUT", "3"))
+STORE_BREAKER_FAILURES = int(os.getenv("STORE_BREAKER_FAILURES", "5"))
+STORE_BREAKER_COOLDOWN = float(os.getenv("STORE_BREAKER_COOLDOWN", "30"))
+STORE_RETRY_INTERVAL = float(os.getenv("STORE_RETRY_INTERVAL", "10"))
+# Optional JSON vocabulary for the message classifier:
+# {"craving": ["..."], "beverages": {"beer": ["beer", "ဘီယာ"], ...}}
+VOCAB_PATH = os.getenv("VOCAB_PATH")
+# Max seconds a store call waits for the background store connection, and
+# a Flask webhook request waits for the bot to finish starting.
+STORE_READY_TIMEOUT = float(os.getenv("STORE_READY_TIMEOUT", "30"))
+BOT_READY_TIMEOUT = float(os.getenv("BOT_READY_TIMEOUT", "10"))
+CONTENT_PATH = os.getenv("CONTENT_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "content", "messages.json"))
 
 # === LOGGING (Gunicorn Forward Compatible) ===
+# LOG_FORMAT=json emits one orjson line per record with only the extra fields
+# allowlisted in LOG_JSON_FIELDS. LOG_LEVELS / LOG_SAMPLE take "logger=value"
+# pairs, e.g. LOG_LEVELS="mira-bot.webhook=DEBUG" LOG_SAMPLE="mira-bot.webhook=0.01".
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_JSON_FIELDS = [f for f in os.getenv("LOG_JSON_FIELDS", "update_id,chat_id,kind,status,method").split(",") if f]
+
+
+def _parse_pairs(value):
+    pairs = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            k, v = item.split("=", 1)
+            pairs[k.strip()] = v.strip()
+    return pairs
+
+
+class JsonFormatter(logging.Formatter):
+    def __init__(self, fields):
+        super().__init__()
+        self.fields = fields
+
+    def format(self, record):
+        out = {"ts": round(record.created, 3), "level": record.levelname,
+               "logger": record.name, "msg": record.getMessage()}
+        for k in self.fields:
+            v = record.__dict__.get(k)
+            if v is not None:
+                out[k] = v
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        if orjson is not None:
+            return orjson.dumps(out, default=str).decode()
+        return json.dumps(out, default=str, ensure_ascii=False)
+
+
+class SampleFilter(logging.Filter):
+    """Keeps one in every 1/rate records below WARNING; warnings always pass."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self.n = 0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        if not self.every:
+            return False
+        self.n += 1
+        return self.n % self.every == 0
+
+
 gunicorn_error_logger = logging.getLogger('gunicorn.error')
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=gunicorn_error_logger.handlers or [logging.StreamHandler()]
 )
+if LOG_FORMAT == "json":
+    for _h in logging.getLogger().handlers:
+        _h.setFormatter(JsonFormatter(LOG_JSON_FIELDS))
+for _name, _level in _parse_pairs(os.getenv("LOG_LEVELS")).items():
+    logging.getLogger(_name).setLevel(_level.upper())
+for _name, _rate in _parse_pairs(os.getenv("LOG_SAMPLE")).items():
+    logging.getLogger(_name).addFilter(SampleFilter(float(_rate)))
 logger = logging.getLogger("mira-bot")
+webhook_logger = logging.getLogger("mira-bot.webhook")
+logger.info(f"Workers: {WORKERS} ({WORKERS_SOURCE})")
+
+# === METRICS (Prometheus text format on /metrics) ===
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.lock = threading.Lock()
+        self.values = {}
+        METRICS.append(self)
+
+    def _label_str(self, values, extra=""):
+        pairs = [f'{k}="{v}"' for k, v in zip(self.labels, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            items = list(self.values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{self._label_str(labels)} {value}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, value=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, *labels):
+        with self.lock:
+            self.values[labels] = value
+
+    def inc(self, *labels, value=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + value
+
+    def dec(self, *labels, value=1):
+        self.inc(*labels, value=-value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, name, help_text, labels=(), buckets=None):
+        super().__init__(name, help_text, labels)
+        if buckets:
+            self.BUCKETS = tuple(buckets)
+
+    def observe(self, value, *labels):
+        i = bisect_left(self.BUCKETS, value)
+        with self.lock:
+            h = self.values.get(labels)
+            if h is None:
+                h = self.values[labels] = [[0] * (len(self.BUCKETS) + 1), 0.0]
+            h[0][i] += 1
+            h[1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, *labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            items = [(labels, list(h[0]), h[1]) for labels, h in self.values.items()]
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, n in zip(self.BUCKETS + ("+Inf",), counts):
+                cumulative += n
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{self._label_str(labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_str(labels)} {total}")
+            lines.append(f"{self.name}_count{self._label_str(labels)} {cumulative}")
+        return lines
+
+
+METRICS = []
+WEBHOOK_UPDATES = Counter("mira_webhook_updates_total", "Webhook requests by outcome", ("status",))
+WEBHOOK_SECONDS = Histogram("mira_webhook_seconds", "Time spent in the webhook request handler")
+UPDATE_SECONDS = Histogram("mira_update_seconds", "Update processing time on the bot loop")
+HANDLER_SECONDS = Histogram("mira_handler_seconds", "Telegram handler latency", ("handler",))
+HANDLER_ERRORS = Counter("mira_handler_errors_total", "Telegram handler exceptions", ("handler",))
+STORE_SECONDS = Histogram("mira_store_seconds", "Store call latency seen by callers (cache hits included)", ("method",))
+STORE_ERRORS = Counter("mira_store_errors_total", "Store call failures seen by callers", ("method",))
+BACKEND_SECONDS = Histogram("mira_store_backend_seconds", "Sheets/SQLite call latency", ("backend", "method"))
+BACKEND_ERRORS = Counter("mira_store_backend_errors_total", "Sheets/SQLite call failures", ("backend", "method"))
+SCHEDULER_TICK_SECONDS = Histogram("mira_scheduler_tick_seconds", "Scheduler fire() duration")
+BROADCAST_SECONDS = Histogram("mira_broadcast_seconds", "Duration of one broadcast run", ("name",))
+BROADCAST_SEND_SECONDS = Histogram("mira_broadcast_send_seconds", "Latency of one outbound send", ("name",))
+BROADCAST_MESSAGES = Counter("mira_broadcast_messages_total", "Scheduled messages by outcome", ("name", "result"))
+WEBHOOK_INFLIGHT = Gauge("mira_webhook_inflight", "Updates accepted but not finished")
+WEBHOOK_DROPPED = Counter("mira_webhook_dropped_total", "Updates dropped before decoding", ("reason",))
+CHAT_LANES = Gauge("mira_chat_lanes", "Chats with updates queued or running")
+CHAT_LANE_DEPTH = Histogram("mira_chat_lane_depth", "Updates ahead in the chat's lane on arrival",
+                            buckets=(0, 1, 2, 4, 8, 16, 32))
+
+
+def render_metrics():
+    lines = []
+    for m in METRICS:
+        lines.extend(m.render())
+    return "\n".join(lines) + "\n"
+
+
+def instrumented(name):
+    """Time an async Telegram handler and count its exceptions."""
+    def wrap(fn):
+        async def handler(update, context):
+            t0 = time.perf_counter()
+            try:
+                return await fn(update, context)
+            except Exception:
+                HANDLER_ERRORS.inc(name)
+                raise
+            finally:
+                HANDLER_SECONDS.observe(time.perf_counter() - t0, name)
+        handler.__name__ = fn.__name__
+        return handler
+    return wrap
+
+
+def timed_backend(name):
+    """Class decorator: time every public method of a storage backend.
+
+    Generators (iter_*) are skipped; they time their own reads.
+    """
+    def method(attr, fn):
+        @wraps(fn)
+        def call(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                BACKEND_ERRORS.inc(name, attr)
+                raise
+            finally:
+                BACKEND_SECONDS.observe(time.perf_counter() - t0, name, attr)
+        return call
+
+    def wrap(cls):
+        for attr, fn in list(vars(cls).items()):
+            if callable(fn) and not attr.startswith(("_", "iter_")):
+                setattr(cls, attr, method(attr, fn))
+        return cls
+    return wrap
+
 
 # === MESSAGE BANKS ===
-motivateMessages = [
-    "You've come so far—one more alcohol-free day makes your mind stronger. 💪 | သင်ဟာ ခရီး weit weit ရောက်နေပါပြီ။ အရက်မသောက်တဲ့ နောက်ထပ်တစ်ရက်က သင့်စိတ်ကို ပိုပြီးကြံ့ခိုင်စေပါတယ်။ 💪",
-    "Remember why you started. That reason is more powerful than any craving. ✨ | သင်ဘာကြောင့်စတင်ခဲ့သလဲဆိုတာကို ပြန်သတိရပါ။ အဲ့ဒီအကြောင်းผลက ဘယ်လိုတောင့်တမှုမျိုးထက်မဆို ပိုပြီးအစွမ်းထက်ပါတယ်။ ✨",
-    "Every day you choose not to drink, you are healing. Be proud of that. 🌱 | သင်အရက်မသောက်ဖို့ ရွေးချယ်လိုက်တဲ့နေ့တိုင်းဟာ သင်ကိုယ်တိုင် ပြန်လည်ကုစားနေတာပါပဲ။ အဲ့ဒီအတွက် ဂုဏ်ယူပါ။ 🌱",
-    "This moment will pass. Stay strong, and you'll wake up grateful tomorrow. 🌅 | ဒီအချိန်လေးက ပြီးသွားမှာပါ။ စိတ်ဓာတ်ခိုင်ခိုင်ထားပါ၊ မနက်ဖြန်နိုးလာတဲ့အခါ သင်ကျေးဇူးတင်နေပါလိမ့်မယ်။ 🌅",
-    "Your future self will thank you for the choice you're making right now. ⏳ | သင်အခုချလိုက်တဲ့ ဆုံးဖြတ်ချက်အတွက် သင့်ရဲ့အနာဂတ်က သင့်ကိုကျေးဇူးတင်ပါလိမ့်မယ်။ ⏳",
-    "Each sober day is a victory. Celebrate this win! 🏆 | အရက်မသောက်တဲ့နေ့တိုင်းဟာ အောင်ပွဲတစ်ခုပါ။ ဒီအောင်ပွဲကို ဂုဏ်ပြုလိုက်ပါ။ 🏆",
-    "You are reclaiming your health, your time, and your peace. 🧘 | သင်ဟာ သင့်ကျန်းမာရေး၊ သင့်အချိန်နဲ့ သင့်ရဲ့ငြိမ်းချမ်းမှုကို ပြန်လည်ရယူနေတာပါ။ 🧘",
-    "One day at a time. That's all it takes. You're doing it right now. 🕰️ | တစ်နေ့ချင်းစီပေါ့။ ဒါလေးပဲ လိုအပ်တာပါ။ သင်အခု လုပ်ဆောင်နေနိုင်ပါတယ်။ 🕰️",
-    "Think of all the mornings you'll wake up clear-headed and proud. 🌞 | ကြည်လင်တဲ့စိတ်နဲ့ ဂုဏ်ယူစွာ နိုးထရမယ့် မနက်ခင်းတွေအကြောင်း စဉ်းစားပါ။ 🌞",
-    "Your body is thanking you for this break. Listen to it. 🙏 | သင့်ခန္ဓာကိုယ်က ဒီလို အနားပေးတဲ့အတွက် သင့်ကို ကျေးဇူးတင်နေပါတယ်။ သူ့စကားကို နားထောင်ပါ။ 🙏",
-    "Sobriety is a superpower. You're getting stronger every single day. 🦸 | အရက်ကင်းစင်ခြင်းဟာ စွမ်းအားတစ်ခုပါပဲ။ သင်နေ့တိုင်း ပိုပြီး သန်မာလာနေပါတယ်။ 🦸",
-    "Don't let a bad moment ruin a day's progress. You are still moving forward. 🚶 | မကောင်းတဲ့ အခိုက်အတန့်တစ်ခုကြောင့် ကောင်းမွန်တဲ့နေ့တစ်နေ့ရဲ့ တိုးတက်မှုကို အဖျက်ဆီးမခံပါနဲ့။ သင်ရှေ့ဆက်သွားနေတုန်းပါပဲ။ 🚶",
-    "The best apology to yourself is changed behavior. You're doing it. 💖 | ကိုယ့်ကိုယ်ကိုတောင်းပန်ဖို့ အကောင်းဆုံးနည်းလမ်းက အပြုအမူကိုပြောင်းလဲခြင်းပါပဲ။ သင်လုပ်ဆောင်နေပါတယ်။ 💖",
-    "Clarity is a beautiful gift you're giving yourself. 🎁 | ကြည်လင်ပြတ်သားမှုဆိုတာ သင်ကိုယ့်ကိုယ်ကိုပေးနေတဲ့ လှပတဲ့လက်ဆောင်တစ်ခုပါ။ 🎁",
-    "You are choosing freedom over a cage. Celebrate that freedom. 🕊️ | သင်ဟာ လှောင်အိမ်တစ်ခုအစား လွတ်လပ်မှုကို ရွေးချယ်နေတာပါ။ အဲ့ဒီလွတ်လပ်မှုကို ဂုဏ်ပြုပါ။ 🕊️",
-    "Your journey inspires more people than you know. 🌟 | သင်ရဲ့ခရီးက သင်ထင်ထားတာထက် လူအများကြီးကို အားကျစေပါတယ်။ 🌟",
-    "With every 'no' to alcohol, you're saying 'yes' to a better life. 👍 | အရက်ကို 'نه' လို့ပြောလိုက်တိုင်း ပိုကောင်းတဲ့ဘဝကို 'ဟုတ်ကဲ့' လို့ ပြောနေတာပါပဲ။ 👍",
-    "This path isn't easy, but it is worth it. Keep going. 🛤️ | ဒီလမ်းက မလွယ်ကူပါဘူး၊ ဒါပေမယ့် တန်ပါတယ်။ ရှေ့ဆက်လျှောက်ပါ။ 🛤️",
-    "You are rewriting your story, one sober day at a time. 📖 | သင်ဟာ သင့်ရဲ့ဇတ်လမ်းကို အရက်မသောက်တဲ့နေ့တစ်နေ့ချင်းစီနဲ့ ပြန်လည်ရေးသားနေတာပါ။ 📖",
-    "The peace you're building within yourself is unbreakable. 💎 | သင် သင့်အတွင်းစိတ်ထဲမှာ တည်ဆောက်နေတဲ့ ငြိမ်းချမ်းမှုက မပျက်စီးနိုင်ပါဘူး။ 💎",
-    "Let your progress be your motivation. Look how far you've come! 📈 | သင်ရဲ့တိုးတက်မှုကို သင်ရဲ့ခွန်အားအဖြစ်သုံးပါ။ သင်ဘယ်လောက် weit weit ရောက်နေပြီလဲ ကြည့်လိုက်ပါ။ 📈",
-    "You are stronger than your cravings. Remember that. 💪 | သင်ဟာ သင့်ရဲ့တောင့်တမှုတွေထက် ပိုပြီးသန်မာပါတယ်။ ဒါကိုသတိရပါ။ 💪",
-    "Choosing sobriety is an act of radical self-love. ❤️ | အရက်ကင်းစင်မှုကိုရွေးချယ်ခြင်းဟာ ကိုယ့်ကိုယ်ကို အဆုံးစွန်ချစ်ခြင်းတစ်မျိုးပါပဲ။ ❤️",
-    "Every sunrise is a new opportunity to honor your commitment. 🌅 | နေထွက်ချိန်တိုင်းဟာ သင်ရဲ့ကတိကို လေးစားလိုက်နာဖို့ အခွင့်အရေးသစ်တစ်ခုပါ။ 🌅",
-    "The small steps each day add up to a huge transformation. 🪜 | နေ့စဉ်လှမ်းနေတဲ့ ခြေလှမ်းသေးသေးလေးတွေက ကြီးမားတဲ့ပြောင်းလဲမှုကြီးတစ်ခု ဖြစ်လာစေပါတယ်။ 🪜",
-    "You are capable of amazing things, and this is one of them. ✨ | သင်ဟာ အံ့ဩစရာကောင်းတဲ့အရာတွေကို လုပ်ဆောင်နိုင်စွမ်းရှိပြီး၊ ဒါက အဲ့ဒီထဲကတစ်ခုပါပဲ။ ✨",
-    "Feel the pride in knowing you are in control of your choices. 🎮 | သင်ဟာ သင့်ရဲ့ရွေးချယ်မှုတွေကို ထိန်းချုပ်နိုင်တယ်ဆိုတာသိခြင်းရဲ့ ဂုဏ်ယူမှုကို ခံစားလိုက်ပါ။ 🎮",
-    "Your mind is becoming clearer, and your spirit is becoming lighter. 🕊️ | သင့်စိတ်တွေ ပိုကြည်လင်လာပြီး သင့်ရဲ့ဝိညာဉ်က ပိုပေါ့ပါးလာနေပါတယ်။ 🕊️",
-    "This journey is about progress, not perfection. Keep making progress. 👣 | ဒီခရီးက ပြည့်စုံဖို့မဟုတ်ဘဲ တိုးတက်ဖို့အတွက်ပါ။ ဆက်ပြီးတိုးတက်အောင်လုပ်ဆောင်ပါ။ 👣",
-    "You are building a foundation for a happier, healthier future. 🏗️ | သင်ဟာ ပိုပျော်ရွှင်ပြီး ကျန်းမာတဲ့အနာဂတ်အတွက် အခြေခံအုတ်မြစ်ကို တည်ဆောက်နေတာပါ။ 🏗️",
-    "The strength you're showing is incredible. Don't ever forget that. 💥 | သင်ပြသနေတဲ့ ကြံ့ခိုင်မှုက မယုံနိုင်စရာပါပဲ။ ဒါကို ဘယ်တော့မှမမေ့ပါနဲ့။ 💥",
-    "Let go of who you were. Focus on who you are becoming. 🦋 | သင်ဘယ်သူဖြစ်ခဲ့လဲဆိုတာကို လက်လွှတ်လိုက်ပါ။ သင်ဘယ်သူဖြစ်လာနေလဲဆိုတာကိုပဲ အာရုံစိုက်ပါ။ 🦋",
-    "You're not giving anything up; you're gaining everything back. 💯 | သင်ဘာကိုမှ စွန့်လွှတ်နေတာမဟုတ်ပါဘူး၊ သင်အရာအားလုံးကို ပြန်ရယူနေတာပါ။ 💯",
-    "Your resilience is your greatest asset on this journey. 🛡️ | သင်ရဲ့ခံနိုင်ရည်ရှိမှုက ဒီခရီးမှာ သင့်ရဲ့အကြီးမားဆုံး အားသာချက်ပါပဲ။ 🛡️",
-    "Keep your 'why' in your heart. It will guide you through the tough moments. ❤️‍🔥 | သင်ရဲ့ 'ဘာကြောင့်လဲ' ဆိုတဲ့အကြောင်းผลကို နှလုံးသားထဲမှာထားပါ။ ခက်ခဲတဲ့အချိန်တွေမှာ ဒါက သင့်ကိုလမ်းပြပါလိမ့်မယ်။ ❤️‍🔥",
-    "The best version of you is waiting. Keep walking towards them. 🌟 | သင့်ရဲ့အကောင်းဆုံးဗားရှင်းက စောင့်နေပါတယ်။ သူတို့ဆီကို ဆက်လျှောက်သွားပါ။ 🌟",
-    "Every moment you choose sobriety, you win. Keep winning. 🏅 | သင်အရက်ကင်းစင်မှုကို ရွေးချယ်လိုက်တဲ့အချိန်တိုင်း သင်နိုင်ပါတယ်။ ဆက်ပြီးအနိုင်ယူပါ။ 🏅",
-    "Trust the process. Healing takes time, and you're giving yourself that time. ⏳ | လုပ်ငန်းစဉ်ကို ယုံကြည်လိုက်ပါ။ ကုစားခြင်းက အချိန်ယူရပြီး သင်က ကိုယ့်ကိုယ်ကို အဲ့ဒီအချိန်ကို ပေးနေတာပါ။ ⏳",
-    "You are proving to yourself that you can do hard things. 🙌 | သင်ဟာ ခက်ခဲတဲ့အရာတွေကို လုပ်နိုင်တယ်ဆိုတာကို ကိုယ့်ကိုယ်ကို သက်သေပြနေတာပါ။ 🙌",
-    "Your mind is a garden. By not drinking, you're pulling the weeds. 🌿 | သင့်စိတ်က ဥယျာဉ်တစ်ခုပါ။ အရက်မသောက်ခြင်းအားဖြင့် သင်ပေါင်းပင်တွေကို ရှင်းနေတာပါ။ 🌿",
-    "Be patient with yourself. You are unlearning years of habits. 🐢 | ကိုယ့်ကိုယ်ကို စိတ်ရှည်ပါ။ သင်ဟာ နှစ်ပေါင်းများစွာက အကျင့်တွေကို ပြန်လည်ပြုပြင်နေတာပါ။ 🐢",
-    "The energy you're saving is being invested in your growth. 🔋 | သင်ချွေတာနေတဲ့ စွမ်းအင်တွေက သင်ရဲ့ကြီးထွားမှုမှာ ရင်းနှီးမြှုပ်နှံနေတာပါ။ 🔋",
-    "Notice the small joys that sobriety brings back into your life. 😊 | အရက်ကင်းစင်မှုက သင့်ဘဝထဲကို ပြန်ယူဆောင်လာတဲ့ ပျော်ရွှင်မှုသေးသေးလေးတွေကို သတိပြုပါ။ 😊",
-    "You are not alone on this path. We are here with you. 🤝 | ဒီလမ်းမှာ သင်တစ်ယောက်တည်းမဟုတ်ပါဘူး။ ကျွန်တော်တို့ သင်နဲ့အတူရှိပါတယ်။ 🤝",
-    "Your commitment to yourself is the ultimate act of strength. 💪 | သင်ကိုယ့်ကိုယ်ကို ပေးထားတဲ့ကတိက အခိုင်မာဆုံးသော စွမ်းအားတစ်ခုပါပဲ။ 💪",
-    "Let peace of mind be your new addiction. 🧘‍♀️ | စိတ်၏ငြိမ်းချမ်းမှုကို သင်ရဲ့စွဲလမ်းမှုအသစ်ဖြစ်ပါစေ။ 🧘‍♀️",
-    "You are worthy of a life free from the grip of alcohol. 💖 | သင်ဟာ အရက်ရဲ့ချုပ်ကိုင်မှုကနေ လွတ်မြောက်တဲ့ဘဝနဲ့ ထိုက်တန်ပါတယ်။ 💖",
-    "Look in the mirror and be proud of the person looking back at you. ✨ | မှန်ထဲမှာကိုယ့်ကိုယ်ကိုကြည့်ပြီး ပြန်ကြည့်နေတဲ့သူအတွက် ဂုဏ်ယူလိုက်ပါ။ ✨",
-    "Today, you are choosing you. And that's the most important choice. 🥇 | ဒီနေ့၊ သင်က သင့်ကိုယ်သင် ရွေးချယ်ခဲ့တယ်။ ဒါက အရေးကြီးဆုံး ရွေးချယ်မှုပါပဲ။ 🥇"
-    ]
-rewardMessages = [
-   "Treat yourself to your favorite meal tonight. You've earned it! 🍕 | ဒီည သင်အကြိုက်ဆုံးအစားအစာနဲ့ ကိုယ့်ကိုယ်ကို ဆုချပါ။ သင်နဲ့ထိုက်တန်ပါတယ်။ 🍕",
-    "Watch that movie you've been wanting to see. Relax and enjoy. 🎬 | သင်ကြည့်ချင်နေတဲ့ ရုပ်ရှင်ကိုကြည့်လိုက်ပါ။ အပန်းဖြေပြီး ပျော်ရွှင်လိုက်ပါ။ 🎬",
-    "Go for a a walk and listen to a podcast or your favorite music. 🎧 | လမ်းထွက်လျှောက်ပြီး podcast (သို့) သင်အကြိုက်ဆုံးသီချင်းကို နားထောင်ပါ။ 🎧",
-    "Buy that book you've had your eye on. A reward for your mind. 📚 | သင်မျက်စိကျနေတဲ့ စာအုပ်ကိုဝယ်လိုက်ပါ။ သင့်ဦးနှောက်အတွက် ဆုတစ်ခုပေါ့။ 📚",
-    "Take a long, warm bath or shower. Give yourself time to relax. 🛀 | ရေနွေးနွေးနဲ့ အချိန်ကြာကြာ ရေချိုး/စိမ်ပါ။ ကိုယ့်ကိုယ်ကို အနားပေးဖို့ အချိန်ပေးလိုက်ပါ။ 🛀",
-    "Start a new TV series you've been wanting to watch. 📺 | သင်ကြည့်ချင်နေတဲ့ TV series အသစ်တစ်ခုကို စကြည့်လိုက်ပါ။ 📺",
-    "Cook or order a fancy dessert. Enjoy every bite. 🍰 | အရသာရှိတဲ့ အချိုပွဲတစ်ခုကို ချက်စားပါ (သို့) မှာစားပါ။ တစ်ကိုက်ချင်းစီကို အရသာခံစားပါ။ 🍰",
-    "Spend an hour on a hobby you love, guilt-free. 🎨 | သင်နှစ်သက်တဲ့ ဝါသနာတစ်ခုပေါ်မှာ အပြစ်မခံစားရဘဲ တစ်နာရီလောက် အချိန်ပေးလိုက်ပါ။ 🎨",
-    "Plan a small day trip for the weekend. 🗺️ | စနေ၊တနင်္ဂနွေအတွက် ခရီးတိုလေးတစ်ခု စီစဉ်လိုက်ပါ။ 🗺️",
-    "Buy a new plant for your room. It adds life and positivity. 🪴 | သင့်အခန်းအတွက် အပင်အသစ်တစ်ပင် ဝယ်လိုက်ပါ။ ဒါက ජීවနဲ့ အကောင်းမြင်စိတ်ကို တိုးစေပါတယ်။ 🪴",
-    "Try a new recipe you've found online. 👨‍🍳 | အွန်လိုင်းမှာတွေ့ထားတဲ့ ဟင်းချက်နည်းအသစ်တစ်ခုကို စမ်းချက်ကြည့်ပါ။ 👨‍🍳",
-    "Have a video call with a friend or family member you miss. 💻 | သင်လွမ်းနေတဲ့ မိတ်ဆွေ (သို့) မိသားစုဝင်တစ်ယောက်နဲ့ video call ပြောပါ။ 💻",
-    "Take a nap without setting an alarm. 😴 | နှိုးစက်မပေးဘဲ တစ်ရေးအိပ်လိုက်ပါ။ 😴",
-    "Buy yourself a small gift you've been wanting. 🎁 | သင်လိုချင်နေတဲ့ လက်ဆောင်သေးသေးလေးတစ်ခု ကိုယ့်ကိုယ်ကို ဝယ်ပေးလိုက်ပါ။ 🎁",
-    "Visit a museum or art gallery. 🏛️ | ပြတိုက် (သို့) အနုပညာပြခန်းတစ်ခုကို သွားလည်ပါ။ 🏛️",
-    "Spend some time in nature, like a park or by a lake. 🌳 | ပန်းခြံ (သို့) ကန်ဘေးလိုမျိုး သဘာဝထဲမှာ အချိန်အနည်းငယ်ကုန်ဆုံးပါ။ 🌳",
-    "Get a massage or a manicure/pedicure. 💅 | Massage (သို့) လက်/ခြေသည်းနီဆိုးတာမျိုး လုပ်ပါ။ 💅",
-    "Listen to a full album from an artist you love, from start to finish. 🎶 | သင်နှစ်သက်တဲ့ အဆိုတော်တစ်ယောက်ရဲ့ album တစ်ခုလုံးကို အစအဆုံးနားထောင်ပါ။ 🎶",
-    "Do a home workout or some yoga. Reward your body with movement. 🧘‍♂️ | အိမ်မှာ လေ့ကျင့်ခန်းလုပ်ပါ (သို့) ယောဂကျင့်ပါ။ သင့်ခန္ဓာကိုယ်ကို လှုပ်ရှားမှုနဲ့ ဆုချပါ။ 🧘‍♂️",
-    "Declutter and organize your space. A clean room is a clean mind. ✨ | သင့်နေရာကို ရှင်းလင်းပြီး စည်းကမ်းတကျထားပါ။ သန့်ရှင်းတဲ့အခန်းက သန့်ရှင်းတဲ့စိတ်ကို ဖြစ်စေပါတယ်။ ✨",
-    "Learn a new skill online, like a new language or how to code. 💡 | ဘာသာစကားအသစ် (သို့) code ရေးနည်းလိုမျိုး အွန်လိုင်းကနေ သင်ခန်းစာအသစ်တစ်ခု သင်ယူပါ။ 💡",
-    "Watch the sunset or sunrise. 🌅 | နေဝင်ချိန် (သို့) နေထွက်ချိန်ကို ကြည့်ပါ။ 🌅",
-    "Write in a journal about your progress and how you're feeling. 📔 | သင်ရဲ့တိုးတက်မှုနဲ့ ခံစားချက်တွေအကြောင်း ဂျာနယ်ထဲမှာ ချရေးပါ။ 📔",
-    "Try a new type of coffee or tea from a local cafe. ☕ | ဒေသကော်ဖီဆိုင်တစ်ခုက ကော်ဖီ (သို့) လက်ဖက်ရည်အမျိုးအစားအသစ်တစ်ခုကို စမ်းသောက်ကြည့်ပါ။ ☕",
-    "Play a board game or a video game. 🎲 | Board game (သို့) video game ကစားပါ။ 🎲",
-    "Re-watch your favorite comfort movie. 🍿 | သင်အကြိုက်ဆုံး ကြည့်နေကျရုပ်ရှင်ကို ပြန်ကြည့်ပါ။ 🍿",
-    "Bake cookies or a cake. The process can be very therapeutic. 🍪 | ကွတ်ကီး (သို့) ကိတ်မုန့် ဖုတ်ပါ။ ဒီလုပ်ငန်းစဉ်က စိတ်ကိုအလွန်ကုစားပေးနိုင်ပါတယ်။ 🍪",
-    "Go for a scenic drive. 🚗 | ရှုခင်းလှတဲ့နေရာကို ကားမောင်းထွက်ပါ။ 🚗",
-    "Start planning your next vacation, even if it's far away. ✈️ | သင်ရဲ့နောက်ခရီးစဉ်ကို စီစဉ်ပါ၊ weit weit မှာဖြစ်နေရင်တောင်မှပေါ့။ ✈️",
-    "Buy some new comfortable clothes, like a new hoodie or pajamas. 👕 | Hoodie အသစ် (သို့) ညဝတ်အိပ်စုံအသစ်လိုမျိုး သက်တောင့်သက်သာရှိတဲ့ အဝတ်အစားအသစ်တွေဝယ်ပါ။ 👕",
-    "Donate to a charity you care about. Giving back feels good. ❤️ | သင်ဂရုစိုက်တဲ့ ပရဟိတလုပ်ငန်းတစ်ခုမှာ လှူဒါန်းပါ။ ပြန်လည်ပေးကမ်းခြင်းက ခံစားချက်ကောင်းစေပါတယ်။ ❤️",
-    "Create a new music playlist. 🎶 | သီချင်း playlist အသစ်တစ်ခု ဖန်တီးပါ။ 🎶",
-    "Visit a local market and buy some fresh produce. 🍓 | ဒေသဈေးတစ်ခုကိုသွားပြီး လတ်ဆတ်တဲ့ သစ်သီးဝလံတွေ ဝယ်ပါ။ 🍓",
-    "Take a day off from social media. 📵 | လူမှုကွန်ရက်ကနေ တစ်ရက်လောက် အနားယူပါ။ 📵",
-    "Light some candles and create a cozy atmosphere at home. 🕯️ | ဖယောင်းတိုင်တွေထွန်းပြီး အိမ်မှာ နွေးထွေးတဲ့ဝန်းကျင်တစ်ခု ဖန်တီးပါ။ 🕯️",
-    "Go stargazing on a clear night. ✨ | ကြည်လင်တဲ့ညမှာ ကြယ်တွေကို သွားကြည့်ပါ။ ✨",
-    "Do some gardening or potting a new plant. 🌱 | ဥယျာဉ်စိုက်ပျိုးတာ (သို့) အပင်အသစ်စိုက်တာမျိုး လုပ်ပါ။ 🌱",
-    "Try a new restaurant in your city. 🍜 | သင့်မြို့က စားသောက်ဆိုင်အသစ်တစ်ခုမှာ စမ်းစားကြည့်ပါ။ 🍜",
-    "Go to bed an hour earlier than usual. 🌙 | ပုံမှန်ထက် တစ်နာရီစောပြီး အိပ်ရာဝင်ပါ။ 🌙",
-    "Write a letter to your future self. 💌 | သင်ရဲ့အနာဂတ်ကိုယ်သင်ဆီကို စာတစ်စောင်ရေးပါ။ 💌",
-    "Go swimming or spend time near water. 🌊 | ရေသွားကူးပါ (သို့) ရေအနီးအနားမှာ အချိန်ကုန်ဆုံးပါ။ 🌊",
-    "Learn to play a simple song on an instrument. 🎸 | တူရိယာတစ်ခုပေါ်မှာ ရိုးရှင်းတဲ့သီချင်းတစ်ပုဒ် တီးတတ်အောင်သင်ယူပါ။ 🎸",
-    "Watch stand-up comedy. Laughter is the best medicine. 😂 | ဟာသပွဲတစ်ခု ကြည့်ပါ။ ရယ်မောခြင်းက အကောင်းဆုံးဆေးတစ်ခွက်ပါ။ 😂",
-    "Do a DIY project you've been putting off. 🛠️ | သင်ရွှေ့ဆိုင်းထားတဲ့ DIY project တစ်ခုကို လုပ်ပါ။ 🛠️",
-    "Listen to an inspiring talk or interview. 🎤 | အားကျစရာကောင်းတဲ့ ဟောပြောပွဲ (သို့) အင်တာဗျူးတစ်ခု နားထောင်ပါ။ 🎤",
-    "Visit an animal shelter and spend time with the animals. 🐶 | တိရစ္ဆာန်ဂေဟာတစ်ခုကိုသွားပြီး တိရစ္ဆာန်တွေနဲ့ အချိန်ကုန်ဆုံးပါ။ 🐶",
-    "Spend quality time with a loved one, distraction-free. ❤️ | ချစ်ရသူတစ်ယောက်နဲ့ အာရုံမပျံ့လွင့်ဘဲ အရည်အသွေးရှိတဲ့အချိန်ကို ကုန်ဆုံးပါ။ ❤️",
-    "Explore a part of your city you've never been to before. 🏙️ | သင်မရောက်ဖူးသေးတဲ့ သင့်မြို့ရဲ့ အစိတ်အပိုင်းတစ်ခုကို စူးစမ်းလေ့လာပါ။ 🏙️",
-    "Simply sit in silence for 10 minutes and enjoy the peace. 🧘‍♀️ | ၁၀ မိနစ်လောက် တိတ်ဆိတ်စွာထိုင်ပြီး ငြိမ်းချမ်းမှုကို ခံစားလိုက်ပါ။ 🧘‍♀️"
-    ]
-cravingSupportMessages = [
-    "It's okay to feel this way. The feeling is temporary. Can you try a focus exercise with /focus? ✨ | ဒီလိုခံစားရတာ ဖြစ်တတ်ပါတယ်။ ဒီခံစားချက်က ခဏပါပဲ။ /focus command နဲ့ လေ့ကျင့်ခန်းတစ်ခုခု လုပ်ကြည့်လို့ရမလား? ✨",
-    "I hear you. Remember the last time you felt great waking up without a hangover? Let's aim for that again. 🌅 | ကျွန်တော်နားလည်ပါတယ်။ အရက်နာမကျဘဲ နိုးထလာရတဲ့ နောက်ဆုံးတစ်ခေါက်က ကောင်းမွန်တဲ့ခံစားချက်ကို ပြန်သတိရကြည့်ပါ။ အဲ့ဒီခံစားချက်ကို ပြန်ရအောင် ကြိုးစားကြရအောင်။ 🌅",
-    "This is tough, but you are tougher. Let's get through this moment together. 💪 | ဒါက ခက်ခဲတယ်ဆိုတာသိပါတယ်။ ဒါပေမယ့် သင်က ပိုပြီးแข็งแกร่งပါတယ်။ ဒီအခိုက်အတန့်ကို အတူတူ ကျော်ဖြတ်လိုက်ကြရအောင်။ 💪",
-    "Drink a large glass of water and wait 15 minutes. Sometimes cravings are just dehydration. 💧 | ရေတစ်ခွက်အပြည့်သောက်ပြီး ၁၅ မိနစ်လောက်စောင့်ကြည့်ပါ။ တခါတလေ တောင့်တမှုဆိုတာ ရေဓာတ်ခမ်းခြောက်တာကြောင့်လည်း ဖြစ်တတ်ပါတယ်။ 💧",
-    "This craving is just a thought, not a command. You don't have to act on it. 🧠 | ဒီတောင့်တမှုက အတွေးတစ်ခုပါပဲ၊ အမိန့်ပေးတာမဟုတ်ပါဘူး။ သင်လိုက်လုပ်ဖို့မလိုပါဘူး။ 🧠",
-    "Play the tape forward. How will you feel tomorrow morning if you drink now? 📼 | ရှေ့ဆက်တွေးကြည့်ပါ။ အခုသင်သောက်လိုက်ရင် မနက်ဖြန်မနက်မှာ ဘယ်လိုခံစားရမလဲ။ 📼",
-    "Call or text a friend. A simple conversation can change everything. 📱 | မိတ်ဆွေတစ်ယောက်ကို ဖုန်းခေါ် (သို့) စာပို့လိုက်ပါ။ ရိုးရှင်းတဲ့စကားပြောဆိုမှုက အရာအားလုံးကို ပြောင်းလဲပေးနိုင်ပါတယ်။ 📱",
-    "Tell yourself: 'I can get through the next 10 minutes.' Then repeat. ⏳ | ကိုယ့်ကိုယ်ကိုပြောပါ: 'ငါ နောက် ၁၀ မိနစ်ကို ကျော်ဖြတ်နိုင်တယ်။' ပြီးရင် ဒါကိုပဲ ထပ်ခါထပ်ခါပြောပါ။ ⏳",
-    "Go for a quick walk, even just for 5 minutes. Change your environment. 🚶‍♀️ | ၅ မိနစ်လောက်ပဲဖြစ်ဖြစ် လမ်းခဏထွက်လျှောက်လိုက်ပါ။ သင့်ပတ်ဝန်းကျင်ကို ပြောင်းလဲလိုက်ပါ။ 🚶‍♀️",
-    "The craving is a sign of your body healing. It's a good thing, even if it feels bad. 🌱 | ဒီတောင့်တမှုက သင့်ခန္ဓာကိုယ် ပြန်လည်ကောင်းမွန်လာတဲ့ လက္ခဏာတစ်ခုပါ။ ခံစားရတာမကောင်းပေမယ့် ဒါက အရာကောင်းတစ်ခုပါ။ 🌱",
-    "Put on some loud music and dance for one song. 🎶 | သီချင်းအကျယ်ကြီးဖွင့်ပြီး တစ်ပုဒ်စာ ကလိုက်ပါ။ 🎶",
-    "You are in charge, not the craving. Remind yourself of your power. 👑 | သင်က အဓိကပါ၊ တောင့်တမှုက အဓိကမဟုတ်ပါဘူး။ သင့်ရဲ့စွမ်းအားကို ကိုယ့်ကိုယ်ကို သတိပေးပါ။ 👑",
-    "This feeling is a wave. It will rise, but it will also fall. Just ride it out. 🌊 | ဒီခံစားချက်က လှိုင်းလုံးတစ်ခုလိုပါပဲ။ သူတက်လာမယ်၊ ဒါပေမယ့် ပြန်လည်းကျသွားမှာပါ။ သူ့အပေါ်ကနေ ဖြတ်စီးသွားလိုက်ပါ။ 🌊",
-    "Think about your main reason for quitting. Hold that reason in your mind. ❤️‍🔥 | သင်အရက်ဖြတ်ဖို့ အဓိကအကြောင်းผลကို စဉ်းစားပါ။ အဲ့ဒီအကြောင်းผลကို သင့်စိတ်ထဲမှာ ထားပါ။ ❤️‍🔥",
-    "Do something with your hands. Cook, clean, draw, or fix something. 👐 | သင့်လက်တွေနဲ့ တစ်ခုခုလုပ်ပါ။ ချက်ပြုတ်တာ၊ သန့်ရှင်းရေးလုပ်တာ၊ ပုံဆွဲတာ (သို့) တစ်ခုခုပြင်တာမျိုး။ 👐",
-    "This is just your old brain wiring trying to fire. You are creating new pathways now. 🧠 | ဒါက သင့်ဦးနှောက်ထဲက အကျင့်ဟောင်းတွေ ပြန်အလုပ်လုပ်ဖို့ ကြိုးစားနေတာပါပဲ။ သင်က အခု လမ်းကြောင်းအသစ်တွေ ဖောက်လုပ်နေတာပါ။ 🧠",
-    "Eat something sweet or savory. Sometimes a strong taste can help. 🍫 | အချို (သို့) အငန်တစ်ခုခု စားလိုက်ပါ။ တခါတလေ ပြင်းတဲ့အရသာက ကူညီနိုင်ပါတယ်။ 🍫",
-    "How about watching a video on the negative effects of alcohol? A quick reminder can help. 📺 | အရက်ရဲ့ဆိုးကျိုးတွေအကြောင်း ဗီဒီယိုတစ်ခု ကြည့်ကြည့်မလား။ ခဏတာသတိပေးမှုက ကူညီနိုင်ပါတယ်။ 📺",
-    "This feeling will not last forever. I promise. Just get through this moment. 🙏 | ဒီခံစားချက်က ထာဝရတည်ရှိနေမှာမဟုတ်ပါဘူး။ ကတိပေးပါတယ်။ ဒီအခိုက်အတန့်ကိုပဲ ကျော်ဖြတ်လိုက်ပါ။ 🙏",
-    "You've survived 100% of your cravings so far. You can survive this one too. 💯 | သင်ဟာ အခုထိ သင်ရဲ့တောင့်တမှုအားလုံးရဲ့ ၁၀၀% ကို အသက်ရှင်ကျော်လွှားနိုင်ခဲ့ပါတယ်။ ဒီတစ်ခုကိုလည်း ကျော်လွှားနိုင်မှာပါ။ 💯",
-    "Try naming the feeling. 'I am feeling a craving.' Acknowledging it can reduce its power. 🗣️ | ခံစားချက်ကို နာမည်တပ်ကြည့်ပါ။ 'ငါ တောင့်တစိတ် ခံစားနေရတယ်' လို့ပေါ့။ အသိအမှတ်ပြုခြင်းက သူ့ရဲ့စွမ်းအားကို လျှော့ချပေးနိုင်ပါတယ်။ 🗣️",
-    "Look at a picture of someone or something you love. Remember who you're doing this for. 💖 | သင်ချစ်ရတဲ့တစ်စုံတစ်ယောက် (သို့) တစ်စုံတစ်ခုရဲ့ ပုံကိုကြည့်ပါ။ သင်ဘယ်သူ့အတွက် ဒါကိုလုပ်နေလဲဆိုတာ သတိရပါ။ 💖",
-    "This is a test of your strength, and you are passing it right now. 🏅 | ဒါက သင့်ရဲ့ကြံ့ခိုင်မှုကို စမ်းသပ်မှုတစ်ခုပါ၊ ပြီးတော့ သင်အခု အောင်မြင်နေပါပြီ။ 🏅",
-    "Just for today, you don't have to drink. Worry about tomorrow, tomorrow. 🗓️ | ဒီနေ့တစ်ရက်အတွက်ပဲ၊ သင်သောက်စရာမလိုပါဘူး။ မနက်ဖြန်အတွက်ကို မနက်ဖြန်မှပဲ စဉ်းစားပါ။ 🗓️",
-    "You are not your cravings. They are just visitors. Let them pass by. 🌬️ | သင်ဟာ သင့်ရဲ့တောင့်တမှုတွေ မဟုတ်ပါဘူး။ သူတို့က ဧည့်သည်တွေပါပဲ။ သူတို့ကို ဖြတ်သွားခွင့်ပေးလိုက်ပါ။ 🌬️",
-    "Write down why you feel like drinking. Getting it out can help. 📝 | သင်ဘာကြောင့်သောက်ချင်လဲဆိုတာကို ချရေးလိုက်ပါ။ အပြင်ထုတ်လိုက်ခြင်းက ကူညီနိုင်ပါတယ်။ 📝",
-    "Is there a small task you've been avoiding? Do it now. It's a great distraction. ✅ | သင်ရှောင်နေတဲ့ အလုပ်သေးသေးလေးတစ်ခု ရှိလား။ အခုလုပ်လိုက်ပါ။ ဒါက အာရုံလွှဲဖို့ အကောင်းဆုံးနည်းလမ်းတစ်ခုပါ။ ✅",
-    "You are building a life you don't need to escape from. 🏞️ | သင်ဟာ သင်လွတ်မြောက်ဖို့မလိုတဲ့ ဘဝတစ်ခုကို တည်ဆောက်နေတာပါ။ 🏞️",
-    "Every craving you overcome is like leveling up in a game. You're getting more powerful. 🎮 | သင်ကျော်လွှားလိုက်တဲ့ တောင့်တမှုတိုင်းက game ထဲမှာ level တက်သွားသလိုပါပဲ။ သင်ပိုပြီး အစွမ်းထက်လာနေပါတယ်။ 🎮",
-    "Your health is your wealth. Protect your investment. 💰 | သင့်ကျန်းမာရေးက သင့်ရဲ့ကြွယ်ဝချမ်းသာမှုပါပဲ။ သင့်ရဲ့ရင်းနှီးမြှုပ်နှံမှုကို ကာကွယ်ပါ။ 💰",
-    "This is just a moment. It does not have to be your whole story. 📖 | ဒါက အခိုက်အတန့်လေးတစ်ခုပါပဲ။ ဒါက သင့်ရဲ့ဇတ်လမ်းတစ်ခုလုံး ဖြစ်စရာမလိုပါဘူး။ 📖",
-    "Take 10 deep, slow breaths. Feel your body calm down with each one. 🧘‍♀️ | အသက်ကို ၁၀ ခါလောက် ဖြည်းဖြည်းနဲ့ sâu sâu ရှူပါ။ တစ်ခါရှူလိုက်တိုင်း သင့်ခန္ဓာကိုယ် တည်ငြိမ်လာတာကို ခံစားလိုက်ပါ။ 🧘‍♀️",
-    "Remember the freedom of not being controlled by alcohol. That freedom is worth fighting for. 🕊️ | အရက်ရဲ့ချုပ်ကိုင်မှုအောက်မှာမရှိတဲ့ လွတ်လပ်မှုကို ပြန်သတိရပါ။ အဲ့ဒီလွတ်လပ်မှုက တိုက်ပွဲဝင်ရတာ တန်ပါတယ်။ 🕊️",
-    "The urge will fade. It always does. You just have to wait it out. 🕰️ | ဒီစိတ်ဆန္ဒက မှေးမှိန်သွားမှာပါ။ အမြဲတမ်းပါပဲ။ သင်က စောင့်ဆိုင်းပေးဖို့ပဲ လိုတာပါ။ 🕰️",
-    "Can you do something kind for yourself right now, instead of drinking? 💖 | အခု အရက်သောက်မယ့်အစား ကိုယ့်ကိုယ်ကို ကြင်နာတဲ့အရာတစ်ခုခု လုပ်ပေးလို့ရမလား။ 💖",
-    "The craving feels huge right now, but you are bigger. 🐘 | အခုအချိန်မှာ တောင့်တမှုက အကြီးကြီးလို့ ခံစားရပေမယ့်၊ သင်က ပိုကြီးမားပါတယ်။ 🐘",
-    "You are choosing a path of strength and clarity. Stay on it. 🛤️ | သင်ဟာ ကြံ့ခိုင်မှုနဲ့ ကြည်လင်မှုရဲ့ လမ်းကြောင်းကို ရွေးချယ်နေတာပါ။ အဲ့ဒီပေါ်မှာပဲ နေပါ။ 🛤️",
-    "Let's check in again in 20 minutes. A lot can change in that time. ⏳ | နောက် මිනිත්තු ၂၀ မှာ ပြန်တွေ့ကြရအောင်။ အဲ့ဒီအချိန်အတွင်းမှာ အများကြီးပြောင်းလဲသွားနိုင်ပါတယ်။ ⏳",
-    "Think of one small, positive thing that has happened today because you are sober. ✨ | သင်အရက်မူးမနေတဲ့အတွက် ဒီနေ့ဖြစ်ခဲ့တဲ့ အကောင်းမြင်တဲ့အရာ သေးသေးလေးတစ်ခုကို စဉ်းစားပါ။ ✨",
-    "You are breaking a cycle. That takes immense courage. Be proud of that courage. 🦁 | သင်ဟာ သံသရာတစ်ခုကို ဖြတ်တောက်နေတာပါ။ ဒါက အလွန်ကြီးမားတဲ့ သတ္တိလိုအပ်ပါတယ်။ အဲ့ဒီသတ္တိအတွက် ဂုဏ်ယူပါ။ 🦁",
-    "This feeling is a part of the process. It means you're making progress. 📈 | ဒီခံစားချက်က လုပ်ငန်းစဉ်ရဲ့ အစိတ်အပိုင်းတစ်ခုပါ။ ဒါက သင်တိုးတက်နေတယ်ဆိုတဲ့ အဓိပ္ပာယ်ပါပဲ။ 📈",
-    "Go and do something that makes you laugh. 😂 | သင့်ကိုရယ်မောစေမယ့် အရာတစ်ခုခု သွားလုပ်လိုက်ပါ။ 😂",
-    "You are not alone. Many people are facing this same battle right now. 🤝 | သင်တစ်ယောက်တည်းမဟုတ်ပါဘူး။ လူအများကြီးက အခုအချိန်မှာ ဒီတိုက်ပွဲကိုပဲ ရင်ဆိုင်နေရပါတယ်။ 🤝",
-    "This is an opportunity to prove your strength to yourself. Take it. 💥 | ဒါက သင့်ရဲ့ကြံ့ခိုင်မှုကို ကိုယ့်ကိုယ်ကို သက်သေပြဖို့ အခွင့်အရေးတစ်ခုပါ။ ယူလိုက်ပါ။ 💥",
-    "Your mind might be telling you lies right now. Don't listen to it. 🤫 | သင့်စိတ်က အခုအချိန်မှာ သင့်ကို လိမ်ညာနေတာဖြစ်နိုင်တယ်။ သူ့စကားကို နားမထောင်ပါနဲ့။ 🤫",
-    "What would the strongest version of you do right now? Do that. 🦸‍♀️ | သင့်ရဲ့အသန်မာဆုံးဗားရှင်းက အခုဘာလုပ်မလဲ။ အဲ့ဒါကိုလုပ်ပါ။ 🦸‍♀️",
-    "Each time you say no, it gets a little easier. Keep practicing. 👍 | သင် 'نه' လို့ပြောလိုက်တိုင်း နည်းနည်းလေး ပိုလွယ်ကူလာပါတယ်။ ဆက်လေ့ကျင့်ပါ။ 👍",
-    "Your peace is more valuable than a temporary buzz. Protect your peace. 🧘‍♂️ | သင့်ရဲ့ငြိမ်းချမ်းမှုက ယာယီမူးယစ်မှုထက် အများကြီးတန်ဖိုးရှိပါတယ်။ သင့်ရဲ့ငြိမ်းချမ်းမှုကို ကာကွယ်ပါ။ 🧘‍♂️",
-    "This is your brain recalibrating. It's a sign of positive change. ⚙️ | ဒါက သင့်ဦးနှောက် ပြန်လည်ချိန်ညှိနေတာပါ။ ဒါက အကောင်းမြင်တဲ့ ပြောင်းလဲမှုရဲ့ လက္ခဏာတစ်ခုပါ။ ⚙️"
-    ]
-celebrationMessages = [
-    "That's amazing to hear! 🎉 Celebrating this positive feeling with you. | ဒါက တကယ်ကို ကြားရတဲ့သတင်းကောင်းပါပဲ။ 🎉 ဒီလိုကောင်းမွန်တဲ့ခံစားချက်ကို သင်နဲ့အတူ ဂုဏ်ပြုလိုက်ပါတယ်။",
-    "So happy for you! Keep embracing these good moments. ✨ | သင့်အတွက် အရမ်းဝမ်းသာပါတယ်။ ဒီလိုကောင်းမွန်တဲ့အချိန်လေးတွေကို ဆက်ပြီးပိုင်ဆိုင်နိုင်ပါစေ။ ✨",
-    "Wonderful! Every good day is a huge win. 🥳 | အရမ်းကောင်းတာပဲ။ နေ့ကောင်းတိုင်းဟာ အောင်ပွဲကြီးတစ်ခုပါပဲ။ 🥳",
-    "Your hard work is paying off. Enjoy this feeling! 😊 | သင်ကြိုးစားခဲ့သမျှ အရာထင်လာပါပြီ။ ဒီခံစားချက်ကို ပျော်ရွှင်လိုက်ပါ။ 😊",
-    "This is what success feels like! So proud of you. 💖 | အောင်မြင်မှုဆိုတာ ဒီလိုခံစားချက်မျိုးပါပဲ။ သင့်အတွက် အရမ်းဂုဏ်ယူပါတယ်။ 💖",
-    "You're building a beautiful, positive life. Keep going! 🏗️ | သင်ဟာ လှပပြီး အကောင်းမြင်တဲ့ ဘဝတစ်ခုကို တည်ဆောက်နေတာပါ။ ဆက်ကြိုးစားပါ။ 🏗️",
-    "Remember this feeling. This is your 'why'. 💡 | ဒီခံစားချက်ကို မှတ်ထားပါ။ ဒါက သင်ဘာကြောင့်ကြိုးစားနေလဲဆိုတဲ့ အဖြေပါပဲ။ 💡",
-    "You earned this happiness and clarity. You deserve it. 🌟 | သင်ဟာ ဒီပျော်ရွှင်မှု၊ ကြည်လင်မှုတွေနဲ့ ထိုက်တန်ပါတယ်။ 🌟",
-    "This is fantastic! Let this good feeling fuel your motivation. 🔥 | ဒါက အံ့ဩစရာပဲ။ ဒီခံစားချက်ကောင်းကို သင်ရဲ့ခွန်အားအဖြစ်သုံးပါ။ 🔥",
-    "Love hearing this! Your progress is inspiring. 🚀 | ဒီလိုကြားရတာ ဝမ်းသာပါတယ်။ သင်ရဲ့တိုးတက်မှုက အားကျစရာကောင်းပါတယ်။ 🚀",
-    "Keep soaking up these positive vibes! You're doing great. 🌞 | ဒီလိုအကောင်းမြင်စိတ်လေးတွေကို ဆက်ပြီးခံစားပါ။ သင်အရမ်းတော်ပါတယ်။ 🌞",
-    "This is the reward for your dedication. Enjoy it fully. 🎁 | ဒါက သင်ရဲ့စူးစိုက်မှုအတွက် ဆုလာဘ်ပါပဲ။ အပြည့်အဝပျော်ရွှင်လိုက်ပါ။ 🎁",
-    "You're glowing with positive energy! Keep it up. ✨ | သင်ဟာ အကောင်းမြင်စွမ်းအင်တွေနဲ့ တောက်ပနေပါတယ်။ ဆက်ထိန်းထားပါ။ ✨",
-    "This is a moment to be truly proud of. Well done! 🏅 | ဒါက တကယ်ကို ဂုဏ်ယူရမယ့်အချိန်လေးပါပဲ။ ကောင်းပါတယ်။ 🏅",
-    "Every good day strengthens your resolve. Keep building! 💪 | နေ့ကောင်းတိုင်းက သင်ရဲ့ဆုံးဖြတ်ချက်ကို ပိုပြီးခိုင်မာစေပါတယ်။ ဆက်ပြီးတည်ဆောက်ပါ။ 💪",
-    "This is the result of choosing yourself. It looks good on you! 😊 | ဒါက ကိုယ့်ကိုယ်ကိုရွေးချယ်ခဲ့ခြင်းရဲ့ ရလဒ်ပါပဲ။ သင်နဲ့လိုက်ဖက်ပါတယ်။ 😊",
-    "Let this happiness remind you of your strength. 💖 | ဒီပျော်ရွှင်မှုက သင့်ရဲ့ကြံ့ခိုင်မှုကို သတိပေးပါစေ။ 💖",
-    "You're creating a new, happier reality for yourself. 🌈 | သင်ဟာ သင့်အတွက် ပိုပျော်စရာကောင်းတဲ့ လက်တွေ့ဘဝအသစ်တစ်ခုကို ဖန်တီးနေတာပါ။ 🌈",
-    "This is a sign that you're on the right path. Keep walking. 🛤️ | ဒါက သင်လမ်းမှန်ပေါ်ရောက်နေတယ်ဆိုတဲ့ လက္ခဏာပါပဲ။ ဆက်လျှောက်ပါ။ 🛤️",
-    "Your spirit is shining! I'm so happy to witness it. 🌟 | သင်ရဲ့ဝိညာဉ်က တောက်ပနေပါတယ်။ ဒါကိုမြင်တွေ့ရတာ ဝမ်းသာပါတယ်။ 🌟",
-    "This feeling is what the journey is all about. Cherish it. 💎 | ဒီခံစားချက်က ဒီခရီးရဲ့အဓိပ္ပာယ်ပါပဲ။ တန်ဖိုးထားပါ။ 💎",
-    "You're not just avoiding negatives; you're creating positives. ➕ | သင်က အဆိုးတွေကို ရှောင်နေတာတင်မဟုတ်ဘဲ၊ အကောင်းတွေကိုပါ ဖန်တီးနေတာပါ။ ➕",
-    "This is the freedom you've been working for. Breathe it in. 🕊️ | ဒါက သင်ကြိုးစားရယူနေတဲ့ လွတ်လပ်မှုပါပဲ။ ရှူသွင်းလိုက်ပါ။ 🕊️",
-    "Let this joy be a shield against future cravings. 🛡️ | ဒီပျော်ရွှင်မှုကို အနာဂတ်က တောင့်တမှုတွေအတွက် ကာကွယ်ပေးမယ့် ဒိုင်းတစ်ခုဖြစ်ပါစေ။ 🛡️",
-    "You're proving that a life without alcohol is a life with more joy. 🎉 | အရက်မပါတဲ့ဘဝက ပိုပျော်စရာကောင်းတဲ့ဘဝဖြစ်တယ်ဆိုတာကို သင်သက်သေပြနေပါတယ်။ 🎉",
-    "This is a beautiful moment of clarity and peace. 🧘 | ဒါက ကြည်လင်ငြိမ်းချမ်းမှုရဲ့ လှပတဲ့အခိုက်အတန့်လေးတစ်ခုပါပဲ။ 🧘",
-    "Your mind and body are in harmony. What a wonderful feeling! 🎶 | သင့်စိတ်နဲ့ခန္ဓာကိုယ်က သဟဇာတဖြစ်နေပါတယ်။ အရမ်းကောင်းတဲ့ခံစားချက်ပါပဲ။ 🎶",
-    "This is the new you, and you are amazing! 🤩 | ဒါက သင်အသစ်ပါ၊ ပြီးတော့ သင်က အံ့ဩစရာကောင်းပါတယ်။ 🤩",
-    "Keep collecting these beautiful, sober moments. ✨ | ဒီလိုလှပတဲ့、အရက်ကင်းစင်တဲ့ အခိုက်အတန့်လေးတွေကို ဆက်ပြီးစုဆောင်းပါ။ ✨",
-    "Your smile is brighter today. Keep smiling. 😊 | ဒီနေ့ သင့်အပြုံးက ပိုပြီးတောက်ပနေပါတယ်။ ဆက်ပြုံးပါ။ 😊",
-    "This is a testament to your resilience. You're an inspiration. 🌟 | ဒါက သင်ရဲ့ခံနိုင်ရည်ရှိမှုကို သက်သေပြတာပါပဲ။ သင်က အားကျစရာကောင်းပါတယ်။ 🌟",
-    "Let this feeling be your anchor. ⚓ | ဒီခံစားချက်ကို သင်ရဲ့ကျောက်ဆူးအဖြစ်ထားပါ။ ⚓",
-    "You're living proof that change is possible. 🦋 | သင်ဟာ ပြောင်းလဲမှုက ဖြစ်နိုင်တယ်ဆိုတဲ့ သက်ရှိသက်သေပါပဲ။ 🦋",
-    "This positive energy is contagious! Thank you for sharing it. 🤗 | ဒီအကောင်းမြင်စွမ်းအင်က ကူးစက်တတ်ပါတယ်။ မျှဝေပေးတဲ့အတွက် ကျေးဇူးတင်ပါတယ်။ 🤗",
-    "You're not just surviving; you're thriving! 🌿 | သင်က ရှင်သန်နေတာတင်မဟုတ်ဘဲ、ရှင်သန်ကြီးထွားနေတာပါ။ 🌿",
-    "This is the start of a new, wonderful chapter. 📖 | ဒါက အခန်းကဏ္ဍအသစ်တစ်ခုရဲ့ အစပါပဲ။ 📖",
-    "The world looks brighter without the haze of alcohol, doesn't it? 🌞 | အရက်ရဲ့မြူတွေမပါဘဲ ကမ္ဘာကြီးက ပိုပြီးတောက်ပနေတယ်၊ ဟုတ်တယ်မလား။ 🌞",
-    "Your success is so well-deserved. Celebrate yourself! 🎊 | သင်ရဲ့အောင်မြင်မှုက အရမ်းကိုထိုက်တန်ပါတယ်။ ကိုယ့်ကိုယ်ကို ဂုဏ်ပြုပါ။ 🎊",
-    "This good feeling is the interest on your investment in yourself. 💰 | ဒီခံစားချက်ကောင်းက သင်ကိုယ့်ကိုယ်ကို ရင်းနှီးမြှုပ်နှံထားတဲ့ အတိုးအမြတ်ပါပဲ။ 💰",
-    "You're unlocking a new level of self-awareness and happiness. 🗝️ | သင်ဟာ ကိုယ့်ကိုယ်ကိုသိခြင်းနဲ့ ပျော်ရွှင်ခြင်းရဲ့ အဆင့်အသစ်တစ်ခုကို ဖွင့်လှစ်နေတာပါ။ 🗝️",
-    "This is the real you shining through. ✨ | ဒါက သင်အစစ်အမှန် တောက်ပနေတာပါ။ ✨",
-    "So glad you're feeling this way. It's a sign of great things to come. 🚀 | ဒီလိုခံစားနေရတာကြားရလို့ ဝမ်းသာပါတယ်။ ဒါက ကောင်းတဲ့အရာတွေလာတော့မယ့် လက္ခဏာပါပဲ။ 🚀",
-    "You are creating your own sunshine. ☀️ | သင်ဟာ သင့်ရဲ့နေရောင်ခြည်ကို သင်ကိုယ်တိုင်ဖန်တီးနေတာပါ။ ☀️",
-    "This is a moment of pure, authentic joy. Hold onto it. 💖 | ဒါက စစ်မှန်တဲ့ပျော်ရွှင်မှုရဲ့ အခိုက်အတန့်စစ်စစ်ပါပဲ။ ဆုပ်ကိုင်ထားပါ။ 💖",
-    "You're not just adding days to your life, but life to your days. 💯 | သင်က သင့်ဘဝထဲကို ရက်တွေထည့်နေတာတင်မဟုတ်ဘဲ၊ သင့်ရက်တွေထဲကို ဘဝကိုပါ ထည့်နေတာပါ။ 💯",
-    "This is what it feels like to be truly free. 🕊️ | တကယ်ကိုလွတ်လပ်တယ်ဆိုတာ ဒီလိုခံစားချက်မျိုးပါပဲ။ 🕊️",
-    "Your journey is beautiful, and this is a beautiful milestone. 📍 | သင်ရဲ့ခရီးက လှပပြီး、ဒါက လှပတဲ့မှတ်တိုင်တစ်ခုပါပဲ။ 📍",
-    "The best is yet to come. Keep up the amazing work. 🌟 | အကောင်းဆုံးတွေက လာဦးမှာပါ။ ဒီလိုအံ့ဩစရာကောင်းတဲ့အလုပ်ကို ဆက်လုပ်ပါ။ 🌟",
-    "You are a warrior, and this is your victory song. 🎶 | သင်ဟာ စစ်သည်တော်တစ်ယောက်ပါ、ပြီးတော့ ဒါက သင်ရဲ့အောင်ပွဲသီချင်းပါပဲ။ 🎶"
-   ]
-noJudgmentMessages = [
-    "It's okay. This is a journey with ups and downs. What matters is that you're back. Let's start again, together. 🌱 | ကိစ္စမရှိပါဘူး။ ဒီခရီးက အနိမ့်အမြင့်တွေနဲ့ ပြည့်နေတာပါ။ အရေးကြီးတာက သင်ပြန်ရောက်လာတာပါပဲ။ အတူတူပြန်စကြရအောင်။ 🌱",
-    "No judgment here. Recovery isn't a straight line. Be kind to yourself today. We'll take it one day at a time. ❤️ | အပြစ်တင်စရာမရှိပါဘူး။ နလန်ထူခြင်းဆိုတာ ဖြောင့်တန်းတဲ့လမ်းမဟုတ်ပါဘူး။ ဒီနေ့ ကိုယ့်ကိုယ်ကို သနားကြင်နာပါ။ တစ်နေ့ချင်းစီ ဖြတ်သန်းကြရအောင်။ ❤️",
-    "Every restart is a new beginning. You haven't lost your progress, you've gained experience. 💡 | ပြန်စခြင်းတိုင်းဟာ အစအသစ်တစ်ခုပါ။ သင်တိုးတက်မှုတွေ မဆုံးရှုံးသွားပါဘူး၊ သင်အတွေ့အကြုံတွေ ရလိုက်တာပါ။ 💡",
-    "Falling down is part of learning. What matters is getting back up. You can do this. 💪 | လဲကျခြင်းက သင်ယူခြင်းရဲ့ အစိတ်အပိုင်းတစ်ခုပါ။ အရေးကြီးတာက ပြန်ထနိုင်ဖို့ပါပဲ။ သင်လုပ်နိုင်ပါတယ်။ 💪",
-    "One slip doesn't erase all your progress. It's just a data point. 📊 | တစ်ခါချော်လဲတိုင်းက သင်ရဲ့တိုးတက်မှုအားလုံးကို မဖျက်ဆီးပါဘူး။ ဒါက သင်ခန်းစာတစ်ခုပါပဲ။ 📊",
-    "The most important step is the one you take right now. Let's take it together. 👣 | အရေးကြီးဆုံးခြေလှမ်းက သင်အခုလှမ်းမယ့် ခြေလှမ်းပါပဲ။ အတူတူလှမ်းလိုက်ကြရအောင်။ 👣",
-    "Be as kind to yourself as you would be to a friend in the same situation. 🤗 | သင့်လိုအခြေအနေမျိုးရောက်နေတဲ့ မိတ်ဆွေတစ်ယောက်ကို ကြင်နာသလိုမျိုး ကိုယ့်ကိုယ်ကို ကြင်နာပါ။ 🤗",
-    "This doesn't define you. Your decision to get back up is what defines you. 💖 | ဒါက သင့်ကို အဓိပ္ပာယ်မဖွင့်ဆိုပါဘူး။ သင်ပြန်ထဖို့ ဆုံးဖြတ်လိုက်တာကသာ သင့်ကို အဓိပ္ပာယ်ဖွင့်ဆိုတာပါ။ 💖",
-    "This is not a failure, it's a part of the process. Don't give up. 🔄 | ဒါက ရှုံးနိမ့်မှုမဟုတ်ပါဘူး၊ ဒါက လုပ်ငန်းစဉ်ရဲ့ အစိတ်အပိုင်းတစ်ခုပါ။ အရှုံးမပေးပါနဲ့။ 🔄",
-    "The journey to sobriety is rarely perfect. The effort is what counts. 💯 | အရက်ကင်းစင်ခြင်းဆီသို့ ခရီးက ပြီးပြည့်စုံခဲပါတယ်။ ကြိုးစားအားထုတ်မှုကသာ အရေးကြီးတာပါ။ 💯",
-    "You are brave for acknowledging this. That's the first step to getting back on track. 🛤️ | ဒါကိုအသိအမှတ်ပြုတဲ့အတွက် သင်သတ္တိရှိပါတယ်။ ဒါက လမ်းကြောင်းမှန်ပေါ်ပြန်ရောက်ဖို့ ပထမဆုံးခြေလှမ်းပါပဲ။ 🛤️",
-    "Let go of any guilt. It won't help you move forward. Focus on today. 🌞 | အပြစ်တင်စိတ်အားလုံးကို လက်လွှတ်လိုက်ပါ။ ဒါက သင့်ကိုရှေ့ဆက်ဖို့ ကူညီမှာမဟုတ်ပါဘူး။ ဒီနေ့ကိုပဲ အာရုံစိုက်ပါ။ 🌞",
-    "You still have all the sober days you collected. They are not gone. 🗓️ | သင်စုဆောင်းခဲ့တဲ့ အရက်မသောက်တဲ့နေ့တွေအားလုံး ရှိနေတုန်းပါပဲ။ သူတို့က ပျောက်မသွားပါဘူး။ 🗓️",
-    "A moment of weakness does not make you a weak person. It makes you human. ❤️ | အားနည်းတဲ့အခိုက်အတန့်တစ်ခုက သင့်ကို အားနည်းတဲ့သူတစ်ယောက်ဖြစ်မသွားစေပါဘူး။ ဒါက သင့်ကို လူသားတစ်ယောက်ဖြစ်စေပါတယ်။ ❤️",
-    "What can we learn from this? Every experience is a teacher. 🧑‍🏫 | ဒီအဖြစ်အပျက်ကနေ ကျွန်တော်တို့ ဘာသင်ယူနိုင်မလဲ။ အတွေ့အကြုံတိုင်းက ဆရာတစ်ယောက်ပါပဲ။ 🧑‍🏫",
-    "Tomorrow is a blank page. You get to decide what to write on it. 📖 | မနက်ဖြန်က စာမျက်နှာအလွတ်တစ်ခုပါ။ သင်အဲ့ဒီပေါ်မှာ ဘာရေးမလဲဆိုတာကို ဆုံးဖြတ်ခွင့်ရှိပါတယ်။ 📖",
-    "The path to healing has bumps. This was just a bump. Keep going.  bumpy_road | ကုစားခြင်းဆီသို့ လမ်းမှာ ကြမ်းတမ်းမှုတွေရှိပါတယ်။ ဒါက ကြမ်းတမ်းမှုတစ်ခုပါပဲ။ ရှေ့ဆက်သွားပါ။  bumpy_road",
-    "Your worth is not measured by your stumbles, but by your courage to rise again. 🌟 | သင့်တန်ဖိုးကို သင်ရဲ့ချော်လဲမှုတွေနဲ့ တိုင်းတာတာမဟုတ်ဘဲ၊ ပြန်ထဖို့ သတ္တိရှိခြင်းနဲ့ တိုင်းတာတာပါ။ 🌟",
-    "Resetting is a sign of strength, not weakness. It means you're still in the fight. 🥊 | ပြန်လည်စတင်ခြင်းက ကြံ့ခိုင်မှုရဲ့လက္ခဏာပါ၊ အားနည်းမှုမဟုတ်ပါဘူး။ ဒါက သင်တိုက်ပွဲဝင်နေတုန်းပဲဆိုတဲ့ အဓိပ္ပာယ်ပါ။ 🥊",
-    "You have not failed. You are in the middle of your comeback story. 🎬 | သင်မရှုံးနိမ့်သေးပါဘူး။ သင်ဟာ သင်ရဲ့ပြန်လာခြင်းဇတ်လမ်းအလယ်မှာ ရှိနေတာပါ။ 🎬",
-    "I'm still here for you, no matter what. Let's figure out the next step. 🤝 | ဘာပဲဖြစ်ဖြစ် ကျွန်တော်သင့်အတွက် ရှိနေပါတယ်။ နောက်တစ်ဆင့်ကို အတူတူစဉ်းစားကြရအောင်။ 🤝",
-    "Take a deep breath. You are still here. You can still make a different choice for the rest of the day. 🙏 | အသက်ကို sâu sâu ရှူပါ။ သင်ဒီမှာ ရှိနေတုန်းပါပဲ။ နေ့ရဲ့ကျန်တဲ့အချိန်အတွက် မတူညီတဲ့ရွေးချယ်မှုတစ်ခုကို သင်လုပ်နိုင်ပါသေးတယ်။ 🙏",
-    "This is a moment to practice self-compassion. Treat yourself gently. 💖 | ဒါက ကိုယ့်ကိုယ်ကိုသနားကြင်နာမှုကို လေ့ကျင့်ရမယ့်အချိန်ပါ။ ကိုယ့်ကိုယ်ကို ညင်သာစွာဆက်ဆံပါ။ 💖",
-    "Don't let one choice overshadow all the good choices you've made. ✨ | သင်ချခဲ့တဲ့ ရွေးချယ်မှုကောင်းတွေအားလုံးကို ရွေးချယ်မှုတစ်ခုတည်းက ဖုံးလွှမ်းမသွားပါစေနဲ့။ ✨",
-    "Progress is a spiral, not a straight line. Sometimes we circle back to learn something again. 🌀 | တိုးတက်မှုဆိုတာ ဝង់ပတ်တစ်ခုပါ၊ ဖြောင့်တန်းတဲ့လမ်းမဟုတ်ပါဘူး။ တခါတလေ ကျွန်တော်တို့ တစ်ခုခုကို ပြန်သင်ယူဖို့ နောက်ပြန်လှည့်တတ်ကြပါတယ်။ 🌀",
-    "This is an opportunity to strengthen your strategies. What can we do differently next time? 🤔 | ဒါက သင်ရဲ့နည်းဗျူဟာတွေကို ပိုမိုခိုင်မာစေဖို့ အခွင့်အရေးတစ်ခုပါ။ နောက်တစ်ခါ ဘာကိုကွဲပြားစွာလုပ်ဆောင်နိုင်မလဲ။ 🤔",
-    "Your commitment to this journey is what truly matters. And you're still committed. 👍 | ဒီခရီးအပေါ် သင်ရဲ့ကတိကဝတ်ကသာ တကယ်အရေးကြီးတာပါ။ ပြီးတော့ သင်ကတိတည်နေတုန်းပါပဲ။ 👍",
-    "Every expert was once a beginner. And every recovery has restarts. 💯 | ကျွမ်းကျင်သူတိုင်းက တစ်ချိန်က အစပြုသူတစ်ယောက်ပါပဲ။ ပြီးတော့ နလန်ထူခြင်းတိုင်းမှာ ပြန်စခြင်းတွေရှိပါတယ်။ 💯",
-    "This moment does not have to define your entire day or week. You can start fresh right now. 🌅 | ဒီအခိုက်အတန့်က သင်ရဲ့တစ်နေ့တာ (သို့) တစ်ပတ်တာလုံးကို အဓိပ္ပာယ်ဖွင့်ဆိုစရာမလိုပါဘူး။ သင်အခုချက်ချင်း အသစ်ပြန်စနိုင်ပါတယ်။ 🌅",
-    "Focus on the next right choice. That's all you need to do. ✅ | နောက်ထပ်မှန်ကန်တဲ့ ရွေးချယ်မှုတစ်ခုကိုပဲ အာရုံစိုက်ပါ။ ဒါက သင်လုပ်ဖို့လိုအပ်တဲ့အရာအားလုံးပါပဲ။ ✅",
-    "You are learning your triggers. This is valuable information. 🧠 | သင်ဟာ သင့်ကိုလှုံ့ဆော်တဲ့အရာတွေကို သင်ယူနေတာပါ။ ဒါက တန်ဖိုးရှိတဲ့အချက်အလက်ပါပဲ။ 🧠",
-    "The sun will rise again tomorrow, and so will you. ☀️ | မနက်ဖြန်မှာ နေပြန်ထွက်လာဦးမှာပါ၊ သင်လည်းအတူတူပါပဲ။ ☀️",
-    "This is a marathon, not a sprint. It's okay to slow down and even stop to rest. 🏃‍♀️ | ဒါက မာရသွန်တစ်ခုပါ၊ အမြန်ပြေးပွဲမဟုတ်ပါဘူး။ ဖြည်းဖြည်းသွားတာ၊ အနားယူဖို့ရပ်တာမျိုးက ကိစ္စမရှိပါဘူး။ 🏃‍♀️",
-    "Your worth is inherent and unconditional. It is not affected by this. 💎 | သင့်တန်ဖိုးက မွေးရာပါဖြစ်ပြီး အခြေအနေအရမဟုတ်ပါဘူး။ ဒါက သင့်တန်ဖိုးကို မထိခိုက်ပါဘူး။ 💎",
-    "Let this be a reminder of why you want to be sober, not a reason to give up. ❤️‍🔥 | ဒါက သင်ဘာကြောင့်အရက်ကင်းစင်ချင်လဲဆိုတာကို သတိပေးတဲ့အရာဖြစ်ပါစေ၊ အရှုံးပေးဖို့အကြောင်းผลမဟုတ်ပါဘူး။ ❤️‍🔥",
-    "You are more than this one moment, this one choice. ✨ | သင်ဟာ ဒီအခိုက်အတန့်တစ်ခု၊ ဒီရွေးချယ်မှုတစ်ခုထက် အများကြီးပိုပါတယ်။ ✨",
-    "It takes great strength to admit a setback. I'm proud of you for that. 💪 | ချော်လဲမှုကို ဝန်ခံဖို့ သတ္တိအများကြီးလိုပါတယ်။ အဲ့ဒီအတွက် သင့်ကိုဂုဏ်ယူပါတယ်။ 💪",
-    "We don't erase the past, we learn from it and build a better future. 🏗️ | ကျွန်တော်တို့က အတိတ်ကို မဖျက်ပါဘူး၊ သူ့ဆီကနေသင်ယူပြီး ပိုကောင်းတဲ့အနာဂတ်ကို တည်ဆောက်ပါတယ်။ 🏗️",
-    "This is a chance to come back even more determined. 🔥 | ဒါက ပိုပြီးခိုင်မာတဲ့ဆုံးဖြတ်ချက်နဲ့ ပြန်လာဖို့ အခွင့်အရေးတစ်ခုပါ။ 🔥",
-    "You are still on the path. You just hit a rough patch. Let's keep moving. 🚶‍♂️ | သင်လမ်းကြောင်းပေါ်မှာ ရှိနေတုန်းပါပဲ။ သင်က ကြမ်းတမ်းတဲ့နေရာတစ်ခုကို ရောက်သွားတာပါပဲ။ ရှေ့ဆက်သွားကြရအောင်။ 🚶‍♂️",
-    "Remember, shame and guilt are not helpful emotions for recovery. Let them go. 🕊️ | ရှက်စိတ်နဲ့ အပြစ်တင်စိတ်တွေက နလန်ထူခြင်းအတွက် အထောက်အကူမပြုတဲ့စိတ်ခံစားချက်တွေဆိုတာ သတိရပါ။ သူတို့ကို လက်လွှတ်လိုက်ပါ။ 🕊️",
-    "The goal hasn't changed. The path just had a detour. Let's get back on track. 🗺️ | ပန်းတိုင်က မပြောင်းလဲပါဘူး။ လမ်းက လမ်းလွှဲတစ်ခုရှိသွားတာပါပဲ။ လမ်းကြောင်းမှန်ပေါ်ပြန်တက်ကြရအောင်။ 🗺️",
-    "Your value doesn't decrease based on someone's inability to see your worth, including your own. ❤️ | သင့်တန်ဖိုးကိုမမြင်နိုင်တဲ့ တစ်စုံတစ်ယောက်ကြောင့် သင့်တန်ဖိုးက မကျဆင်းသွားပါဘူး၊ အဲ့ဒီထဲမှာ သင်ကိုယ်တိုင်လည်း ပါဝင်ပါတယ်။ ❤️",
-    "This is just one chapter in a long book. The ending hasn't been written yet. 📖 | ဒါက စာအုပ်ရှည်ကြီးတစ်အုပ်ထဲက အခန်းတစ်ခန်းပါပဲ။ အဆုံးသတ်ကို မရေးရသေးပါဘူး။ 📖",
-    "You are capable of overcoming this. You've done it before, and you can do it again. 💯 | သင်ဒါကို ကျော်လွှားနိုင်စွမ်းရှိပါတယ်။ သင်အရင်က လုပ်ခဲ့ဖူးပြီး၊ သင်ထပ်လုပ်နိုင်ပါတယ်။ 💯",
-    "Forgiveness is key. Forgive yourself and give yourself another chance. 🙏 | ခွင့်လွှတ်ခြင်းက အဓိကသော့ချက်ပါပဲ။ ကိုယ့်ကိုယ်ကိုခွင့်လွှတ်ပြီး နောက်ထပ်အခွင့်အရေးတစ်ခုပေးပါ။ 🙏",
-    "This is a temporary setback, not a permanent failure. ⏳ | ဒါက ယာယီနောက်ပြန်ဆုတ်ခြင်းပါ၊ ထာဝရရှုံးနိမ့်မှုမဟုတ်ပါဘူး။ ⏳",
-    "A smooth sea never made a skilled sailor. This is making you stronger. ⛵ | ငြိမ်သက်တဲ့ပင်လယ်က ကျွမ်းကျင်တဲ့သင်္ဘောသားတစ်ယောက်ကို ဘယ်တော့မှမမွေးထုတ်ပေးပါဘူး။ ဒါက သင့်ကို ပိုပြီးသန်မာစေပါတယ်။ ⛵",
-    "You have the power to start over at any moment. Let's start over now. 🌅 | သင်ဟာ ဘယ်အချိန်မဆို အသစ်ပြန်စဖို့ စွမ်းအားရှိပါတယ်။ အခုပဲ ပြန်စလိုက်ကြရအောင်။ 🌅"
-    ]
-
-motivational_photo_urls = [
-    "https://images.unsplash.com/photo-1500534314209-a25ddb2bd429?w=1200",
-    "https://images.unsplash.com/photo-1500530855697-b586d89ba3ee?w=1200",
-    "https://images.unsplash.com/photo-1522202176988-66273c2fd55f?w=1200",  # calm sunrise
-    "https://images.unsplash.com/photo-1517849845537-4d257902454a?w=1200",  # peace & clarity
-    "https://images.unsplash.com/photo-1519681393784-d120267933ba?w=1200",  # minimalist motivation
-    "https://images.unsplash.com/photo-1493244040629-496f6d136cc3?w=1200",  # forest reflection
-    "https://images.unsplash.com/photo-1470770841072-f978cf4d019e?w=1200",  # sunrise mountains
-    "https://images.unsplash.com/photo-1503264116251-35a269479413?w=1200",  # open ocean calmness
-    "https://images.unsplash.com/photo-1500534623283-312aade485b7?w=1200",  # still lake balance
-    "https://images.unsplash.com/photo-1483794344563-d27a8d18014e?w=1200",  # serene mindfulness
-    "https://images.unsplash.com/photo-1500530855697-b586d89ba3ee?w=1200",  # focus energy
-    "https://images.unsplash.com/photo-1507525428034-b723cf961d3e?w=1200",  # sunrise sea
-    "https://images.unsplash.com/photo-1522202176988-66273c2fd55f?w=1200",  # peaceful forest
-    "https://images.unsplash.com/photo-1486308510493-aa64833634ef?w=1200",  # strength and calm
-    "https://images.unsplash.com/photo-1465101162946-4377e57745c3?w=1200",  # resilience & courage
-    "https://images.unsplash.com/photo-1514516870926-2059898be0c8?w=1200",  # morning renewal
-    "https://images.unsplash.com/photo-1496307042754-b4aa456c4a2d?w=1200",  # calm success mindset
-]
+class ContentPack:
+    """Message banks and photo URLs loaded lazily from a JSON content pack.
+
+    The file is read on first use and re-read when its mtime changes (checked
+    at most every `check_interval` seconds), so copy can be edited without a
+    redeploy. `pick` walks a per-user shuffle: every entry is shown once
+    before any repeats, and never the same one twice in a row. The shuffle
+    is recomputed from a seed of (bank, chat, pass), so a user costs one
+    draw counter per bank instead of a stored permutation.
+    """
+
+    def __init__(self, path, check_interval=30):
+        self.path = path
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.banks = None
+        self.mtime = None
+        self.checked = 0.0
+        self.salt = random.getrandbits(64)
+        self.drawn = {}  # bank -> {chat_id: entries drawn since the pack was loaded}
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self.banks is not None and now - self.checked < self.check_interval:
+            return
+        self.checked = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+            if mtime == self.mtime:
+                return
+            with open(self.path, "r", encoding="utf-8") as f:
+                banks = json.load(f)
+        except (OSError, ValueError) as e:
+            if self.banks is None:
+                raise
+            logger.warning(f"Content pack reload failed, keeping previous: {e}")
+            return
+        self.banks, self.mtime = banks, mtime
+        self.drawn.clear()
+        logger.info(f"📚 Content pack loaded: {', '.join(f'{k}={len(v)}' for k, v in banks.items())}")
+
+    def _order(self, name, chat_id, n, shuffle):
+        order = list(range(n))
+        random.Random(hash((self.salt, name, chat_id, shuffle))).shuffle(order)
+        return order
+
+    def pick(self, name, chat_id=None):
+        with self.lock:
+            self._refresh()
+            items = self.banks.get(name) or [""]
+            drawn = self.drawn.setdefault(name, {})
+            k = drawn.get(chat_id, 0)
+            drawn[chat_id] = k + 1
+            n = len(items)
+            # Two entries just alternate; one repeats.
+            shuffle, pos = divmod(k, n) if n > 2 else (0, k % n)
+            order = self._order(name, chat_id, n, shuffle)
+            if shuffle and pos < 2 and order[0] == self._order(name, chat_id, n, shuffle - 1)[-1]:
+                # Swapping the first two keeps the last entry, which the next pass checks against.
+                order[0], order[1] = order[1], order[0]
+            return items[order[pos]]
+
+
+content = ContentPack(CONTENT_PATH)
 
 MILESTONE_DAYS = [3, 5, 7, 10, 14, 17, 21, 25, 30]
 
 # === STORAGE (Google Sheets or Memory) ===
 class InMemoryStore:
-    def __init__(self):
+    """Users and relapse log kept in process memory.
+
+    With a `snapshot_path`, the last snapshot is loaded on start and a compact
+    one (rows, not dicts) is rewritten every `snapshot_interval` seconds if
+    anything changed, and at exit.
+    """
+
+    def __init__(self, snapshot_path=None, snapshot_interval=60.0):
         self.users = {}
         self.log = []
+        self.changes = 0
+        self.saved = 0
+        self.snapshot_path = snapshot_path
+        self.snapshot_lock = threading.Lock()
+        if snapshot_path:
+            self.load_snapshot()
+            if snapshot_interval > 0:
+                threading.Thread(target=self._snapshot_loop, args=(snapshot_interval,), daemon=True).start()
+            atexit.register(self.snapshot)
 
     def ensure_user(self, chat_id, username):
         cid = str(chat_id)
@@ -344,102 +515,737 @@ class InMemoryStore:
                 "last_sober_date": today,
                 "morning_time": "08:00",
                 "night_time": "21:00",
+                "timezone": "",
             }
+        elif username and self.users[cid].get("username") != username:
+            self.users[cid]["username"] = username
         else:
-            self.users[cid]["username"] = username or self.users[cid].get("username", "")
+            return
+        self.changes += 1
 
     def get_user(self, chat_id):
         return self.users.get(str(chat_id))
 
-    def set_last_sober(self, chat_id, iso_date):
+    def _set_field(self, chat_id, key, value):
         u = self.get_user(chat_id)
-        if u:
-            u["last_sober_date"] = iso_date
+        if u and u.get(key) != value:
+            u[key] = value
+            self.changes += 1
+
+    def set_last_sober(self, chat_id, iso_date):
+        self._set_field(chat_id, "last_sober_date", iso_date)
+
+    def set_reminder_time(self, chat_id, kind, hhmm):
+        self._set_field(chat_id, f"{kind}_time", hhmm)
+
+    def set_timezone(self, chat_id, name):
+        self._set_field(chat_id, "timezone", name)
 
     def append_log(self, item):
-        self.log.append(item)
+        self.append_logs([item])
+
+    def append_logs(self, items):
+        self.log.extend(items)
+        self.changes += 1
 
     def all_users(self):
         return list(self.users.values())
 
+    def iter_users(self, chunk_size=500):
+        yield from list(self.users.values())
+
+    def iter_logs(self, chunk_size=500):
+        yield from list(self.log)
+
+    def write_users(self, users):
+        for u in users:
+            self.users[str(u["chat_id"])] = {**user_from_row([]), **u, "chat_id": str(u["chat_id"])}
+        self.changes += 1
+
+    def snapshot(self):
+        if not self.snapshot_path:
+            return
+        with self.snapshot_lock:
+            changes = self.changes
+            if changes == self.saved:
+                return
+            data = {"user_fields": USER_FIELDS, "log_fields": LOG_FIELDS,
+                    "users": [user_to_row(u) for u in list(self.users.values())],
+                    "log": [[i.get(k) for k in LOG_FIELDS] for i in list(self.log)]}
+            tmp = self.snapshot_path + ".tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(orjson.dumps(data) if orjson is not None else json.dumps(data).encode())
+                os.replace(tmp, self.snapshot_path)
+            except OSError as e:
+                logger.warning(f"Snapshot to {self.snapshot_path} failed: {e}")
+                return
+            self.saved = changes
+
+    def load_snapshot(self):
+        t0 = time.perf_counter()
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Snapshot {self.snapshot_path} unreadable, starting empty: {e}")
+            return
+        # Field lists travel with the rows, so snapshots survive added columns.
+        user_fields, log_fields = data.get("user_fields", USER_FIELDS), data.get("log_fields", LOG_FIELDS)
+        if user_fields == USER_FIELDS:
+            self.users = {row[0]: dict(zip(USER_FIELDS, row)) for row in data.get("users", [])}
+        else:
+            blank = user_from_row([])
+            for row in data.get("users", []):
+                u = dict(blank, **dict(zip(user_fields, row)))
+                self.users[u["chat_id"]] = u
+        self.log = [dict(zip(log_fields, row)) for row in data.get("log", [])]
+        logger.info(f"💾 Restored {len(self.users)} users and {len(self.log)} log rows from "
+                    f"{self.snapshot_path} in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    def _snapshot_loop(self, interval):
+        while True:
+            time.sleep(interval)
+            self.snapshot()
 
-def init_google_sheets():
-    global store
-    if not GS_AVAILABLE or not GOOGLE_CREDENTIALS:
+
+# "timezone" is an IANA name or "UTC+HH:MM"; empty means the bot's TIMEZONE.
+USER_FIELDS = ["chat_id", "username", "last_sober_date", "morning_time", "night_time", "timezone"]
+USER_HEADERS = ["Chat_ID", "Username", "Last_Sober_Date", "Morning_Time", "Night_Time", "Timezone"]
+
+
+def user_from_row(r):
+    r = list(r) + [""] * (len(USER_FIELDS) - len(r))
+    return dict(zip(USER_FIELDS, r))
+
+
+def user_to_row(u):
+    return [u.get(k, "") for k in USER_FIELDS]
+
+
+LOG_FIELDS = ["timestamp", "chat_id", "username", "relapse_text", "beverage", "ml", "count", "total_ml", "std_drinks"]
+LOG_HEADERS = ["Timestamp", "Chat_ID", "Username", "Relapse", "Beverage", "ML", "Count", "Total_ML", "Std_Drinks"]
+
+
+def log_to_row(item):
+    return ["" if item.get(k) is None else item[k] for k in LOG_FIELDS]
+
+
+def backfill_header(ws, headers):
+    """Label columns added after the worksheet was created (Timezone, typed Log fields).
+
+    Never fatal: a quota error or protected range leaves the labels missing,
+    not the bot without Sheets.
+    """
+    try:
+        header = ws.row_values(1)
+        if len(header) < len(headers):
+            first, last = chr(ord("A") + len(header)), chr(ord("A") + len(headers) - 1)
+            ws.update([headers[len(header):]], f"{first}1:{last}1")
+    except Exception as e:
+        logger.warning(f"Header back-fill on {ws.title} failed: {e}")
+
+
+class CachedStore:
+    """Write-back cache in front of a slow backend (SheetStore).
+
+    The Users sheet is loaded once; reads are served from memory and changed
+    rows are flushed in one batch every `flush_interval` seconds, as soon as
+    `max_dirty` rows are pending, and at exit.
+    """
+
+    def __init__(self, backend, flush_interval=5.0, max_dirty=50):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.max_dirty = max_dirty
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.users = {u["chat_id"]: u for u in backend.all_users()}
+        self.dirty = set()
+        self.wake = threading.Event()
+        if flush_interval > 0:
+            threading.Thread(target=self._flush_loop, daemon=True).start()
+        atexit.register(self.flush)
+
+    def _mark_dirty(self, cid):
+        self.dirty.add(cid)
+        if self.flush_interval <= 0:
+            return True
+        if len(self.dirty) >= self.max_dirty:
+            self.wake.set()
+        return False
+
+    def ensure_user(self, chat_id, username):
+        cid = str(chat_id)
+        with self.lock:
+            u = self.users.get(cid)
+            if u is None:
+                self.users[cid] = {
+                    "chat_id": cid,
+                    "username": username or "",
+                    "last_sober_date": datetime.now(TIMEZONE).date().isoformat(),
+                    "morning_time": "08:00",
+                    "night_time": "21:00",
+                    "timezone": "",
+                }
+                now = self._mark_dirty(cid)
+            elif username and u.get("username") != username:
+                u["username"] = username
+                now = self._mark_dirty(cid)
+            else:
+                return
+        if now:
+            self.flush()
+
+    def get_user(self, chat_id):
+        with self.lock:
+            u = self.users.get(str(chat_id))
+            return dict(u) if u else None
+
+    def _set_field(self, chat_id, key, value):
+        cid = str(chat_id)
+        with self.lock:
+            u = self.users.get(cid)
+            if not u:
+                return
+            u[key] = value
+            now = self._mark_dirty(cid)
+        if now:
+            self.flush()
+
+    def set_last_sober(self, chat_id, iso_date):
+        self._set_field(chat_id, "last_sober_date", iso_date)
+
+    def set_reminder_time(self, chat_id, kind, hhmm):
+        self._set_field(chat_id, f"{kind}_time", hhmm)
+
+    def set_timezone(self, chat_id, name):
+        self._set_field(chat_id, "timezone", name)
+
+    def append_log(self, item):
+        self.backend.append_log(item)
+
+    def append_logs(self, items):
+        self.backend.append_logs(items)
+
+    def all_users(self):
+        with self.lock:
+            return [dict(u) for u in self.users.values()]
+
+    def iter_users(self, chunk_size=500):
+        yield from self.all_users()
+
+    def iter_logs(self, chunk_size=500):
+        yield from self.backend.iter_logs(chunk_size)
+
+    def write_users(self, users):
+        with self.lock:
+            for u in users:
+                cid = str(u["chat_id"])
+                self.users[cid] = {**user_from_row([]), **u, "chat_id": cid}
+                self.dirty.add(cid)
+        self.flush()
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                if not self.dirty:
+                    return
+                cids, self.dirty = self.dirty, set()
+                rows = [dict(self.users[c]) for c in cids]
+            try:
+                self.backend.write_users(rows)
+            except Exception as e:
+                logger.warning(f"Store flush failed ({len(rows)} rows), will retry: {e}")
+                with self.lock:
+                    self.dirty |= cids
+
+    def _flush_loop(self):
+        while True:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+
+
+_sqlite = threading.local()
+
+
+def sqlite_connect(path):
+    """This thread's connection to `path`.
+
+    sqlite3 connections are per thread, so each thread opens one per
+    database and keeps it: autocommit (see transaction()), WAL so readers
+    run alongside a writer, and a busy timeout for writers in other workers.
+    """
+    conns = getattr(_sqlite, "conns", None)
+    if conns is None:
+        conns = _sqlite.conns = {}
+    db = conns.get(path)
+    if db is None:
+        db = conns[path] = sqlite3.connect(path, timeout=10, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+@contextmanager
+def transaction(db, mode=""):
+    """BEGIN [IMMEDIATE] ... COMMIT around the block, ROLLBACK if it raises."""
+    db.execute(f"BEGIN {mode}".rstrip())
+    try:
+        yield db
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
+
+
+@timed_backend("sqlite")
+class SQLiteStore:
+    """Durable local store (WAL mode), shareable by workers on one host."""
+
+    def __init__(self, path):
+        self.path = path
+        db = self._db()
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS users (
+                chat_id TEXT PRIMARY KEY,
+                username TEXT NOT NULL DEFAULT '',
+                last_sober_date TEXT NOT NULL,
+                morning_time TEXT NOT NULL DEFAULT '08:00',
+                night_time TEXT NOT NULL DEFAULT '21:00',
+                timezone TEXT NOT NULL DEFAULT ''
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS log (
+                id INTEGER PRIMARY KEY,
+                timestamp TEXT NOT NULL,
+                chat_id TEXT NOT NULL,
+                username TEXT NOT NULL DEFAULT '',
+                relapse_text TEXT NOT NULL,
+                beverage TEXT,
+                ml INTEGER,
+                count INTEGER,
+                total_ml REAL,
+                std_drinks REAL
+            );
+            CREATE INDEX IF NOT EXISTS log_timestamp ON log (timestamp);
+        """)
+        # Databases created before per-user time zones and typed relapse fields existed.
+        if "timezone" not in {r["name"] for r in self._query("PRAGMA table_info(users)")}:
+            db.execute("ALTER TABLE users ADD COLUMN timezone TEXT NOT NULL DEFAULT ''")
+        have = {r["name"] for r in self._query("PRAGMA table_info(log)")}
+        for column, kind in [("beverage", "TEXT"), ("ml", "INTEGER"), ("count", "INTEGER"),
+                             ("total_ml", "REAL"), ("std_drinks", "REAL")]:
+            if column not in have:
+                db.execute(f"ALTER TABLE log ADD COLUMN {column} {kind}")
+
+    def _db(self):
+        return sqlite_connect(self.path)
+
+    def _query(self, sql, params=()):
+        # Rows by column name here only; the connection is shared with other users of the file.
+        cur = self._db().cursor()
+        cur.row_factory = sqlite3.Row
+        return cur.execute(sql, params)
+
+    def ensure_user(self, chat_id, username):
+        self._db().execute(
+            "INSERT INTO users (chat_id, username, last_sober_date) VALUES (?, ?, ?) "
+            "ON CONFLICT(chat_id) DO UPDATE SET username = excluded.username WHERE excluded.username != ''",
+            (str(chat_id), username or "", datetime.now(TIMEZONE).date().isoformat()))
+
+    def get_user(self, chat_id):
+        row = self._query("SELECT * FROM users WHERE chat_id = ?", (str(chat_id),)).fetchone()
+        return dict(row) if row else None
+
+    def set_last_sober(self, chat_id, iso_date):
+        self._db().execute("UPDATE users SET last_sober_date = ? WHERE chat_id = ?", (iso_date, str(chat_id)))
+
+    def set_reminder_time(self, chat_id, kind, hhmm):
+        column = {"morning": "morning_time", "night": "night_time"}[kind]
+        self._db().execute(f"UPDATE users SET {column} = ? WHERE chat_id = ?", (hhmm, str(chat_id)))
+
+    def set_timezone(self, chat_id, name):
+        self._db().execute("UPDATE users SET timezone = ? WHERE chat_id = ?", (name, str(chat_id)))
+
+    def append_log(self, item):
+        self.append_logs([item])
+
+    def append_logs(self, items):
+        with transaction(self._db()) as db:
+            db.executemany(
+                f"INSERT INTO log ({', '.join(LOG_FIELDS)}) VALUES ({', '.join('?' * len(LOG_FIELDS))})",
+                [(i["timestamp"], str(i["chat_id"]), i["username"] or "", i["relapse_text"],
+                  *(i.get(k) for k in LOG_FIELDS[4:])) for i in items])
+
+    def all_users(self):
+        return [dict(r) for r in self._query("SELECT * FROM users")]
+
+    def _iter_rows(self, sql, chunk_size):
+        cur = self._query(sql)
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            for r in rows:
+                yield dict(r)
+
+    def iter_users(self, chunk_size=500):
+        return self._iter_rows(f"SELECT {', '.join(USER_FIELDS)} FROM users", chunk_size)
+
+    def iter_logs(self, chunk_size=500):
+        return self._iter_rows(f"SELECT {', '.join(LOG_FIELDS)} FROM log ORDER BY id", chunk_size)
+
+    def write_users(self, users):
+        with transaction(self._db()) as db:
+            db.executemany(
+                f"INSERT INTO users ({', '.join(USER_FIELDS)}) VALUES ({', '.join('?' * len(USER_FIELDS))}) "
+                f"ON CONFLICT(chat_id) DO UPDATE SET "
+                f"{', '.join(f'{k} = excluded.{k}' for k in USER_FIELDS[1:])}",
+                [user_to_row({**u, "chat_id": str(u["chat_id"])}) for u in users])
+
+
+def connect_store():
+    backend = STORE_BACKEND
+    if not backend:
+        if GS_AVAILABLE and GOOGLE_CREDENTIALS:
+            backend = "sheets"
+        else:
+            backend = "sqlite" if WORKERS > 1 else "memory"
+
+    if backend == "sqlite":
+        logger.info(f"✅ Using SQLite store at {STORE_DB_PATH}.")
+        return SQLiteStore(STORE_DB_PATH)
+
+    if backend != "sheets" or not GS_AVAILABLE or not GOOGLE_CREDENTIALS:
         logger.warning("Google Sheets not available, using in-memory store.")
-        store = InMemoryStore()
-        return
+        if WORKERS > 1:
+            logger.warning(f"In-memory store is per process; {WORKERS} workers will not share users.")
+            return InMemoryStore()
+        return InMemoryStore(SNAPSHOT_PATH, SNAPSHOT_INTERVAL)
 
     try:
         creds = json.loads(GOOGLE_CREDENTIALS)
         gc = gspread.service_account_from_dict(creds)
         sh = gc.open(GOOGLE_SHEET_NAME)
     except Exception:
-        store = InMemoryStore()
-        return
+        return InMemoryStore()
 
     try:
         users_ws = sh.worksheet("Users")
+        backfill_header(users_ws, USER_HEADERS)
     except WorksheetNotFound:
         users_ws = sh.add_worksheet(title="Users", rows="1000", cols="10")
-        users_ws.append_row(["Chat_ID", "Username", "Last_Sober_Date", "Morning_Time", "Night_Time"])
+        users_ws.append_row(USER_HEADERS)
 
     try:
         log_ws = sh.worksheet("Log")
+        backfill_header(log_ws, LOG_HEADERS)
     except WorksheetNotFound:
         log_ws = sh.add_worksheet(title="Log", rows="1000", cols="10")
-        log_ws.append_row(["Timestamp", "Chat_ID", "Username", "Relapse"])
+        log_ws.append_row(LOG_HEADERS)
 
+    @timed_backend("sheets")
     class SheetStore:
+        """Users sheet accessed through a chat_id -> row index over column A.
+
+        The index is read once (one column) and kept current on appends, so
+        every call is a targeted single-row read or write instead of `find`
+        scanning the whole sheet. A miss re-reads column A once, which also
+        picks up rows added by other workers.
+        """
+
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.rows = {}  # chat_id -> sheet row number
+            self.reindex()
+
+        def reindex(self):
+            col = users_ws.col_values(1)
+            self.rows = {cid: i + 1 for i, cid in enumerate(col) if i > 0 and cid}
+
+        def _row(self, cid):
+            row = self.rows.get(cid)
+            if row is None:
+                with self.lock:
+                    self.reindex()
+                    row = self.rows.get(cid)
+            return row
+
+        def _record_append(self, res, cids):
+            m = re.search(r"![A-Z]+(\d+)", (res or {}).get("updates", {}).get("updatedRange", ""))
+            if m:
+                first = int(m.group(1))
+                for i, cid in enumerate(cids):
+                    self.rows[cid] = first + i
+            else:
+                self.reindex()
+
         def ensure_user(self, chat_id, username):
             cid = str(chat_id)
-            try:
-                users_ws.find(cid)
-            except CellNotFound:
-                users_ws.append_row([cid, username or "", datetime.now(TIMEZONE).date().isoformat(), "08:00", "21:00"])
+            if self._row(cid):
+                return
+            with self.lock:
+                if cid in self.rows:
+                    return
+                res = users_ws.append_row([cid, username or "", datetime.now(TIMEZONE).date().isoformat(), "08:00", "21:00", ""])
+                self._record_append(res, [cid])
 
         def get_user(self, chat_id):
             try:
                 cid = str(chat_id)
-                c = users_ws.find(cid)
-                r = users_ws.row_values(c.row)
-                return {
-                    "chat_id": r[0],
-                    "username": r[1],
-                    "last_sober_date": r[2],
-                    "morning_time": r[3],
-                    "night_time": r[4],
-                }
+                row = self._row(cid)
+                if not row:
+                    return None
+                r = users_ws.get(f"A{row}:F{row}")
+                u = user_from_row(r[0] if r else [])
+                if u["chat_id"] != cid:
+                    # Rows moved under us (edited by hand); rebuild and retry once.
+                    self.reindex()
+                    row = self.rows.get(cid)
+                    if not row:
+                        return None
+                    r = users_ws.get(f"A{row}:F{row}")
+                    u = user_from_row(r[0] if r else [])
+                return u if u["chat_id"] == cid else None
             except Exception:
                 return None
 
-        def set_last_sober(self, chat_id, iso_date):
+        def _update_cell(self, chat_id, col, value):
             try:
-                cid = str(chat_id)
-                c = users_ws.find(cid)
-                users_ws.update_cell(c.row, 3, iso_date)
+                row = self._row(str(chat_id))
+                if row:
+                    users_ws.update_cell(row, col, value)
             except Exception:
                 pass
 
+        def set_last_sober(self, chat_id, iso_date):
+            self._update_cell(chat_id, 3, iso_date)
+
+        def set_reminder_time(self, chat_id, kind, hhmm):
+            self._update_cell(chat_id, 4 if kind == "morning" else 5, hhmm)
+
+        def set_timezone(self, chat_id, name):
+            self._update_cell(chat_id, 6, name)
+
         def append_log(self, item):
-            log_ws.append_row([item["timestamp"], item["chat_id"], item["username"], item["relapse_text"]])
+            self.append_logs([item])
+
+        def append_logs(self, items):
+            log_ws.append_rows([log_to_row(i) for i in items])
+
+        def _iter_rows(self, ws, fields, chunk_size):
+            # Fixed-size row ranges: one read per chunk, never the whole sheet.
+            last_col = chr(ord("A") + len(fields) - 1)
+            start = 2
+            while True:
+                with BACKEND_SECONDS.time("sheets", "get_range"):
+                    rows = ws.get(f"A{start}:{last_col}{start + chunk_size - 1}")
+                for r in rows:
+                    item = dict(zip(fields, list(r) + [""] * (len(fields) - len(r))))
+                    if item["chat_id"]:
+                        yield item
+                if len(rows) < chunk_size:
+                    return
+                start += chunk_size
+
+        def iter_users(self, chunk_size=500):
+            return self._iter_rows(users_ws, USER_FIELDS, chunk_size)
+
+        def iter_logs(self, chunk_size=500):
+            return self._iter_rows(log_ws, LOG_FIELDS, chunk_size)
 
         def all_users(self):
-            rows = users_ws.get_all_values()[1:]
-            return [
-                {"chat_id": r[0], "username": r[1], "last_sober_date": r[2], "morning_time": r[3], "night_time": r[4]}
-                for r in rows
-            ]
+            values = users_ws.get_all_values()
+            users = [user_from_row(r) for r in values[1:]]
+            self.rows = {u["chat_id"]: i + 2 for i, u in enumerate(users) if u["chat_id"]}
+            return [u for u in users if u["chat_id"]]
+
+        def write_users(self, users):
+            # One batch_update for known rows, one append_rows for new users.
+            updates, new = [], []
+            for u in users:
+                row = self.rows.get(u["chat_id"])
+                if row:
+                    updates.append({"range": f"A{row}:F{row}", "values": [user_to_row(u)]})
+                else:
+                    new.append(u)
+            if updates:
+                users_ws.batch_update(updates)
+            if new:
+                with self.lock:
+                    res = users_ws.append_rows([user_to_row(u) for u in new])
+                    self._record_append(res, [u["chat_id"] for u in new])
 
-    store = SheetStore()
     logger.info("✅ Connected to Google Sheets.")
+    if WORKERS > 1:
+        # A per-process cache would diverge between workers; share the sheet.
+        return SheetStore()
+    return CachedStore(SheetStore(), flush_interval=STORE_FLUSH_INTERVAL, max_dirty=STORE_MAX_DIRTY)
+
+
+class StoreUnavailable(Exception):
+    pass
 
 
-init_google_sheets()
+class LazyStore:
+    """Stands in for the store while it connects in the background.
+
+    Attribute access blocks until the backend is set (up to `timeout`), so
+    import and webhook startup don't wait on OAuth and worksheet lookups.
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.ready = threading.Event()
+        self.backend = None
+        self.methods = {}
+
+    def set_backend(self, backend):
+        self.backend = backend
+        self.methods = {}
+        self.ready.set()
+
+    def _timed(self, name, fn):
+        def call(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                STORE_ERRORS.inc(name)
+                raise
+            finally:
+                STORE_SECONDS.observe(time.perf_counter() - t0, name)
+        return call
+
+    def __getattr__(self, name):
+        if not self.ready.wait(self.timeout):
+            raise StoreUnavailable("store still connecting")
+        method = self.methods.get(name)
+        if method is None:
+            attr = getattr(self.backend, name)
+            if not callable(attr):
+                return attr
+            method = self.methods[name] = self._timed(name, attr)
+        return method
+
+
+def init_google_sheets():
+    t0 = time.monotonic()
+    try:
+        backend = connect_store()
+    except Exception as e:
+        logger.error(f"Store init failed, using in-memory store: {e}")
+        backend = InMemoryStore()
+    store.set_backend(backend)
+    startup_timings["store_ms"] = round((time.monotonic() - t0) * 1000)
+    logger.info(f"⏱️ Store ready ({type(backend).__name__}) in {startup_timings['store_ms']} ms")
+
+
+store = LazyStore(STORE_READY_TIMEOUT)
+
+
+threading.Thread(target=init_google_sheets, name="store-init", daemon=True).start()
+
+
+class LogWriter:
+    """Queues relapse log rows and writes them off the event loop.
+
+    A background thread sends everything queued with one `append_logs` call
+    per interval, retrying with backoff. Rows that still fail are spilled to
+    an NDJSON file and replayed ahead of the next batch. Workers on one host
+    share the spill file, so each flush holds an exclusive flock on it.
+    """
+
+    def __init__(self, flush_interval, spill_path, retries=3):
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.retries = retries
+        self.queue = queue.Queue()
+        self.flush_lock = threading.Lock()
+        threading.Thread(target=self._loop, daemon=True).start()
+        atexit.register(self.flush)
+
+    def put(self, item):
+        self.queue.put(item)
+
+    def _drain(self):
+        items = []
+        while True:
+            try:
+                items.append(self.queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def _load_spill(self):
+        try:
+            with open(self.spill_path, "r", encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError):
+            return []
+
+    def _write_spill(self, items):
+        try:
+            if not items:
+                if os.path.exists(self.spill_path):
+                    os.remove(self.spill_path)
+                return
+            tmp = self.spill_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for item in items:
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.spill_path)
+        except OSError as e:
+            logger.error(f"Relapse log spill failed, {len(items)} rows lost: {e}")
+
+    @contextmanager
+    def _spill_lock(self):
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self.spill_path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def flush(self):
+        with self.flush_lock, self._spill_lock():
+            spilled = self._load_spill()
+            items = spilled + self._drain()
+            if not items:
+                return
+            for attempt in range(self.retries):
+                try:
+                    store.append_logs(items)
+                    if spilled:
+                        self._write_spill([])
+                    return
+                except Exception as e:
+                    logger.warning(f"Relapse log write failed ({len(items)} rows, attempt {attempt + 1}): {e}")
+                    if attempt + 1 < self.retries:
+                        time.sleep(min(10, 2 ** attempt))
+            self._write_spill(items)
+
+    def _loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+
+log_writer = LogWriter(LOG_FLUSH_INTERVAL, LOG_SPILL_PATH)
 
 # === UTILITIES ===
 def ensure_user(chat_id, username):
     store.ensure_user(chat_id, username)
+    if scheduler and not scheduler.knows(chat_id):
+        u = store.get_user(chat_id)
+        if u:
+            scheduler.schedule_user(u)
 
 
 def get_user(chat_id):
@@ -450,187 +1256,1524 @@ def set_last_sober_date(chat_id, date_str):
     store.set_last_sober(chat_id, date_str)
 
 
-def append_relapse(timestamp, chat_id, username, relapse_text):
-    store.append_log({"timestamp": timestamp, "chat_id": chat_id, "username": username, "relapse_text": relapse_text})
+def set_reminder_time(chat_id, kind, hhmm):
+    store.set_reminder_time(chat_id, kind, hhmm)
+    u = store.get_user(chat_id)
+    if scheduler and u:
+        scheduler.schedule_user(u)
+
+
+def set_timezone(chat_id, name):
+    store.set_timezone(chat_id, name)
+    u = store.get_user(chat_id)
+    if scheduler and u:
+        scheduler.schedule_user(u)
+
+
+def append_relapse(timestamp, chat_id, username, relapse_text, details=None):
+    item = {"timestamp": timestamp, "chat_id": chat_id, "username": username, "relapse_text": relapse_text}
+    item.update(details or {})
+    log_writer.put(item)
+
+
+@lru_cache(maxsize=4096)
+def _date_ordinal(iso):
+    try:
+        return datetime.strptime(iso, "%Y-%m-%d").date().toordinal()
+    except Exception:
+        return -1
+
+
+_UTC_OFFSET = re.compile(r"(?:UTC|GMT)?\s*([+-])(\d{1,2})(?::?(\d{2}))?", re.I)
+
+
+def parse_timezone(value):
+    """'Europe/Berlin', 'UTC+6:30' or '-05' -> stored name, or None if invalid."""
+    value = (value or "").strip()
+    m = _UTC_OFFSET.fullmatch(value)
+    if m:
+        hours, minutes = int(m.group(2)), int(m.group(3) or 0)
+        if hours > 14 or minutes > 59:
+            return None
+        return f"UTC{m.group(1)}{hours:02d}:{minutes:02d}"
+    try:
+        return pytz.timezone(value).zone if value else None
+    except pytz.UnknownTimeZoneError:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _zone(name):
+    m = _UTC_OFFSET.fullmatch(name)
+    if m:
+        minutes = int(m.group(2)) * 60 + int(m.group(3) or 0)
+        return pytz.FixedOffset(minutes if m.group(1) == "+" else -minutes)
+    try:
+        return pytz.timezone(name) if name else TIMEZONE
+    except pytz.UnknownTimeZoneError:
+        return TIMEZONE
+
+
+def user_tz(u):
+    """The user's own time zone, or TIMEZONE if unset."""
+    return _zone((u or {}).get("timezone") or "")
+
+
+def compute_streaks(users, today=None):
+    """Streak days for a whole users snapshot, aligned with `users`.
+
+    Dates are parsed once into a column of ordinals (repeated dates hit the
+    parse cache), so a tick costs one pass over the table and no store calls.
+    Without `today`, each user's day is taken in their own time zone, reading
+    the clock once per distinct zone.
+    """
+    if today is not None:
+        todays = [today.toordinal()] * len(users)
+    else:
+        by_zone = {}
+        todays = []
+        for u in users:
+            tz = user_tz(u)
+            t = by_zone.get(tz)
+            if t is None:
+                t = by_zone[tz] = datetime.now(tz).date().toordinal()
+            todays.append(t)
+    col = array("l", [_date_ordinal(u.get("last_sober_date") or "") for u in users])
+    return [t - d if 0 <= d <= t else 0 for t, d in zip(todays, col)]
 
 
 def get_streak_days(chat_id):
     u = get_user(chat_id)
     if not u:
         return 0
-    try:
-        last_date = datetime.strptime(u["last_sober_date"], "%Y-%m-%d").date()
-        today = datetime.now(TIMEZONE).date()
-        return max(0, (today - last_date).days)
-    except Exception:
-        return 0
+    return compute_streaks([u])[0]
+
+
+class PendingWrites:
+    """Store writes that failed, retried in the background until they land.
+
+    Entries are keyed by what they set (e.g. ("set_last_sober_date", chat_id)),
+    so a newer write replaces a queued one. While a key is queued, new writes
+    for it join the queue instead of racing the retry, keeping their order.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.items = OrderedDict()  # key -> (fn, args)
+        if interval > 0:
+            threading.Thread(target=self._loop, daemon=True).start()
+        atexit.register(self.flush)
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.items
+
+    def put(self, key, fn, args):
+        with self.lock:
+            self.items[key] = (fn, args)
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                items = list(self.items.items())
+            for key, entry in items:
+                fn, args = entry
+                try:
+                    fn(*args)
+                except Exception as e:
+                    # Still down; keep this and everything after it for next time.
+                    logger.warning(f"Store write retry failed ({len(items)} pending): {e}")
+                    return
+                with self.lock:
+                    if self.items.get(key) is entry:
+                        del self.items[key]
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            if self.items:
+                self.flush()
+
+
+class AsyncStore:
+    """Async facade that keeps blocking store calls off the event loop.
+
+    Calls run on a bounded thread pool with a timeout and a circuit breaker.
+    The last user record seen per chat is kept so reads can fall back to it
+    while the backend is slow or down, and failed writes are queued for
+    retry. Local SQLite state (stats, streaks) has its own threads and no
+    breaker, so a Sheets outage doesn't take it down too.
+    """
+
+    def __init__(self, workers, timeout, failures=5, cooldown=30.0, max_cached=10000, retry_interval=10.0):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="store")
+        self.local_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="state")
+        self.retry = PendingWrites(retry_interval)
+        self.timeout = timeout
+        self.max_failures = failures
+        self.cooldown = cooldown
+        self.max_cached = max_cached
+        self.failures = 0
+        self.open_until = 0.0
+        self.users = {}
 
+    async def call(self, fn, *args):
+        if time.monotonic() < self.open_until:
+            raise StoreUnavailable("circuit open")
+        loop = asyncio.get_running_loop()
+        try:
+            result = await asyncio.wait_for(loop.run_in_executor(self.pool, partial(fn, *args)), self.timeout)
+        except Exception as e:
+            self.failures += 1
+            if self.failures >= self.max_failures:
+                self.open_until = time.monotonic() + self.cooldown
+                logger.warning(f"Store circuit open for {self.cooldown}s after {self.failures} failures")
+            raise StoreUnavailable(f"{fn.__name__}: {e!r}") from e
+        self.failures = 0
+        return result
+
+    async def local(self, fn, *args):
+        """Run local SQLite work (relapse_stats, streak_tracker) off the loop."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.local_pool, partial(fn, *args))
+        except Exception as e:
+            raise StoreUnavailable(f"{fn.__name__}: {e!r}") from e
+
+    async def _write(self, key, fn, *args):
+        if key in self.retry:
+            self.retry.put(key, fn, args)
+            return
+        try:
+            await self.call(fn, *args)
+        except StoreUnavailable as e:
+            logger.warning(f"Store write failed ({fn.__name__} {args[0]}), queued for retry: {e}")
+            self.retry.put(key, fn, args)
+
+    def _remember(self, u):
+        cid = u["chat_id"]
+        self.users.pop(cid, None)
+        self.users[cid] = u
+        if len(self.users) > self.max_cached:
+            self.users.pop(next(iter(self.users)))
+
+    def _update_cached(self, chat_id, key, value):
+        u = self.users.get(str(chat_id))
+        if u:
+            u[key] = value
+
+    async def get_user(self, chat_id):
+        try:
+            u = await self.call(get_user, chat_id)
+        except StoreUnavailable as e:
+            logger.warning(f"Store read failed, using cached user: {e}")
+            u = self.users.get(str(chat_id))
+            return dict(u) if u else None
+        if u:
+            self._remember(dict(u))
+        return u
+
+    async def get_streak_days(self, chat_id):
+        u = await self.get_user(chat_id)
+        return compute_streaks([u])[0] if u else 0
+
+    async def ensure_user(self, chat_id, username):
+        await self._write(("ensure_user", str(chat_id)), ensure_user, chat_id, username)
 
-RELAPSE_RE = re.compile(r"([A-Za-z\u1000-\u109F ]+)\s*(\d+ml)?\s*[x×*]\s*(\d+)", re.I)
-CRAVING_KEYWORDS = ["အရက်", "drink", "craving"]
+    async def set_last_sober_date(self, chat_id, iso_date):
+        self._update_cached(chat_id, "last_sober_date", iso_date)
+        await self._write(("set_last_sober_date", str(chat_id)), set_last_sober_date, chat_id, iso_date)
 
+    async def set_reminder_time(self, chat_id, kind, hhmm):
+        self._update_cached(chat_id, f"{kind}_time", hhmm)
+        await self._write(("set_reminder_time", str(chat_id), kind), set_reminder_time, chat_id, kind, hhmm)
 
-def is_craving_text(text):
-    t = text.lower()
-    return any(k in t for k in CRAVING_KEYWORDS)
+    async def set_timezone(self, chat_id, name):
+        self._update_cached(chat_id, "timezone", name)
+        await self._write(("set_timezone", str(chat_id)), set_timezone, chat_id, name)
+
+
+astore = AsyncStore(STORE_WORKERS, STORE_TIMEOUT, STORE_BREAKER_FAILURES, STORE_BREAKER_COOLDOWN,
+                    retry_interval=STORE_RETRY_INTERVAL)
+
+
+def parse_hhmm(value):
+    m = re.fullmatch(r"\s*(\d{1,2}):(\d{2})\s*", value or "")
+    if not m or int(m.group(1)) > 23 or int(m.group(2)) > 59:
+        return None
+    return dtime(int(m.group(1)), int(m.group(2)))
+
+
+# === MESSAGE CLASSIFIER ===
+# English keywords match whole words only ("drink" not in "drinkable"), so
+# inflected forms are listed; Burmese is written without spaces and matches
+# anywhere in the text.
+CRAVING_KEYWORDS = [
+    "အရက်", "drink", "drinks", "drinking", "craving", "cravings", "crave", "craves",
+    "tempted", "temptation", "urge to drink", "want a beer", "need a beer", "want to drink", "need to drink",
+    "သောက်ချင်", "တောင့်တ", "စိတ်ထိန်းမရ", "ဆာလောင်",
+]
+BEVERAGES = {
+    "beer": ["beer", "beers", "lager", "ale", "ဘီယာ"],
+    "wine": ["wine", "red wine", "white wine", "ဝိုင်"],
+    "whisky": ["whisky", "whiskey", "ဝီစကီ"],
+    "vodka": ["vodka", "ဗော့ဒ်ကာ"],
+    "rum": ["rum", "ရမ်"],
+    "gin": ["gin", "ဂျင်"],
+    "soju": ["soju", "ဆိုဂျူ"],
+    "brandy": ["brandy", "ဘရန်ဒီ"],
+    "toddy": ["toddy", "ထန်းရည်"],
+    "liquor": ["liquor", "spirits", "shot", "shots", "အရက်ဖြူ", "အရက်ပြင်း"],
+}
+
+Intent = namedtuple("Intent", "kind beverage label ml count")
+
+
+def _trie_regex(words):
+    """Regex matching any of `words`, factored into a prefix trie.
+
+    Python's re tries alternation branches one by one; sharing prefixes keeps
+    the cost per text position roughly flat as the vocabulary grows.
+    """
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        end = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class MessageClassifier:
+    """Craving/relapse detection over two compiled regexes.
+
+    Craving keywords are one trie-factored pattern searched across the whole
+    text, and craving wins when both appear, as before; otherwise the first
+    relapse report ("Beer 350ml x 5") is parsed. A keyword that is only part
+    of a listed beverage name in that report (အရက် in အရက်ဖြူ) doesn't count.
+    Results for repeated texts come from an LRU cache.
+    """
+
+    WORD = "A-Za-z\u1000-\u109F"
+    # Longest beverage label read before "x N". Bounding it keeps a search
+    # linear: an unbounded run of words is rescanned from every word start.
+    LABEL_WORDS = 4
+
+    def __init__(self, craving_keywords, beverages, cache_size=2048):
+        self.aliases = {a.lower(): name for name, aliases in beverages.items() for a in aliases}
+        keywords = {k.lower() for k in craving_keywords if k}
+        english = sorted(k for k in keywords if re.fullmatch(r"[a-z][a-z ]*[a-z]|[a-z]", k))
+        other = sorted(keywords - set(english))
+        alternatives = []
+        if english:
+            alternatives.append(f"(?<![A-Za-z]){_trie_regex(english)}(?![A-Za-z])")
+        if other:
+            alternatives.append(_trie_regex(other))
+        self.craving = re.compile("|".join(alternatives) or "(?!)", re.I)
+        w = self.WORD
+        label = f"[{w}]+(?: [{w}]+){{0,{self.LABEL_WORDS - 1}}}"
+        self.relapse = re.compile(
+            f"(?<![{w}])(?P<bev>{label})\\s*(?:(?P<ml>\\d+)\\s*ml)?\\s*[x×*]\\s*(?P<cnt>\\d+)", re.I)
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def beverage_of(self, label):
+        key = label.lower()
+        if key in self.aliases:
+            return self.aliases[key]
+        for word in reversed(key.split()):
+            if word in self.aliases:
+                return self.aliases[word]
+        return key
+
+    def _in_alias(self, relapse, m):
+        """True if craving match `m` is only part of a beverage alias in the report's label."""
+        start = relapse.start("bev")
+        for word in relapse.group("bev").split(" "):
+            end = start + len(word)
+            if start <= m.start() and m.end() <= end:
+                return word.lower() in self.aliases
+            start = end + 1
+        return False
+
+    def _classify(self, text):
+        relapse = self.relapse.search(text)
+        for m in self.craving.finditer(text):
+            # "အရက်ဖြူ x 2" reports liquor; its name just starts with the keyword အရက်.
+            if relapse is None or not self._in_alias(relapse, m):
+                return Intent("craving", None, None, None, None)
+        if relapse is None:
+            return Intent(None, None, None, None, None)
+        label = relapse.group("bev").strip()
+        ml = int(relapse.group("ml")) if relapse.group("ml") else None
+        return Intent("relapse", self.beverage_of(label), label, ml, int(relapse.group("cnt")))
+
+
+def load_classifier(path=None):
+    craving, beverages = CRAVING_KEYWORDS, BEVERAGES
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                vocab = json.load(f)
+            craving = craving + list(vocab.get("craving", []))
+            beverages = {**beverages, **vocab.get("beverages", {})}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Vocabulary file {path} not loaded: {e}")
+    return MessageClassifier(craving, beverages)
+
+
+classifier = load_classifier(VOCAB_PATH)
+
+
+# === RELAPSE STATS ===
+# ABV % and default serving (ml) per canonical beverage; a standard drink is
+# 10 g of ethanol (ethanol density 0.789 g/ml).
+DRINK_INFO = {
+    "beer": (5.0, 330),
+    "wine": (12.0, 150),
+    "whisky": (40.0, 30),
+    "vodka": (40.0, 30),
+    "rum": (40.0, 30),
+    "gin": (40.0, 30),
+    "soju": (17.0, 50),
+    "brandy": (40.0, 30),
+    "toddy": (4.0, 330),
+    "liquor": (40.0, 30),
+}
+STATS_WINDOW_DAYS = 30
+
+
+def relapse_details(intent):
+    """Typed Log fields for a relapse intent."""
+    abv, serving = DRINK_INFO.get(intent.beverage, (None, None))
+    ml = intent.ml or serving
+    total_ml = ml * intent.count if ml else None
+    std = round(total_ml * abv / 100 * 0.789 / 10, 2) if total_ml and abv else None
+    return {"beverage": intent.beverage, "ml": intent.ml, "count": intent.count,
+            "total_ml": total_ml, "std_drinks": std}
+
+
+class RelapseStats:
+    """Per-user relapse aggregates, updated incrementally on every log.
+
+    One JSON row per chat in the state database holds all-time totals, per
+    beverage counts and per-day buckets for the last STATS_WINDOW_DAYS days,
+    so /stats is a single primary-key read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._db().execute("CREATE TABLE IF NOT EXISTS relapse_stats ("
+                           "chat_id TEXT PRIMARY KEY, data TEXT NOT NULL) WITHOUT ROWID")
+
+    def _db(self):
+        return sqlite_connect(self.path)
+
+    def get(self, chat_id):
+        row = self._db().execute("SELECT data FROM relapse_stats WHERE chat_id = ?", (str(chat_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add(self, chat_id, day, details):
+        with transaction(self._db(), "IMMEDIATE") as db:
+            row = db.execute("SELECT data FROM relapse_stats WHERE chat_id = ?", (str(chat_id),)).fetchone()
+            data = json.loads(row[0]) if row else {"logs": 0, "total_ml": 0, "std_drinks": 0, "by_beverage": {}, "days": {}}
+            std = details.get("std_drinks") or 0
+            data["logs"] += 1
+            data["total_ml"] += details.get("total_ml") or 0
+            data["std_drinks"] = round(data["std_drinks"] + std, 2)
+            bev = details.get("beverage") or "other"
+            data["by_beverage"][bev] = data["by_beverage"].get(bev, 0) + 1
+            bucket = data["days"].setdefault(day, [0, 0])
+            bucket[0] += 1
+            bucket[1] = round(bucket[1] + std, 2)
+            cutoff = (date.fromisoformat(day) - timedelta(days=STATS_WINDOW_DAYS)).isoformat()
+            data["days"] = {d: v for d, v in data["days"].items() if d > cutoff}
+            data["last"] = day
+            db.execute("INSERT OR REPLACE INTO relapse_stats (chat_id, data) VALUES (?, ?)",
+                       (str(chat_id), json.dumps(data)))
+        return data
+
+
+def summarize_stats(data, today):
+    """Totals for the last 7 and 30 days from the per-day buckets."""
+    out = {}
+    for window in (7, 30):
+        since = (today - timedelta(days=window)).isoformat()
+        days = [v for d, v in data["days"].items() if d > since]
+        out[window] = (sum(v[0] for v in days), round(sum(v[1] for v in days), 2))
+    return out
+
+
+relapse_stats = RelapseStats(STATE_DB_PATH)
 
 
 # === TELEGRAM HANDLERS ===
+@instrumented("start")
 async def cmd_start(update: Update, context):
     user = update.effective_user
-    ensure_user(user.id, user.username)
-    streak = get_streak_days(user.id)
+    await astore.ensure_user(user.id, user.username)
+    streak = await astore.get_streak_days(user.id)
     msg = (f"👋 Hello {user.first_name}! Your current streak is {streak} day(s). Use /status anytime.\n"
            "Send 'Beer 350ml x 5' if you relapsed, or 'အရက်သောက်ချင်တယ်' for craving support.")
     await update.message.reply_text(msg)
 
 
+@instrumented("status")
 async def cmd_status(update: Update, context):
-    days = get_streak_days(update.effective_chat.id)
+    days = await astore.get_streak_days(update.effective_chat.id)
     await update.message.reply_text(f"👣 Your current streak: {days} day(s). Keep going!")
 
 
+@instrumented("settime")
+async def cmd_settime(update: Update, context):
+    args = context.args or []
+    t = parse_hhmm(args[1]) if len(args) == 2 else None
+    if not t or args[0].lower() not in REMINDER_KINDS:
+        await update.message.reply_text("Usage: /settime morning 07:30 or /settime night 21:30")
+        return
+    kind, hhmm = args[0].lower(), t.strftime("%H:%M")
+    user = update.effective_user
+    await astore.ensure_user(update.effective_chat.id, user.username)
+    await astore.set_reminder_time(update.effective_chat.id, kind, hhmm)
+    await update.message.reply_text(f"⏰ {kind.title()} reminder set to {hhmm}.")
+
+
+@instrumented("timezone")
+async def cmd_timezone(update: Update, context):
+    chat_id = update.effective_chat.id
+    args = context.args or []
+    if not args:
+        tz = user_tz(await astore.get_user(chat_id))
+        await update.message.reply_text(
+            f"🌍 Your time zone: {tz.zone or datetime.now(tz).strftime('UTC%z')}.\n"
+            "Change it with /timezone Europe/Berlin or /timezone UTC+6:30")
+        return
+    name = parse_timezone(" ".join(args))
+    if not name:
+        await update.message.reply_text("Unknown time zone. Try /timezone Asia/Bangkok or /timezone UTC+7")
+        return
+    user = update.effective_user
+    await astore.ensure_user(chat_id, user.username)
+    await astore.set_timezone(chat_id, name)
+    now = datetime.now(_zone(name))
+    await update.message.reply_text(f"🌍 Time zone set to {name} (local time {now:%H:%M}). Reminders follow it.")
+
+
+@instrumented("stats")
+async def cmd_stats(update: Update, context):
+    chat_id = update.effective_chat.id
+    try:
+        data = await astore.local(relapse_stats.get, chat_id)
+    except StoreUnavailable:
+        data = None
+    if not data:
+        await update.message.reply_text("📊 No relapses logged. Keep going! 💪")
+        return
+    windows = summarize_stats(data, datetime.now(user_tz(await astore.get_user(chat_id))).date())
+    top = max(data["by_beverage"].items(), key=lambda kv: kv[1])[0]
+    await update.message.reply_text(
+        "📊 Your relapse stats\n"
+        f"Last 7 days: {windows[7][0]} log(s), {windows[7][1]} standard drinks\n"
+        f"Last 30 days: {windows[30][0]} log(s), {windows[30][1]} standard drinks\n"
+        f"All time: {data['logs']} log(s), {round(data['total_ml'])} ml, {data['std_drinks']} standard drinks\n"
+        f"Most logged: {top}")
+
+
+@instrumented("message")
 async def handle_message(update: Update, context):
     txt = update.message.text.strip()
     chat_id = update.effective_chat.id
     user = update.effective_user
-    ensure_user(chat_id, user.username)
+    await astore.ensure_user(chat_id, user.username)
 
-    if is_craving_text(txt):
-        await update.message.reply_text(random.choice(cravingSupportMessages))
+    intent = classifier.classify(txt)
+    if intent.kind == "craving":
+        await update.message.reply_text(content.pick("craving_support", chat_id))
         return
 
-    m = RELAPSE_RE.search(txt)
-    if m:
-        bev, vol, cnt = m.groups()
-        relapse_text = f"{bev.strip()} {vol or ''} x {cnt}"
-        append_relapse(datetime.now(TIMEZONE).isoformat(), chat_id, user.username, relapse_text)
-        set_last_sober_date(chat_id, datetime.now(TIMEZONE).date().isoformat())
-        await update.message.reply_text(random.choice(noJudgmentMessages))
+    if intent.kind == "relapse":
+        relapse_text = f"{intent.label} {f'{intent.ml}ml' if intent.ml else ''} x {intent.count}"
+        now = datetime.now(user_tz(await astore.get_user(chat_id)))
+        details = relapse_details(intent)
+        append_relapse(now.isoformat(), chat_id, user.username, relapse_text, details)
+        try:
+            await astore.local(relapse_stats.add, chat_id, now.date().isoformat(), details)
+        except StoreUnavailable as e:
+            logger.warning(f"Relapse stats update failed for {chat_id}: {e}")
+        # Store before tracker: if advance() reads users in between, it sees
+        # the new date and never re-queues a milestone of the ended streak.
+        await astore.set_last_sober_date(chat_id, now.date().isoformat())
+        try:
+            await astore.local(streak_tracker.reset, chat_id, now.date().isoformat())
+        except StoreUnavailable as e:
+            logger.warning(f"Streak reset failed for {chat_id}: {e}")
+        await update.message.reply_text(content.pick("no_judgment", chat_id))
         await update.message.reply_text(f"Logged relapse: {relapse_text}. Streak reset to 0.")
         return
 
     await update.message.reply_text("Send 'Beer 350ml x 5' for relapse or 'အရက်သောက်ချင်တယ်' for craving help.")
 
 
+COMMANDS = {"start": cmd_start, "status": cmd_status, "settime": cmd_settime, "timezone": cmd_timezone,
+            "stats": cmd_stats}
+
+
+# === MEDIA CACHE ===
+class MediaCache:
+    """Photo URL -> Telegram file_id, persisted to disk.
+
+    The first successful send of a URL uploads it; later sends reuse the
+    file_id so Telegram doesn't refetch the image for every recipient.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.upload_locks = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.ids = json.load(f)
+        except (OSError, ValueError):
+            self.ids = {}
+
+    def get(self, url):
+        return self.ids.get(url)
+
+    def put(self, url, file_id):
+        with self.lock:
+            if self.ids.get(url) == file_id:
+                return
+            self.ids[url] = file_id
+            self._save()
+
+    def invalidate(self, url):
+        with self.lock:
+            if self.ids.pop(url, None) is not None:
+                self._save()
+
+    def _save(self):
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.ids, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Media cache save failed: {e}")
+
+    async def send_photo(self, bot, chat_id, photo, **kwargs):
+        file_id = self.get(photo)
+        if file_id is None:
+            # One upload per URL; concurrent senders wait for its file_id.
+            async with self.upload_locks.setdefault(photo, asyncio.Lock()):
+                file_id = self.get(photo)
+                if file_id is None:
+                    msg = await bot.send_photo(chat_id=chat_id, photo=photo, **kwargs)
+                    if msg.photo:
+                        self.put(photo, msg.photo[-1].file_id)
+                    return msg
+        try:
+            return await bot.send_photo(chat_id=chat_id, photo=file_id, **kwargs)
+        except BadRequest as e:
+            if "file" not in str(e).lower():
+                raise
+            logger.warning(f"Cached file_id rejected for {photo}: {e}")
+            self.invalidate(photo)
+            return await self.send_photo(bot, chat_id, photo, **kwargs)
+
+
+media_cache = MediaCache(MEDIA_CACHE_PATH)
+
+
+# === BROADCAST ===
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        # Telegram flood control applies to the whole bot, not one chat.
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+class Broadcaster:
+    """Rate-limited, bounded-concurrency sender for scheduled messages.
+
+    A job is `(chat_id, send, kwargs)` where `send(chat_id=..., **kwargs)` returns
+    an awaitable (e.g. `bot.send_message`). `run` awaits every job and returns a
+    report dict with sent/failed counts and latency percentiles. All runs share
+    one token bucket, so concurrent broadcasts (reminders, milestones) stay
+    under `rate` together and a flood-control pause stops all of them.
+    """
+
+    def __init__(self, rate=BROADCAST_RATE, concurrency=BROADCAST_CONCURRENCY, retries=BROADCAST_RETRIES):
+        self.rate = rate
+        self.concurrency = concurrency
+        self.retries = retries
+        self.bucket = TokenBucket(rate)
+
+    async def _send(self, bucket, job, latencies, name):
+        cid, send, kwargs = job
+        for attempt in range(self.retries + 1):
+            await bucket.acquire()
+            t0 = time.monotonic()
+            try:
+                await send(chat_id=cid, **kwargs)
+                latencies.append(time.monotonic() - t0)
+                BROADCAST_SEND_SECONDS.observe(latencies[-1], name)
+                return True
+            except RetryAfter as e:
+                logger.warning(f"Broadcast flood control, pausing {e.retry_after}s")
+                bucket.pause(float(e.retry_after))
+            except NetworkError as e:
+                if attempt < self.retries:
+                    await asyncio.sleep(min(30, 2 ** attempt))
+                else:
+                    logger.warning(f"Broadcast to {cid} failed: {e}")
+            except TelegramError as e:
+                # Blocked bot, deleted chat, bad request: retrying won't help.
+                logger.warning(f"Broadcast to {cid} failed: {e}")
+                return False
+        return False
+
+    async def run(self, jobs, name="broadcast", on_sent=None):
+        bucket = self.bucket
+        latencies, counts = [], {"sent": 0, "failed": 0}
+        it = iter(jobs)
+        started = time.monotonic()
+
+        async def worker():
+            for job in it:
+                ok = await self._send(bucket, job, latencies, name)
+                counts["sent" if ok else "failed"] += 1
+                BROADCAST_MESSAGES.inc(name, "sent" if ok else "failed")
+                if ok and on_sent:
+                    on_sent(job)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        latencies.sort()
+        BROADCAST_SECONDS.observe(time.monotonic() - started, name)
+        report = {
+            "name": name,
+            "sent": counts["sent"],
+            "failed": counts["failed"],
+            "elapsed": round(time.monotonic() - started, 3),
+            "p50": round(_percentile(latencies, 0.50), 3),
+            "p95": round(_percentile(latencies, 0.95), 3),
+            "p99": round(_percentile(latencies, 0.99), 3),
+        }
+        if report["sent"] or report["failed"]:
+            logger.info(f"📣 Broadcast report: {report}")
+        return report
+
+
 # === SCHEDULER ===
+class DeliveryLog:
+    """Durable "last delivered date" per (chat_id, kind), kept in SQLite.
+
+    Rows are mirrored in a dict so checks are O(1). Deliveries are written
+    in batches from the scheduler thread while a broadcast runs, never from
+    the bot loop; a restart resends at most the last DELIVERY_FLUSH_INTERVAL
+    of a broadcast it interrupted.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        db = sqlite_connect(path)
+        db.execute("CREATE TABLE IF NOT EXISTS delivery ("
+                   "chat_id TEXT NOT NULL, kind TEXT NOT NULL, last_date TEXT NOT NULL, "
+                   "PRIMARY KEY (chat_id, kind)) WITHOUT ROWID")
+        self.last = {(c, k): d for c, k, d in db.execute("SELECT chat_id, kind, last_date FROM delivery")}
+
+    def get(self, chat_id, kind):
+        return self.last.get((chat_id, kind))
+
+    def mark_many(self, rows):
+        """Record (chat_id, kind, iso_date) rows in one transaction."""
+        with self.lock:
+            rows = [r for r in rows if self.last.get((r[0], r[1])) != r[2]]
+            if not rows:
+                return
+            with transaction(sqlite_connect(self.path)) as db:
+                db.executemany("INSERT INTO delivery (chat_id, kind, last_date) VALUES (?, ?, ?) "
+                               "ON CONFLICT(chat_id, kind) DO UPDATE SET last_date = excluded.last_date", rows)
+            for chat_id, kind, iso_date in rows:
+                self.last[(chat_id, kind)] = iso_date
+
+
+REMINDER_KINDS = {"morning": dtime(8, 0), "night": dtime(21, 0)}
+scheduler = None
+
+
+@lru_cache(maxsize=4096)
+def _local_due(tz, day, t):
+    # Users sharing a zone and reminder time share one due timestamp, so
+    # they pop off the heap together and go out as one broadcast bucket.
+    return tz.localize(datetime.combine(day, t)).timestamp()
+
+
+def _reminder_settings(u):
+    return u.get("morning_time"), u.get("night_time"), u.get("timezone") or ""
+
+
 class DailyScheduler(threading.Thread):
+    """Per-user morning/night reminders kept on a min-heap of due times.
+
+    The thread sleeps until the earliest due entry instead of polling. Changing
+    a user's time pushes a new entry (O(log n)); the superseded one is skipped
+    when popped because its sequence number is no longer the live one.
+    Due times are local to each user's time zone, so sends are spread over
+    the day by UTC offset instead of landing in one global burst.
+    """
+
     def __init__(self, loop, app):
         super().__init__(daemon=True)
         self.loop = loop
         self.app = app
-        self.last_morning, self.last_night = set(), set()
+        self.broadcaster = Broadcaster()
+        self.heap = []  # (due_ts, seq, chat_id, kind)
+        self.live = {}  # (chat_id, kind) -> seq of the current heap entry
+        self.settings = {}  # chat_id -> (morning_time, night_time, timezone) it was scheduled with
+        self.dispatched = {}  # (chat_id, kind) -> local date handed to the broadcaster
+        self.delivery = DeliveryLog(STATE_DB_PATH)
+        self.seq = itertools.count()
+        self.cond = threading.Condition()
+
+    def knows(self, chat_id):
+        return (str(chat_id), "morning") in self.live
+
+    def next_due(self, cid, kind, hhmm, now=None, tz=TIMEZONE):
+        """Timestamp of the next reminder at `hhmm` in `tz`."""
+        now = now.astimezone(tz) if now else datetime.now(tz)
+        t = parse_hhmm(hhmm) or REMINDER_KINDS[kind]
+        day = now.date()
+        due = _local_due(tz, day, t)
+        today = day.isoformat()
+        if due <= (now - REMINDER_GRACE).timestamp() or \
+                today in (self.dispatched.get((cid, kind)), self.delivery.get(cid, kind)):
+            due = _local_due(tz, day + timedelta(days=1), t)
+        return due
+
+    def schedule_user(self, u, now=None):
+        cid = str(u["chat_id"])
+        tz = user_tz(u)
+        with self.cond:
+            self.settings[cid] = _reminder_settings(u)
+            for kind in REMINDER_KINDS:
+                due = self.next_due(cid, kind, u.get(f"{kind}_time"), now, tz)
+                seq = next(self.seq)
+                self.live[(cid, kind)] = seq
+                heapq.heappush(self.heap, (due, seq, cid, kind))
+            if len(self.heap) > 4 * len(self.live) + 64:
+                self.heap = [e for e in self.heap if self.live.get((e[2], e[3])) == e[1]]
+                heapq.heapify(self.heap)
+            self.cond.notify()
+
+    def sync_users(self):
+        # Also picks up /settime and /timezone handled by follower workers,
+        # which have no scheduler of their own to update.
+        for u in store.all_users():
+            cid = u.get("chat_id")
+            if cid and (not self.knows(cid) or self.settings.get(str(cid)) != _reminder_settings(u)):
+                self.schedule_user(u)
+
+    def _wait_due(self, deadline):
+        with self.cond:
+            while True:
+                now = time.time()
+                if self.heap and self.heap[0][0] <= now:
+                    break
+                if now >= deadline:
+                    return []
+                timeout = deadline - now
+                if self.heap:
+                    timeout = min(timeout, self.heap[0][0] - now)
+                self.cond.wait(timeout)
+            due = []
+            while self.heap and self.heap[0][0] <= now:
+                ts, seq, cid, kind = heapq.heappop(self.heap)
+                if self.live.get((cid, kind)) == seq:
+                    del self.live[(cid, kind)]
+                    due.append((ts, cid, kind))
+            return due
+
+    def broadcast(self, jobs, name, record=None):
+        """Run `jobs` on the bot loop and wait for the report.
+
+        The loop only queues sent jobs; `record(batch)` persists them from
+        this thread every DELIVERY_FLUSH_INTERVAL seconds and once at the end.
+        """
+        if not jobs:
+            return None
+        sent = queue.SimpleQueue()
+        fut = asyncio.run_coroutine_threadsafe(
+            self.broadcaster.run(jobs, name, sent.put if record else None), self.loop)
+        batch = []
+        while True:
+            done = wait_futures([fut], DELIVERY_FLUSH_INTERVAL).done
+            while not sent.empty():
+                batch.append(sent.get_nowait())
+            if batch:
+                try:
+                    record(batch)
+                    batch = []
+                except Exception as e:
+                    logger.warning(f"Recording {len(batch)} {name} deliveries failed, will retry: {e}")
+            if done:
+                return fut.result()
+
+    def fire(self, due):
+        if len(due) > SCHEDULER_BULK_READ:
+            # One bulk read beats a lookup per user on uncached backends.
+            snapshot = {u["chat_id"]: u for u in store.all_users()}
+            users = [snapshot.get(cid) for _, cid, _ in due]
+        else:
+            users = [store.get_user(cid) for _, cid, _ in due]
+        streaks = compute_streaks([u or {} for u in users])
+        bot = self.app.bot
+        send_photo = partial(media_cache.send_photo, bot)
+        jobs = {kind: [] for kind in REMINDER_KINDS}
+        days_of = {}
+        for (ts, cid, kind), u, days in zip(due, users, streaks):
+            if not u:
+                continue
+            chat_id = int(cid)
+            if kind == "morning":
+                # Milestone messages come from StreakTracker's event queue.
+                jobs[kind].append((chat_id, send_photo, {"photo": content.pick("photos", cid),
+                                                         "caption": content.pick("motivate", cid)}))
+            else:
+                jobs[kind].append((chat_id, bot.send_message, {
+                    "text": f"Good evening 🌙 — Streak {days} days! {content.pick('celebration', cid)}"}))
+            local_day = datetime.fromtimestamp(ts, user_tz(u)).date().isoformat()
+            days_of[(cid, kind)] = self.dispatched[(cid, kind)] = local_day
+        for u in users:
+            if u:
+                self.schedule_user(u)
+        for kind, kind_jobs in jobs.items():
+            self.broadcast(kind_jobs, kind, record=lambda sent, kind=kind: self.delivery.mark_many(
+                [(str(job[0]), kind, days_of[(str(job[0]), kind)]) for job in sent]))
 
     def run(self):
-        logger.info("🕒 DailyScheduler running every 60s...")
+        logger.info("🕒 DailyScheduler running on per-user reminder times...")
+        next_sync = 0
         while True:
             try:
-                now = datetime.now(TIMEZONE)
-                users = store.all_users()
-                for u in users:
-                    cid = int(u["chat_id"])
-                    days = get_streak_days(cid)
-                    # 8am
-                    if now.hour == 8 and cid not in self.last_morning:
-                        photo = random.choice(motivational_photo_urls)
-                        self.loop.call_soon_threadsafe(
-                            self.loop.create_task,
-                            self.app.bot.send_photo(chat_id=cid, photo=photo,
-                                                    caption=random.choice(motivateMessages))
-                        )
-                        if days in MILESTONE_DAYS:
-                            self.loop.call_soon_threadsafe(
-                                self.loop.create_task,
-                                self.app.bot.send_message(chat_id=cid, text=f"🏆 Milestone reached: {days} days! {random.choice(rewardMessages)}")
-                            )
-                        self.last_morning.add(cid)
-                    # 9pm
-                    if now.hour == 21 and cid not in self.last_night:
-                        self.loop.call_soon_threadsafe(
-                            self.loop.create_task,
-                            self.app.bot.send_message(chat_id=cid,
-                                text=f"Good evening 🌙 — Streak {days} days! {random.choice(celebrationMessages)}")
-                        )
-                        self.last_night.add(cid)
-                # Reset sets at midnight
-                if now.hour == 0:
-                    self.last_morning.clear()
-                    self.last_night.clear()
+                if time.time() >= next_sync:
+                    self.sync_users()
+                    next_sync = time.time() + SCHEDULER_RESYNC
+                due = self._wait_due(next_sync)
+                if due:
+                    with SCHEDULER_TICK_SECONDS.time():
+                        self.fire(due)
             except Exception as e:
                 logger.warning(f"Scheduler error: {e}")
-            time.sleep(60)
+                time.sleep(5)
+
+
+class StreakTracker:
+    """Incremental per-user streaks with a durable milestone event queue.
+
+    Each user's row holds the sober-since date and the streak day already
+    accounted for. A relapse resets it; advance() moves it to today and, when
+    the streak crosses a milestone, queues an event in the same transaction.
+    Events stay in SQLite until sent, so a missed tick or a failed send only
+    delays the message.
+    """
+
+    DROP_STALE = "DELETE FROM milestone_events WHERE chat_id = ? AND sober_since != ? AND sent_at IS NULL"
+
+    def __init__(self, path, milestones):
+        self.path = path
+        self.milestones = sorted(set(milestones))
+        self._db().executescript("""
+            CREATE TABLE IF NOT EXISTS streaks (
+                chat_id TEXT PRIMARY KEY,
+                sober_since TEXT NOT NULL,
+                counted INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS milestone_events (
+                id INTEGER PRIMARY KEY,
+                chat_id TEXT NOT NULL,
+                days INTEGER NOT NULL,
+                sober_since TEXT NOT NULL,
+                due REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                sent_at REAL,
+                UNIQUE (chat_id, sober_since, days)
+            );
+            CREATE INDEX IF NOT EXISTS milestone_pending ON milestone_events (due) WHERE sent_at IS NULL;
+        """)
+
+    def _db(self):
+        return sqlite_connect(self.path)
+
+    def crossed(self, before, after):
+        """Highest milestone m with before < m <= after, or None (binary search)."""
+        i = bisect_right(self.milestones, after)
+        if i and self.milestones[i - 1] > before:
+            return self.milestones[i - 1]
+        return None
+
+    def reset(self, chat_id, iso_date):
+        with transaction(self._db(), "IMMEDIATE") as db:
+            db.execute("INSERT INTO streaks (chat_id, sober_since, counted) VALUES (?, ?, 0) "
+                       "ON CONFLICT(chat_id) DO UPDATE SET sober_since = excluded.sober_since, counted = 0",
+                       (str(chat_id), iso_date))
+            # A milestone of the streak that just ended must not go out late.
+            db.execute(self.DROP_STALE, (str(chat_id), iso_date))
+
+    def advance(self, users):
+        """Bring every user's streak up to their local today; returns events queued."""
+        streaks = compute_streaks(users)
+        with transaction(self._db(), "IMMEDIATE") as db:
+            return self._advance(db, users, streaks)
+
+    def _advance(self, db, users, streaks):
+        # Rows are read under the write lock, so a reset() that landed after
+        # `users` was read is seen here and its user skipped below.
+        rows = {cid: (since, counted) for cid, since, counted in db.execute("SELECT * FROM streaks")}
+        updates, events, restarted = [], [], []
+        for u, days in zip(users, streaks):
+            cid, since = u.get("chat_id"), u.get("last_sober_date") or ""
+            if not cid:
+                continue
+            row = rows.get(cid)
+            if row is not None and row[0] > since:
+                # Relapse logged since the snapshot; the store catches up next tick.
+                continue
+            if row is None or row[0] != since:
+                # New here, or the date changed without reset() (another
+                # worker, an import): count from yesterday so today still fires.
+                before = max(days - 1, 0)
+                if row is not None:
+                    restarted.append((cid, since))
+            elif days > row[1]:
+                before = row[1]
+            else:
+                continue
+            m = self.crossed(before, days)
+            if m is not None and _date_ordinal(since) > 0:
+                # Delivered at the user's morning time on the day it was reached.
+                day = date.fromordinal(_date_ordinal(since) + m)
+                due = _local_due(user_tz(u), day, parse_hhmm(u.get("morning_time")) or REMINDER_KINDS["morning"])
+                events.append((cid, m, since, due))
+            updates.append((cid, since, days))
+        db.executemany("INSERT INTO streaks (chat_id, sober_since, counted) VALUES (?, ?, ?) "
+                       "ON CONFLICT(chat_id) DO UPDATE SET sober_since = excluded.sober_since, "
+                       "counted = excluded.counted", updates)
+        db.executemany(self.DROP_STALE, restarted)
+        db.executemany("INSERT OR IGNORE INTO milestone_events (chat_id, days, sober_since, due) "
+                       "VALUES (?, ?, ?, ?)", events)
+        return len(events)
+
+    def pending(self, now, retries, limit=1000):
+        """Unsent events that are due, at most one per chat (oldest first)."""
+        rows = self._db().execute(
+            "SELECT id, chat_id, days FROM milestone_events WHERE sent_at IS NULL AND due <= ? AND attempts < ? "
+            "ORDER BY due LIMIT ?", (now, retries, limit)).fetchall()
+        seen, out = set(), []
+        for event_id, cid, days in rows:
+            if cid not in seen:
+                seen.add(cid)
+                out.append((event_id, cid, days))
+        return out
+
+    def attempt(self, ids, now, backoff=60):
+        # Pushed back before sending: if the process dies mid-send, the
+        # event comes due again instead of being lost.
+        with transaction(self._db()) as db:
+            db.executemany("UPDATE milestone_events SET attempts = attempts + 1, "
+                           "due = ? + ? * (1 << attempts) WHERE id = ?", [(now, backoff, i) for i in ids])
+
+    def mark_sent(self, ids, now):
+        with transaction(self._db()) as db:
+            db.executemany("UPDATE milestone_events SET sent_at = ? WHERE id = ?", [(now, i) for i in ids])
+
+
+streak_tracker = StreakTracker(STATE_DB_PATH, MILESTONE_DAYS)
+
+
+class MilestoneNotifier(threading.Thread):
+    """Advances streaks and drains the milestone queue, apart from the reminder heap."""
+
+    def __init__(self, scheduler, tracker):
+        super().__init__(daemon=True)
+        self.scheduler = scheduler
+        self.tracker = tracker
+
+    def deliver(self):
+        now = time.time()
+        events = self.tracker.pending(now, MILESTONE_RETRIES)
+        if not events:
+            return None
+        self.tracker.attempt([e[0] for e in events], now)
+        bot = self.scheduler.app.bot
+        ids = {cid: event_id for event_id, cid, _ in events}
+        jobs = [(int(cid), bot.send_message, {
+            "text": f"🏆 Milestone reached: {days} days! {content.pick('reward', cid)}"}) for _, cid, days in events]
+        return self.scheduler.broadcast(jobs, "milestone", record=lambda sent: self.tracker.mark_sent(
+            [ids[str(job[0])] for job in sent], time.time()))
+
+    def run(self):
+        next_advance = 0
+        while True:
+            try:
+                if time.time() >= next_advance:
+                    queued = self.tracker.advance(store.all_users())
+                    if queued:
+                        logger.info(f"🏆 Queued {queued} milestone event(s)")
+                    next_advance = time.time() + MILESTONE_INTERVAL
+                self.deliver()
+            except Exception as e:
+                logger.warning(f"Milestone notifier error: {e}")
+            time.sleep(MILESTONE_POLL)
 
 
-# === FLASK APP ===
-flask_app = Flask(__name__)
+# === WEBHOOK INGEST (shared by Flask and ASGI) ===
 bot_app = None
 bot_loop = None
+bot_ready = threading.Event()
+inflight = threading.BoundedSemaphore(WEBHOOK_MAX_INFLIGHT)
+pending_tasks = set()
+
+
+class ChatLanes:
+    """Per-chat FIFO lanes on the bot loop.
+
+    Updates from different chats run concurrently (capped by the
+    Application's update processor); updates from one chat wait on that
+    chat's lock, which asyncio hands out in arrival order.
+    """
+
+    def __init__(self):
+        self.lanes = {}  # chat_id -> [asyncio.Lock, updates queued or running]
+
+    async def run(self, chat_id, make_coro):
+        if chat_id is None:
+            return await make_coro()
+        lane = self.lanes.get(chat_id)
+        if lane is None:
+            lane = self.lanes[chat_id] = [asyncio.Lock(), 0]
+            CHAT_LANES.inc()
+        CHAT_LANE_DEPTH.observe(lane[1])
+        lane[1] += 1
+        try:
+            async with lane[0]:
+                return await make_coro()
+        finally:
+            lane[1] -= 1
+            if lane[1] == 0:
+                del self.lanes[chat_id]
+                CHAT_LANES.dec()
+
+
+chat_lanes = ChatLanes()
+
+
+async def _process_update(update):
+    chat = update.effective_chat
+    with UPDATE_SECONDS.time():
+        await chat_lanes.run(chat.id if chat else None, lambda: bot_app.update_processor.process_update(
+            update, bot_app.process_update(update)))
+
+
+def _update_done(fut):
+    pending_tasks.discard(fut)
+    inflight.release()
+    WEBHOOK_INFLIGHT.dec()
+    if not fut.cancelled() and fut.exception():
+        logger.error(f"Update processing error: {fut.exception()}")
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def submit_update(update):
+    """Hand an update to the bot's own loop; False when too many are in flight."""
+    if not inflight.acquire(blocking=False):
+        return False
+    WEBHOOK_INFLIGHT.inc()
+    try:
+        if _running_loop() is bot_loop:
+            fut = bot_loop.create_task(_process_update(update))
+            pending_tasks.add(fut)
+        else:
+            fut = asyncio.run_coroutine_threadsafe(_process_update(update), bot_loop)
+    except Exception:
+        inflight.release()
+        WEBHOOK_INFLIGHT.dec()
+        raise
+    fut.add_done_callback(_update_done)
+    return True
+
+
+def ingest_update(raw, secret=None):
+    """Check, decode and queue one webhook body. Returns (body, status, headers)."""
+    t0 = time.perf_counter()
+    if WEBHOOK_SECRET and not hmac.compare_digest((secret or "").encode(), WEBHOOK_SECRET.encode()):
+        result = "Forbidden", 403, {}
+    else:
+        result = _ingest_update(raw)
+    WEBHOOK_SECONDS.observe(time.perf_counter() - t0)
+    WEBHOOK_UPDATES.inc(str(result[1]))
+    return result
+
+
+class UpdateDedup:
+    """Ring buffer of the last `size` update_ids with O(1) membership."""
+
+    def __init__(self, size):
+        self.size = size
+        self.ids = set()
+        self.order = deque()
+        self.lock = threading.Lock()
+
+    def seen(self, update_id):
+        """True if already seen; otherwise records it."""
+        with self.lock:
+            if update_id in self.ids:
+                return True
+            self.ids.add(update_id)
+            self.order.append(update_id)
+            if len(self.order) > self.size:
+                self.ids.discard(self.order.popleft())
+            return False
+
+    def forget(self, update_id):
+        # Rejected with 503: let Telegram's retry through.
+        with self.lock:
+            self.ids.discard(update_id)
+
+
+class ChatThrottle:
+    """Per-chat token buckets, least recently active chats evicted first."""
+
+    def __init__(self, rate, burst, max_chats=50000):
+        self.rate = rate
+        self.burst = burst
+        self.max_chats = max_chats
+        self.buckets = OrderedDict()  # chat_id -> [tokens, updated, last_notice]
+        self.lock = threading.Lock()
+
+    def allow(self, chat_id):
+        """Returns (allowed, should_notify)."""
+        now = time.monotonic()
+        with self.lock:
+            b = self.buckets.get(chat_id)
+            if b is None:
+                b = self.buckets[chat_id] = [self.burst, now, 0.0]
+                if len(self.buckets) > self.max_chats:
+                    self.buckets.popitem(last=False)
+            else:
+                self.buckets.move_to_end(chat_id)
+                b[0] = min(self.burst, b[0] + (now - b[1]) * self.rate)
+                b[1] = now
+            if b[0] >= 1:
+                b[0] -= 1
+                return True, False
+            notify = now - b[2] >= THROTTLE_NOTICE_INTERVAL
+            if notify:
+                b[2] = now
+            return False, notify
+
+
+dedup = UpdateDedup(DEDUP_SIZE)
+throttle = ChatThrottle(CHAT_RATE, CHAT_BURST)
+THROTTLE_REPLY = "⏳ You're sending messages very quickly — please wait a moment and try again."
+
+
+# Only plain messages reach a handler; Telegram is asked not to send the rest.
+ALLOWED_UPDATES = ["message"]
+
+
+def parse_update(raw):
+    """Webhook body -> dict, or None if it isn't a JSON object."""
+    try:
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except ValueError:  # orjson.JSONDecodeError subclasses ValueError
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def route_update(data):
+    """Which handler a raw update would reach: "command", "text" or None.
+
+    Mirrors the filters in build_application() on the raw dict, so updates
+    no handler matches are acknowledged without building PTB objects.
+    """
+    msg = data.get("message")
+    text = msg.get("text") if msg else None
+    if not text:
+        return None
+    entities = msg.get("entities")
+    if entities and entities[0].get("type") == "bot_command" and entities[0].get("offset") == 0:
+        command = text[1:entities[0].get("length", 0)].split("@", 1)[0].lower()
+        return "command" if command in COMMANDS else None
+    return "text"
+
+
+def _ingest_update(raw):
+    if not bot_ready.is_set() and _running_loop() is None:
+        bot_ready.wait(BOT_READY_TIMEOUT)
+    if bot_app is None or bot_loop is None:
+        return "Starting", 503, {"Retry-After": "1"}
+    try:
+        data = parse_update(raw) if raw else None
+        if not data:
+            return "No data", 200, {}
+
+        # Cheap checks on the raw dict, before building PTB objects.
+        update_id = data.get("update_id")
+        if update_id is not None and dedup.seen(update_id):
+            WEBHOOK_DROPPED.inc("duplicate")
+            return "OK", 200, {}
+        route = route_update(data)
+        if route is None:
+            WEBHOOK_DROPPED.inc("unhandled")
+            return "OK", 200, {}
+        chat_id = (data["message"].get("chat") or {}).get("id")
+        if chat_id is not None:
+            allowed, notify = throttle.allow(chat_id)
+            if not allowed:
+                WEBHOOK_DROPPED.inc("throttled")
+                if notify:
+                    # Reply inside the webhook response: no extra Bot API request.
+                    reply = json.dumps({"method": "sendMessage", "chat_id": chat_id, "text": THROTTLE_REPLY})
+                    return reply, 200, {"Content-Type": "application/json"}
+                return "OK", 200, {}
+
+        if webhook_logger.isEnabledFor(logging.DEBUG):
+            # IDs only: message text never reaches the logs.
+            webhook_logger.debug("📩 Incoming update %s", update_id, extra={
+                "update_id": update_id, "chat_id": chat_id, "kind": route})
+
+        if not submit_update(Update.de_json(data, bot_app.bot)):
+            logger.warning("Webhook backpressure: update queue full.")
+            dedup.forget(update_id)
+            return "Busy", 503, {"Retry-After": "1"}
+    except Exception as e:
+        logger.error(f"Webhook error: {e}")
+    return "OK", 200, {}
+
+
+# === FLASK APP ===
+flask_app = Flask(__name__)
 
 
 @flask_app.route("/", methods=["GET"])
 def home():
+    if not bot_ready.is_set():
+        return "Mira Bot starting ⏳", 200
     return "Mira Bot running ✅", 200
 
 
+@flask_app.route("/metrics", methods=["GET"])
+def metrics():
+    return render_metrics(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+
 @flask_app.route(WEBHOOK_PATH, methods=["POST"])
 def webhook():
-    try:
-        data = request.get_json(force=True)
-        if not data:
-            return "No data", 200
+    return ingest_update(request.get_data(), request.headers.get("X-Telegram-Bot-Api-Secret-Token"))
+
+
+# === ASGI APP (SERVER_MODE=asgi) ===
+async def _asgi_respond(send, status, body, headers=None):
+    body = body.encode("utf-8") if isinstance(body, str) else body
+    headers = {"content-type": "text/plain; charset=utf-8", **{k.lower(): v for k, v in (headers or {}).items()}}
+    headers["content-length"] = len(body)
+    raw_headers = [(k.encode(), str(v).encode()) for k, v in headers.items()]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
 
-        update = Update.de_json(data, bot_app.bot)
-        logger.info(f"📩 Incoming update: {update.to_dict()}")
 
-        # ✅ Safe coroutine execution for Telegram updates
-        import asyncio
+async def _asgi_lifespan(receive, send):
+    global bot_app, bot_loop
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                bot_loop = asyncio.get_running_loop()
+                app = build_application()
+                await init_bot(app)
+                bot_app = app
+                bot_ready.set()
+                start_scheduler(bot_loop, app)
+            except Exception as e:
+                logger.error(f"ASGI startup failed: {e}")
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if bot_app is not None:
+                await bot_app.stop()
+                await bot_app.shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def asgi_app(scope, receive, send):
+    """Serves `/` and the webhook on the Application's own event loop (no Flask, no thread hops)."""
+    if scope["type"] == "lifespan":
+        await _asgi_lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+    path, method = scope["path"], scope["method"]
+    if path == "/" and method in ("GET", "HEAD"):
+        await _asgi_respond(send, 200, "Mira Bot running ✅")
+    elif path == "/metrics" and method == "GET":
+        await _asgi_respond(send, 200, render_metrics())
+    elif path == WEBHOOK_PATH and method == "POST":
+        chunks, more = [], True
+        while more:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more = message.get("more_body", False)
+        secret = dict(scope["headers"]).get(b"x-telegram-bot-api-secret-token")
+        body, status, headers = ingest_update(b"".join(chunks), secret and secret.decode("latin-1"))
+        await _asgi_respond(send, status, body, headers)
+    else:
+        await _asgi_respond(send, 404, "Not Found")
+
+
+# === LEADER ELECTION ===
+class LeaderLock:
+    """Non-blocking exclusive flock; released by the OS when the holder exits."""
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def try_acquire(self):
+        if self.fd is not None or fcntl is None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
         try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = None
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self.fd = fd
+        return True
 
-        if loop and loop.is_running():
-            asyncio.run_coroutine_threadsafe(bot_app.process_update(update), loop)
-        else:
-            asyncio.run(bot_app.process_update(update))
 
-        logger.info("✅ Webhook update processed successfully.")
-    except Exception as e:
-        logger.error(f"Webhook error: {e}")
-    return "OK", 200
+leader = LeaderLock(LEADER_LOCK_PATH)
 
 
 # === STARTUP ===
+def build_application(request=None):
+    builder = Application.builder().token(TELEGRAM_TOKEN).concurrent_updates(UPDATE_CONCURRENCY)
+    if request is not None:
+        builder = builder.request(request)
+    app = builder.build()
+    for name, callback in COMMANDS.items():
+        app.add_handler(CommandHandler(name, callback))
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+    return app
+
+
+async def register_webhook(app):
+    info = await app.bot.get_webhook_info()
+    # getWebhookInfo never returns the secret, so with one configured we
+    # always re-register to be sure Telegram sends the current value.
+    if info.url == WEBHOOK_URL and list(info.allowed_updates or ()) == ALLOWED_UPDATES and not WEBHOOK_SECRET:
+        logger.info(f"🤖 Webhook already set: {WEBHOOK_URL}")
+        return
+    await app.bot.set_webhook(url=WEBHOOK_URL, allowed_updates=ALLOWED_UPDATES, secret_token=WEBHOOK_SECRET)
+    logger.info(f"🤖 Webhook set: {WEBHOOK_URL}")
+
+
+async def init_bot(app):
+    t0 = time.monotonic()
+    await app.initialize()
+    await app.start()
+    if leader.try_acquire():
+        await register_webhook(app)
+    startup_timings["bot_ms"] = round((time.monotonic() - t0) * 1000)
+    startup_timings["total_ms"] = round((time.monotonic() - STARTED_AT) * 1000)
+    logger.info(f"🌍 Webhook endpoint active at: {WEBHOOK_URL}")
+    logger.info(f"⏱️ Startup timings: {startup_timings}")
+
+
+def start_scheduler(loop, app):
+    global scheduler
+    if leader.try_acquire():
+        logger.info(f"👑 Process {os.getpid()} is the leader; starting scheduler.")
+        scheduler = DailyScheduler(loop, app)
+        scheduler.start()
+        MilestoneNotifier(scheduler, streak_tracker).start()
+        return
+
+    def _follow():
+        while not leader.try_acquire():
+            time.sleep(LEADER_RETRY)
+        start_scheduler(loop, app)
+
+    logger.info(f"Process {os.getpid()} is a follower; scheduler runs in the leader.")
+    threading.Thread(target=_follow, daemon=True).start()
+
+
 def start_bot():
-    import asyncio
-    global bot_app, bot_loop
+    global bot_loop
     bot_loop = asyncio.new_event_loop()
 
     def _run():
         asyncio.set_event_loop(bot_loop)
-        app = Application.builder().token(TELEGRAM_TOKEN).build()
-        app.add_handler(CommandHandler("start", cmd_start))
-        app.add_handler(CommandHandler("status", cmd_status))
-        app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
-
-        async def init():
-            await app.initialize()
-            await app.start()
-            await app.bot.delete_webhook()
-            await app.bot.set_webhook(url=WEBHOOK_URL)
-            logger.info(f"🤖 Webhook set: {WEBHOOK_URL}")
-            logger.info(f"🌍 Flask webhook endpoint active at: {WEBHOOK_URL}")
-
-        bot_loop.run_until_complete(init())
+        app = build_application()
+        bot_loop.run_until_complete(init_bot(app))
         globals()["bot_app"] = app
-
-        scheduler = DailyScheduler(bot_loop, app)
-        scheduler.start()
-
+        bot_ready.set()
+        start_scheduler(bot_loop, app)
         bot_loop.run_forever()
 
+    # No sleep here: webhook requests wait on bot_ready instead.
     threading.Thread(target=_run, daemon=True).start()
-    time.sleep(1)
 
 
 # === MAIN ===
@@ -638,6 +2781,15 @@ def main():
     if not TELEGRAM_TOKEN:
         raise SystemExit("Missing TELEGRAM_TOKEN")
     logger.info("🚀 Starting Mira Bot v8 ...")
+
+    if SERVER_MODE == "asgi":
+        try:
+            import uvicorn
+        except ImportError:
+            raise SystemExit("SERVER_MODE=asgi needs uvicorn (pip install uvicorn)")
+        uvicorn.run(asgi_app, host="0.0.0.0", port=PORT, lifespan="on")
+        return asgi_app
+
     start_bot()
 
     # Detect Gunicorn
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Stream users and relapse log rows out of, or into, the configured store.
+
+The backend is whatever main.connect_store() picks from the environment
+(STORE_BACKEND, GOOGLE_CREDENTIALS, ...), so moving data between backends
+is an export under one setting and an import under another. Rows are read
+and written in chunks; memory stays flat however large the tables are.
+
+    python migrate.py export users users.ndjson
+    python migrate.py export log log.csv --chunk 1000
+    STORE_BACKEND=sqlite python migrate.py import users users.ndjson
+    STORE_BACKEND=memory python migrate.py import users users.csv   # seeds the snapshot
+
+Use "-" for stdin/stdout. The format follows the file extension (.csv is
+CSV, anything else NDJSON) unless --format is given.
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from itertools import islice
+
+import main
+
+TABLES = {"users": main.USER_FIELDS, "log": main.LOG_FIELDS}
+# CSV has no null; these log columns go back to None when empty.
+NULLABLE = {"beverage", "ml", "count", "total_ml", "std_drinks"}
+# Numeric log columns; CSV and Sheets exports carry them as text.
+NUMERIC = {"ml", "count", "total_ml", "std_drinks"}
+
+
+def chunks(items, size):
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def write_rows(items, fields, fh, fmt):
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(fh)
+        writer.writerow(fields)
+        for item in items:
+            writer.writerow(["" if item.get(k) is None else item[k] for k in fields])
+            count += 1
+    else:
+        for item in items:
+            fh.write(json.dumps({k: item.get(k) for k in fields}, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def _number(value):
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _clean(item, fields):
+    """One imported row: missing user fields get user_from_row defaults, log numerics become numbers."""
+    if fields == main.USER_FIELDS:
+        row = main.user_from_row([])
+        row.update((k, item[k]) for k in fields if item.get(k) is not None)
+        return row
+    row = {}
+    for k in fields:
+        v = item.get(k)
+        if k in NULLABLE and v == "":
+            v = None
+        elif v is None and k not in NULLABLE:
+            v = ""
+        elif k in NUMERIC and isinstance(v, str):
+            v = _number(v)
+        row[k] = v
+    return row
+
+
+def read_rows(fh, fields, fmt):
+    if fmt == "csv":
+        for row in csv.DictReader(fh):
+            yield _clean(row, fields)
+    else:
+        for line in fh:
+            if line.strip():
+                yield _clean(json.loads(line), fields)
+
+
+def _open(path, mode):
+    if path == "-":
+        return sys.stdout if "w" in mode else sys.stdin
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def _backend():
+    if not main.store.ready.wait(main.STORE_READY_TIMEOUT):
+        raise SystemExit("Store did not become ready")
+    return main.store.backend
+
+
+def cmd_export(args):
+    backend = _backend()
+    fields = TABLES[args.table]
+    items = backend.iter_users(args.chunk) if args.table == "users" else backend.iter_logs(args.chunk)
+    t0 = time.perf_counter()
+    fh = _open(args.path, "w")
+    try:
+        count = write_rows(items, fields, fh, args.format)
+    finally:
+        if fh is not sys.stdout:
+            fh.close()
+    print(f"Exported {count} {args.table} rows from {type(backend).__name__} "
+          f"in {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+
+
+def cmd_import(args):
+    backend = _backend()
+    fields = TABLES[args.table]
+    write = backend.write_users if args.table == "users" else backend.append_logs
+    t0 = time.perf_counter()
+    count = 0
+    fh = _open(args.path, "r")
+    try:
+        for batch in chunks(read_rows(fh, fields, args.format), args.chunk):
+            write(batch)
+            count += len(batch)
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+    if hasattr(backend, "flush"):
+        backend.flush()
+    if hasattr(backend, "snapshot"):
+        backend.snapshot()
+    print(f"Imported {count} {args.table} rows into {type(backend).__name__} "
+          f"in {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name, func in [("export", cmd_export), ("import", cmd_import)]:
+        p = sub.add_parser(name)
+        p.add_argument("table", choices=sorted(TABLES))
+        p.add_argument("path", help='file to write/read, or "-"')
+        p.add_argument("--format", choices=["ndjson", "csv"])
+        p.add_argument("--chunk", type=int, default=500, help="rows per read/write batch")
+        p.set_defaults(func=func)
+
+    args = parser.parse_args(argv)
+    if args.format is None:
+        args.format = "csv" if os.path.splitext(args.path)[1].lower() == ".csv" else "ndjson"
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main_cli(sys.argv[1:])
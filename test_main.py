@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""Table tests for the pure helpers in main.py. Run with `python -m pytest -q`."""
+
+import re
+import time
+
+import pytest
+
+import main
+
+
+# --- classifier --------------------------------------------------------------
+# The classifier before the trie rewrite: substring keywords, then RELAPSE_RE.
+_BASELINE_RELAPSE = re.compile(r"([A-Za-z\u1000-\u109F ]+)\s*(\d+ml)?\s*[x×*]\s*(\d+)", re.I)
+
+
+def baseline_kind(text):
+    if any(k in text.lower() for k in ["အရက်", "drink", "craving"]):
+        return "craving"
+    return "relapse" if _BASELINE_RELAPSE.search(text) else None
+
+
+# text, baseline kind, current kind
+CLASSIFIER_CASES = [
+    ("I want a drink", "craving", "craving"),
+    ("I had a drink beer x 2", "craving", "craving"),
+    ("I'm craving a beer x 3", "craving", "craving"),
+    ("drinking again tonight", "craving", "craving"),
+    ("အရက်သောက်ချင်တယ်", "craving", "craving"),
+    ("ဘီယာ 650ml x 3 အရက်", "craving", "craving"),
+    ("Beer 350ml x 5", "relapse", "relapse"),
+    ("ဘီယာ 650ml x 3", "relapse", "relapse"),
+    ("Red Wine 150 ml × 2", "relapse", "relapse"),
+    # Burmese liquor names start with the craving keyword အရက်.
+    ("အရက်ဖြူ x 2", "craving", "relapse"),
+    ("အရက်ပြင်း 30ml x 3", "craving", "relapse"),
+    ("အရက်ဖြူ သောက်ချင်တယ်", "craving", "craving"),
+    ("အရက် x 2", "craving", "craving"),
+    ("I ate a burger for lunch", None, None),
+    ("Surgery went fine", None, None),
+    ("I'm thirsty for water", None, None),
+    ("Had 2 beers", None, None),
+    # Deliberate change: English keywords match whole words only.
+    ("drinkable yogurt is nice", "craving", None),
+    ("new cravingsbook app", "craving", None),
+    # Deliberate change: new vocabulary.
+    ("I feel so tempted", None, "craving"),
+    ("need a beer", None, "craving"),
+]
+
+
+@pytest.mark.parametrize("text,before,after", CLASSIFIER_CASES)
+def test_classifier_against_baseline(text, before, after):
+    assert baseline_kind(text) == before
+    assert main.classifier.classify(text).kind == after
+
+
+@pytest.mark.parametrize("text,beverage,ml,count", [
+    ("Beer 350ml x 5", "beer", 350, 5),
+    ("Red Wine 150 ml × 2", "wine", 150, 2),
+    ("ဘီယာ 650ml x 3", "beer", 650, 3),
+    ("Soju * 4", "soju", None, 4),
+    ("အရက်ပြင်း 30ml x 3", "liquor", 30, 3),
+])
+def test_classifier_relapse_details(text, beverage, ml, count):
+    intent = main.classifier.classify(text)
+    assert (intent.kind, intent.beverage, intent.ml, intent.count) == ("relapse", beverage, ml, count)
+
+
+def test_classifier_label_is_bounded():
+    intent = main.classifier.classify("so today after work I had a few beers x 2")
+    assert (intent.kind, intent.beverage, intent.label) == ("relapse", "beer", "had a few beers")
+
+
+@pytest.mark.parametrize("text", ["a " * 2000, "word " * 1000, "beer " * 800 + "x 2", "a" * 4000])
+def test_classifier_word_soup_is_linear(text):
+    # A 4 KB message runs on the bot loop; the unbounded label took ~1 s here.
+    t0 = time.perf_counter()
+    main.classifier._classify(text)
+    assert time.perf_counter() - t0 < 0.1
+
+
+# --- content pack --------------------------------------------------------------
+def test_content_pick_shuffles_without_repeats(tmp_path):
+    banks = {"one": ["x"], "two": ["a", "b"], "three": list("abc"), "ten": list("abcdefghij")}
+    path = tmp_path / "messages.json"
+    path.write_text(main.json.dumps(banks))
+    pack = main.ContentPack(str(path))
+    for name, items in banks.items():
+        n = len(items)
+        for cid in range(50):
+            seq = [pack.pick(name, cid) for _ in range(6 * n)]
+            # Every entry once per pass, never the same twice in a row.
+            assert all(sorted(seq[i:i + n]) == sorted(items) for i in range(0, len(seq), n))
+            assert n == 1 or all(a != b for a, b in zip(seq, seq[1:]))
+    # One counter per (bank, chat), no stored permutations.
+    assert all(isinstance(k, int) for drawn in pack.drawn.values() for k in drawn.values())
+    assert pack.pick("missing", 1) == ""
+
+
+# --- workers -----------------------------------------------------------------
+@pytest.mark.parametrize("argv,env,conf_file,expected", [
+    (["main.py"], {}, False, 1),
+    (["/venv/bin/gunicorn", "main:main()"], {}, False, 1),
+    (["/venv/bin/gunicorn", "-w", "3", "main:main()"], {}, False, 3),
+    (["/venv/bin/gunicorn", "--workers=4", "main:main()"], {}, False, 4),
+    (["/venv/bin/gunicorn", "main:main()"], {"GUNICORN_CMD_ARGS": "-w2"}, False, 2),
+    (["/venv/bin/uvicorn", "main:asgi_app"], {}, False, 1),
+    (["/venv/bin/gunicorn", "main:main()"], {"WEB_CONCURRENCY": "6"}, False, 6),
+    # A config file can set workers: assume several unless -w says otherwise.
+    (["/venv/bin/gunicorn", "-c", "conf.py", "main:main()"], {}, False, 2),
+    (["/venv/bin/gunicorn", "main:main()"], {}, True, 2),
+    (["/venv/bin/gunicorn", "-c", "conf.py", "-w", "1", "main:main()"], {}, False, 1),
+])
+def test_detect_workers(tmp_path, monkeypatch, argv, env, conf_file, expected):
+    monkeypatch.chdir(tmp_path)
+    if conf_file:
+        (tmp_path / "gunicorn.conf.py").write_text("workers = 4\n")
+    for key in ("WEB_CONCURRENCY", "GUNICORN_CMD_ARGS", "SERVER_SOFTWARE"):
+        monkeypatch.delenv(key, raising=False)
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.setattr(main.sys, "argv", argv)
+    assert main._detect_workers()[0] == expected
+
+
+# --- time zones --------------------------------------------------------------
+@pytest.mark.parametrize("value,expected", [
+    ("Europe/Berlin", "Europe/Berlin"),
+    ("america/new_york", "America/New_York"),
+    ("UTC", "UTC"),
+    ("utc+6:30", "UTC+06:30"),
+    ("GMT-5", "UTC-05:00"),
+    ("+0530", "UTC+05:30"),
+    ("UTC+14", "UTC+14:00"),
+    ("UTC+15", None),
+    ("UTC+05:75", None),
+    ("Mars/Base", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_timezone(value, expected):
+    assert main.parse_timezone(value) == expected
+
+
+def test_user_tz_falls_back_to_default():
+    assert main.user_tz({"timezone": ""}) is main.TIMEZONE
+    assert main.user_tz({"timezone": "Not/AZone"}) is main.TIMEZONE
+    assert main.user_tz(None) is main.TIMEZONE
+    assert main.user_tz({"timezone": "UTC+06:30"}).utcoffset(None).total_seconds() == 6.5 * 3600
+
+
+# --- scheduler ---------------------------------------------------------------
+UTC = main.pytz.utc
+
+
+def _utc(*args):
+    return UTC.localize(main.datetime(*args))
+
+
+# now (UTC), zone, kind, hhmm, dispatched local date, expected due (UTC)
+NEXT_DUE_CASES = [
+    # Yangon is UTC+06:30: 08:00 local is 01:30 UTC.
+    (_utc(2026, 3, 1, 0, 0), "", "morning", "08:00", None, _utc(2026, 3, 1, 1, 30)),
+    # Within REMINDER_GRACE after the time: still today.
+    (_utc(2026, 3, 1, 2, 0), "", "morning", "08:00", None, _utc(2026, 3, 1, 1, 30)),
+    # Past the grace window: tomorrow.
+    (_utc(2026, 3, 1, 6, 0), "", "morning", "08:00", None, _utc(2026, 3, 2, 1, 30)),
+    # Already handed out today: tomorrow.
+    (_utc(2026, 3, 1, 1, 0), "", "morning", "08:00", "2026-03-01", _utc(2026, 3, 2, 1, 30)),
+    # Invalid time falls back to the kind's default (21:00).
+    (_utc(2026, 3, 1, 0, 0), "", "night", "25:99", None, _utc(2026, 3, 1, 14, 30)),
+    # The user's own zone, across a DST change (Berlin: CET until 29 March).
+    (_utc(2026, 3, 28, 12, 0), "Europe/Berlin", "morning", "07:30", None, _utc(2026, 3, 29, 5, 30)),
+    (_utc(2026, 3, 29, 12, 0), "Europe/Berlin", "morning", "07:30", None, _utc(2026, 3, 30, 5, 30)),
+    # Fixed offsets; the local date differs from the UTC date.
+    (_utc(2026, 3, 1, 20, 0), "UTC-10:00", "night", "21:00", None, _utc(2026, 3, 2, 7, 0)),
+    (_utc(2026, 3, 1, 20, 0), "UTC+14:00", "morning", "08:00", None, _utc(2026, 3, 2, 18, 0)),
+]
+
+
+@pytest.fixture
+def scheduler(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "STATE_DB_PATH", str(tmp_path / "state.db"))
+    return main.DailyScheduler(None, None)
+
+
+@pytest.mark.parametrize("now,zone,kind,hhmm,dispatched,expected", NEXT_DUE_CASES)
+def test_next_due(scheduler, now, zone, kind, hhmm, dispatched, expected):
+    if dispatched:
+        scheduler.dispatched[("1", kind)] = dispatched
+    due = scheduler.next_due("1", kind, hhmm, now, main.user_tz({"timezone": zone}))
+    assert due == expected.timestamp()
+
+
+def test_broadcast_records_deliveries_while_running(scheduler, monkeypatch):
+    monkeypatch.setattr(main, "DELIVERY_FLUSH_INTERVAL", 0.05)
+    loop = main.asyncio.new_event_loop()
+    main.threading.Thread(target=loop.run_forever, daemon=True).start()
+    scheduler.loop = loop
+    scheduler.broadcaster = main.Broadcaster(rate=1000, concurrency=1)
+
+    async def send(chat_id, **kwargs):
+        await main.asyncio.sleep(0.01)
+
+    batches = []
+    try:
+        report = scheduler.broadcast([(i, send, {}) for i in range(30)], "test", record=batches.append)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+    # ~0.3 s of sends: several flushes, not one at the end.
+    assert report["sent"] == 30
+    assert len(batches) > 2
+    assert sorted(job[0] for batch in batches for job in batch) == list(range(30))
+
+
+# --- streaks and milestones --------------------------------------------------
+@pytest.mark.parametrize("before,after,expected", [
+    (0, 2, None),
+    (2, 3, 3),
+    (3, 3, None),
+    (3, 6, 5),
+    (4, 7, 7),
+    (8, 9, None),
+    (0, 31, 30),
+    (29, 30, 30),
+    (30, 100, None),
+])
+def test_crossed(before, after, expected):
+    tracker = main.StreakTracker(":memory:", [30, 7, 3, 5, 10, 14, 17, 21, 25, 7])
+    assert tracker.milestones == main.MILESTONE_DAYS
+    assert tracker.crossed(before, after) == expected
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return main.StreakTracker(str(tmp_path / "streaks.db"), main.MILESTONE_DAYS)
+
+
+def _user(cid, days_ago, **extra):
+    today = main.datetime.now(main.TIMEZONE).date()
+    return {"chat_id": cid, "last_sober_date": (today - main.timedelta(days=days_ago)).isoformat(),
+            "morning_time": "08:00", "timezone": "", **extra}
+
+
+def _events(tracker, pending_only=True):
+    sql = "SELECT chat_id, days FROM milestone_events"
+    if pending_only:
+        sql += " WHERE sent_at IS NULL"
+    return sorted(tracker._db().execute(sql).fetchall())
+
+
+def test_advance_first_sight_only_fires_today(tracker):
+    # 7 days today fires; 40 days (no milestone today) doesn't backfill 3..30.
+    assert tracker.advance([_user("a", 7), _user("b", 40), _user("c", 2)]) == 1
+    assert _events(tracker) == [("a", 7)]
+    assert tracker.advance([_user("a", 7), _user("b", 40), _user("c", 2)]) == 0
+
+
+def test_advance_day_boundary_crosses_milestone(tracker):
+    tracker.advance([_user("a", 4)])
+    assert _events(tracker) == []
+    # Two days pass without a tick: 4 -> 6 crosses 5.
+    tracker._db().execute("UPDATE streaks SET counted = 4, sober_since = ?", (_user("a", 6)["last_sober_date"],))
+    assert tracker.advance([_user("a", 6)]) == 1
+    assert _events(tracker) == [("a", 5)]
+
+
+def test_event_due_at_local_morning_of_milestone_day(tracker):
+    u = _user("a", 3, morning_time="07:15", timezone="UTC+02:00")
+    tracker.advance([u])
+    due, = tracker._db().execute("SELECT due FROM milestone_events").fetchone()
+    local = main.datetime.fromtimestamp(due, main.user_tz(u))
+    since = main.date.fromisoformat(u["last_sober_date"])
+    assert (local.date(), local.strftime("%H:%M")) == (since + main.timedelta(days=3), "07:15")
+
+
+def test_reset_drops_pending_events_of_old_streak(tracker):
+    tracker.advance([_user("a", 3)])
+    assert _events(tracker) == [("a", 3)]
+    tracker.reset("a", _user("a", 0)["last_sober_date"])
+    assert _events(tracker) == []
+    assert tracker.advance([_user("a", 0)]) == 0
+
+
+def test_changed_sober_date_without_reset_restarts(tracker):
+    tracker.advance([_user("a", 5)])
+    assert _events(tracker) == [("a", 5)]
+    # Relapse recorded by another worker: the old event goes, no new one yet.
+    assert tracker.advance([_user("a", 1)]) == 0
+    assert _events(tracker) == []
+
+
+def test_advance_skips_users_reset_after_the_snapshot(tracker):
+    tracker.advance([_user("a", 4)])
+    stale = _user("a", 5)  # read from the store before the relapse landed
+    tracker.reset("a", _user("a", 0)["last_sober_date"])
+    assert tracker.advance([stale]) == 0
+    assert _events(tracker, pending_only=False) == []
+    assert tracker._db().execute("SELECT sober_since FROM streaks").fetchone()[0] == _user("a", 0)["last_sober_date"]
+
+
+def test_pending_attempt_and_mark_sent(tracker):
+    tracker.advance([_user("a", 3), _user("b", 5)])
+    now = main.time.time() + 2 * 86400
+    ids = [e[0] for e in tracker.pending(now, retries=2)]
+    assert len(ids) == 2
+    tracker.attempt(ids, now)
+    assert tracker.pending(now, retries=2) == []
+    assert len(tracker.pending(now + 61, retries=2)) == 2
+    tracker.attempt(ids, now + 61)
+    # Out of retries.
+    assert tracker.pending(now + 10_000, retries=2) == []
+    tracker.mark_sent(ids[:1], now)
+    assert _events(tracker) == [("b", 5)]
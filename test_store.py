@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+"""Tests for the stateful store layers in main.py."""
+
+import io
+import asyncio
+
+import pytest
+
+import main
+import migrate
+from bench import FakeSpreadsheet, FakeWorksheet
+
+
+# --- AsyncStore --------------------------------------------------------------
+def _boom(*args):
+    raise OSError("sheets down")
+
+
+def test_breaker_opens_and_fails_fast():
+    s = main.AsyncStore(1, 1.0, failures=2, cooldown=30.0, retry_interval=0)
+    calls = []
+
+    def ok():
+        calls.append(1)
+        return "ok"
+
+    async def go():
+        for _ in range(2):
+            with pytest.raises(main.StoreUnavailable):
+                await s.call(_boom)
+        with pytest.raises(main.StoreUnavailable, match="circuit open"):
+            await s.call(ok)
+        assert calls == []
+        s.open_until = 0.0  # cooldown over
+        assert await s.call(ok) == "ok"
+        assert s.failures == 0
+
+    asyncio.run(go())
+
+
+def test_breaker_timeout_counts_as_failure():
+    s = main.AsyncStore(1, 0.05, failures=1, cooldown=30.0, retry_interval=0)
+
+    async def go():
+        with pytest.raises(main.StoreUnavailable):
+            await s.call(main.time.sleep, 0.2)
+        assert main.time.monotonic() < s.open_until
+
+    asyncio.run(go())
+
+
+def test_local_state_bypasses_the_breaker():
+    s = main.AsyncStore(1, 1.0, failures=1, cooldown=30.0, retry_interval=0)
+
+    async def go():
+        with pytest.raises(main.StoreUnavailable):
+            await s.call(_boom)
+        with pytest.raises(main.StoreUnavailable, match="circuit open"):
+            await s.call(int, "1")
+        assert await s.local(int, "2") == 2
+
+    asyncio.run(go())
+
+
+def test_cached_user_served_while_store_is_down(monkeypatch):
+    s = main.AsyncStore(1, 1.0, failures=5, retry_interval=0)
+    monkeypatch.setattr(main, "get_user", lambda cid: {"chat_id": str(cid), "last_sober_date": "2026-01-01"})
+    asyncio.run(s.get_user(1))
+    monkeypatch.setattr(main, "get_user", _boom)
+    assert asyncio.run(s.get_user(1))["last_sober_date"] == "2026-01-01"
+    assert asyncio.run(s.get_user(2)) is None
+
+
+def test_failed_write_is_queued_and_replayed_in_order(monkeypatch):
+    s = main.AsyncStore(1, 1.0, failures=5, retry_interval=0)
+    written, down = [], [True]
+
+    def set_last_sober_date(chat_id, iso_date):
+        if down[0]:
+            raise OSError("sheets down")
+        written.append((chat_id, iso_date))
+
+    monkeypatch.setattr(main, "set_last_sober_date", set_last_sober_date)
+    asyncio.run(s.set_last_sober_date(1, "2026-01-01"))
+    assert ("set_last_sober_date", "1") in s.retry
+    s.retry.flush()  # still down: kept
+    assert ("set_last_sober_date", "1") in s.retry
+
+    down[0] = False
+    # Queued behind the pending retry instead of racing it; the newer value wins.
+    asyncio.run(s.set_last_sober_date(1, "2026-01-02"))
+    assert written == []
+    s.retry.flush()
+    assert written == [(1, "2026-01-02")]
+    assert ("set_last_sober_date", "1") not in s.retry
+
+
+# --- migrate -------------------------------------------------------------------
+def test_import_fills_user_defaults(tmp_path):
+    rows = list(migrate.read_rows(io.StringIO('{"chat_id": 7, "last_sober_date": "2026-01-01"}\n'),
+                                  main.USER_FIELDS, "ndjson"))
+    assert rows[0]["morning_time"] == "" and rows[0]["timezone"] == ""
+    db = main.SQLiteStore(str(tmp_path / "store.db"))
+    db.write_users(rows)
+    assert db.get_user(7)["last_sober_date"] == "2026-01-01"
+
+    mem = main.InMemoryStore()
+    mem.ensure_user(7, "seven")
+    mem.write_users(rows)
+    assert mem.get_user(7)["chat_id"] == "7" and mem.get_user(7)["night_time"] == ""
+
+
+def test_import_csv_log_numbers():
+    out = io.StringIO()
+    item = {"timestamp": "2026-01-01T20:00:00+06:30", "chat_id": "7", "username": "", "relapse_text": "Beer x 2",
+            "beverage": "beer", "ml": None, "count": 2, "total_ml": 660, "std_drinks": 2.6}
+    migrate.write_rows([item], main.LOG_FIELDS, out, "csv")
+    row, = migrate.read_rows(io.StringIO(out.getvalue()), main.LOG_FIELDS, "csv")
+    assert row == item
+
+
+# --- Google Sheets -------------------------------------------------------------
+@pytest.fixture
+def sheet(monkeypatch):
+    sheet = FakeSpreadsheet(0)
+    monkeypatch.setattr(main, "GS_AVAILABLE", True)
+    monkeypatch.setattr(main, "GOOGLE_CREDENTIALS", "{}")
+    monkeypatch.setattr(main, "STORE_BACKEND", "sheets")
+    monkeypatch.setattr(main, "WORKERS", 1)
+    monkeypatch.setattr(main, "STORE_FLUSH_INTERVAL", 0)
+    monkeypatch.setattr(main.gspread, "service_account_from_dict", lambda creds: sheet)
+    return sheet
+
+
+def _old_sheets(sheet):
+    # Created before the Timezone and typed relapse columns existed.
+    sheet.add_worksheet("Users", 1000, 10).append_row(main.USER_HEADERS[:5])
+    sheet.add_worksheet("Log", 1000, 10).append_row(main.LOG_HEADERS[:4])
+
+
+def test_connect_backfills_headers(sheet):
+    _old_sheets(sheet)
+    main.connect_store()
+    assert sheet.sheets["Users"].data[0] == main.USER_HEADERS
+    assert sheet.sheets["Log"].data[0] == main.LOG_HEADERS
+    sheet.calls.clear()
+    main.connect_store()
+    assert sheet.calls["Users.update"] == sheet.calls["Log.update"] == 0
+
+
+def test_connect_survives_failed_backfill(sheet, monkeypatch):
+    _old_sheets(sheet)
+    monkeypatch.setattr(FakeWorksheet, "update", _boom)
+    assert isinstance(main.connect_store(), main.CachedStore)
+    assert sheet.sheets["Log"].data[0] == main.LOG_HEADERS[:4]
+
+
+# --- SQLite --------------------------------------------------------------------
+def test_sqlite_connection_per_thread_and_path(tmp_path):
+    a, b = str(tmp_path / "a.db"), str(tmp_path / "b.db")
+    assert main.sqlite_connect(a) is main.sqlite_connect(a)
+    assert main.sqlite_connect(a) is not main.sqlite_connect(b)
+    other = []
+    t = main.threading.Thread(target=lambda: other.append(main.sqlite_connect(a)))
+    t.start()
+    t.join()
+    assert other[0] is not main.sqlite_connect(a)
+
+
+def test_transaction_rolls_back_on_error(tmp_path):
+    db = main.sqlite_connect(str(tmp_path / "t.db"))
+    db.execute("CREATE TABLE t (x INTEGER)")
+    with pytest.raises(ValueError):
+        with main.transaction(db, "IMMEDIATE"):
+            db.execute("INSERT INTO t VALUES (1)")
+            raise ValueError
+    with main.transaction(db):
+        db.execute("INSERT INTO t VALUES (2)")
+    assert db.execute("SELECT x FROM t").fetchall() == [(2,)]
+    assert not db.in_transaction
+
+
+# --- CachedStore ---------------------------------------------------------------
+class FakeBackend:
+    def __init__(self, users=()):
+        self.users = {u["chat_id"]: dict(u) for u in users}
+        self.writes = []
+        self.down = False
+
+    def all_users(self):
+        return [dict(u) for u in self.users.values()]
+
+    def write_users(self, rows):
+        if self.down:
+            raise OSError("sheets down")
+        self.writes.append(sorted(r["chat_id"] for r in rows))
+        for r in rows:
+            self.users[r["chat_id"]] = dict(r)
+
+
+def _cached(backend, **kwargs):
+    kwargs.setdefault("flush_interval", 3600)
+    return main.CachedStore(backend, **kwargs)
+
+
+def test_cached_reads_and_batched_flush():
+    backend = FakeBackend([main.user_from_row(["1", "one", "2026-01-01", "08:00", "21:00", ""])])
+    s = _cached(backend)
+    s.ensure_user(2, "two")
+    s.set_reminder_time(1, "morning", "07:00")
+    s.set_last_sober(2, "2026-02-01")
+    assert backend.writes == []
+    assert s.get_user(1)["morning_time"] == "07:00"
+    s.flush()
+    assert backend.writes == [["1", "2"]]
+    assert backend.users["2"]["last_sober_date"] == "2026-02-01"
+    s.flush()  # nothing dirty: no write
+    assert len(backend.writes) == 1
+
+
+def test_cached_flush_retries_after_failure():
+    backend = FakeBackend()
+    s = _cached(backend)
+    s.ensure_user(1, "one")
+    backend.down = True
+    s.flush()
+    assert s.dirty == {"1"}
+    backend.down = False
+    s.set_timezone(2, "UTC")  # unknown user: ignored
+    s.flush()
+    assert backend.writes == [["1"]] and not s.dirty
+
+
+def test_cached_max_dirty_forces_early_flush():
+    backend = FakeBackend()
+    s = _cached(backend, max_dirty=3)
+    for cid in range(3):
+        s.ensure_user(cid, f"u{cid}")
+    for _ in range(100):
+        if backend.writes:
+            break
+        main.time.sleep(0.01)
+    assert backend.writes == [["0", "1", "2"]]
+
+
+def test_cached_write_through_without_interval():
+    backend = FakeBackend()
+    s = _cached(backend, flush_interval=0)
+    s.ensure_user(1, "one")
+    s.set_last_sober(1, "2026-03-01")
+    assert backend.writes == [["1"], ["1"]]
+
+
+# --- LogWriter -----------------------------------------------------------------
+class FakeLogStore:
+    def __init__(self):
+        self.batches = []
+        self.down = False
+
+    def append_logs(self, items):
+        if self.down:
+            raise OSError("sheets down")
+        self.batches.append([i["relapse_text"] for i in items])
+
+
+@pytest.fixture
+def log_store(monkeypatch):
+    fake = FakeLogStore()
+    monkeypatch.setattr(main, "store", fake)
+    return fake
+
+
+def _row(text):
+    return {"timestamp": "2026-01-01T20:00:00+06:30", "chat_id": 1, "username": "", "relapse_text": text}
+
+
+def test_log_writer_batches(tmp_path, log_store):
+    w = main.LogWriter(3600, str(tmp_path / "spill.ndjson"), retries=1)
+    w.put(_row("a"))
+    w.put(_row("b"))
+    w.flush()
+    w.flush()
+    assert log_store.batches == [["a", "b"]]
+
+
+def test_log_writer_spills_and_replays(tmp_path, log_store):
+    spill = tmp_path / "spill.ndjson"
+    w = main.LogWriter(3600, str(spill), retries=1)
+    w.put(_row("a"))
+    log_store.down = True
+    w.flush()
+    assert log_store.batches == [] and spill.exists()
+
+    # A fresh process (same spill file) replays it ahead of its own rows.
+    w = main.LogWriter(3600, str(spill), retries=1)
+    w.put(_row("b"))
+    log_store.down = False
+    w.flush()
+    assert log_store.batches == [["a", "b"]]
+    assert not spill.exists()
+
+
+@pytest.fixture
+def sheet_store(sheet, monkeypatch):
+    monkeypatch.setattr(main, "WORKERS", 2)  # uncached: SheetStore itself
+    store = main.connect_store()
+    sheet.calls.clear()
+    return store
+
+
+def test_sheet_index_avoids_scans(sheet, sheet_store):
+    users = sheet.sheets["Users"]
+    sheet_store.ensure_user(1, "one")
+    sheet_store.ensure_user(2, "two")
+    sheet_store.ensure_user(1, "one")
+    assert sheet.calls["Users.append_rows"] == 2
+    sheet.calls.clear()
+    sheet_store.set_timezone(2, "UTC")
+    assert sheet_store.get_user(2)["timezone"] == "UTC"
+    assert sheet_store.get_user(1)["username"] == "one"
+    assert sheet.calls["Users.col_values"] == 0 and sheet.calls["Users.get"] == 2
+    assert users.data[2][0] == "2"
+
+
+def test_sheet_index_picks_up_other_workers_rows(sheet, sheet_store):
+    sheet.sheets["Users"].append_row(["9", "nine", "2026-01-01", "08:00", "21:00", ""])
+    assert sheet_store.get_user(9)["username"] == "nine"
+    assert sheet.calls["Users.col_values"] == 1
+    assert sheet_store.get_user(10) is None
+
+
+def test_sheet_index_recovers_from_moved_rows(sheet, sheet_store):
+    sheet_store.ensure_user(1, "one")
+    sheet_store.ensure_user(2, "two")
+    data = sheet.sheets["Users"].data
+    data[1], data[2] = data[2], data[1]  # sorted by hand
+    assert sheet_store.get_user(1)["username"] == "one"
+    assert sheet_store.get_user(2)["username"] == "two"
+
+
+def test_sheet_write_users_updates_known_and_appends_new(sheet, sheet_store):
+    sheet_store.ensure_user(1, "one")
+    sheet.calls.clear()
+    rows = [main.user_from_row(["1", "uno", "2026-01-01", "07:00", "21:00", ""]),
+            main.user_from_row(["3", "three", "2026-01-02", "08:00", "22:00", "UTC"])]
+    sheet_store.write_users(rows)
+    assert sheet.calls["Users.batch_update"] == 1 and sheet.calls["Users.append_rows"] == 1
+    assert sheet_store.get_user(1)["username"] == "uno"
+    assert sheet_store.get_user(3)["night_time"] == "22:00"
+    assert sheet.calls["Users.col_values"] == 0
+
+
+# --- InMemoryStore snapshots ---------------------------------------------------
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "snap.json")
+    s = main.InMemoryStore(path, snapshot_interval=0)
+    s.ensure_user(1, "one")
+    s.set_timezone(1, "UTC+06:30")
+    s.append_log({**_row("Beer x 2"), "beverage": "beer", "count": 2, "ml": None})
+    s.snapshot()
+    restored = main.InMemoryStore(path, snapshot_interval=0)
+    assert restored.get_user(1) == s.get_user(1)
+    assert restored.log[0]["beverage"] == "beer" and restored.log[0]["ml"] is None
+
+
+def test_snapshot_skipped_when_unchanged(tmp_path):
+    path = tmp_path / "snap.json"
+    s = main.InMemoryStore(str(path), snapshot_interval=0)
+    s.ensure_user(1, "one")
+    s.snapshot()
+    path.unlink()
+    s.ensure_user(1, "one")  # no real change
+    s.snapshot()
+    assert not path.exists()
+    s.set_last_sober(1, "2026-01-01")
+    s.snapshot()
+    assert path.exists()
+
+
+def test_snapshot_from_older_field_list(tmp_path):
+    path = tmp_path / "snap.json"
+    path.write_text(main.json.dumps({"user_fields": main.USER_FIELDS[:5], "log_fields": main.LOG_FIELDS[:4],
+                                     "users": [["1", "one", "2026-01-01", "07:00", "21:00"]],
+                                     "log": [["2026-01-01T20:00:00", "1", "one", "Beer x 2"]]}))
+    s = main.InMemoryStore(str(path), snapshot_interval=0)
+    assert s.get_user(1)["timezone"] == "" and s.get_user(1)["morning_time"] == "07:00"
+    assert s.log[0]["relapse_text"] == "Beer x 2"
+
+
+def test_snapshot_unreadable_starts_empty(tmp_path):
+    path = tmp_path / "snap.json"
+    path.write_text("{truncated")
+    assert main.InMemoryStore(str(path), snapshot_interval=0).users == {}
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Tests for the webhook fast path in main.py: dedup, throttling and routing."""
+
+import pytest
+
+import main
+
+
+# --- dedup and throttling ------------------------------------------------------
+def test_dedup_drops_repeats_within_window():
+    d = main.UpdateDedup(3)
+    assert [d.seen(i) for i in (1, 2, 1, 3)] == [False, False, True, False]
+    d.seen(4)  # evicts 1
+    assert d.seen(1) is False
+    assert d.seen(4) is True
+
+
+def test_dedup_forget_lets_retry_through():
+    d = main.UpdateDedup(10)
+    d.seen(7)
+    d.forget(7)
+    assert d.seen(7) is False
+
+
+def test_throttle_burst_then_notice_once():
+    t = main.ChatThrottle(rate=1, burst=3)
+    assert [t.allow(1) for _ in range(3)] == [(True, False)] * 3
+    assert t.allow(1) == (False, True)
+    assert t.allow(1) == (False, False)  # one notice per THROTTLE_NOTICE_INTERVAL
+    assert t.allow(2) == (True, False)  # other chats unaffected
+
+
+def test_throttle_refills_over_time():
+    t = main.ChatThrottle(rate=2, burst=2)
+    t.allow(1)
+    t.allow(1)
+    assert t.allow(1)[0] is False
+    t.buckets[1][1] -= 1.0  # one second passes: two tokens back
+    assert [t.allow(1)[0] for _ in range(3)] == [True, True, False]
+
+
+def test_throttle_evicts_least_recently_active():
+    t = main.ChatThrottle(rate=1, burst=1, max_chats=2)
+    t.allow(1)
+    t.allow(2)
+    t.allow(1)  # 1 is now the most recent
+    t.allow(3)
+    assert list(t.buckets) == [1, 3]
+
+
+# --- parsing and routing -------------------------------------------------------
+def _message(text, command=None, chat_id=5):
+    msg = {"message_id": 1, "date": 0, "chat": {"id": chat_id, "type": "private"}, "text": text}
+    if command:
+        msg["entities"] = [{"type": "bot_command", "offset": 0, "length": len(command)}]
+    return msg
+
+
+def test_parse_update():
+    assert main.parse_update(b'{"update_id": 1}') == {"update_id": 1}
+    assert main.parse_update(b"[1, 2]") is None
+    assert main.parse_update(b"not json") is None
+
+
+@pytest.mark.parametrize("data,expected", [
+    ({"update_id": 1, "message": _message("Beer x 2")}, "text"),
+    ({"update_id": 1, "message": _message("/status", "/status")}, "command"),
+    ({"update_id": 1, "message": _message("/Stats@MiraBot", "/Stats@MiraBot")}, "command"),
+    ({"update_id": 1, "message": _message("/unknown", "/unknown")}, None),
+    ({"update_id": 1, "message": {"message_id": 1, "chat": {"id": 5}, "sticker": {}}}, None),
+    ({"update_id": 1, "edited_message": _message("hi")}, None),
+])
+def test_route_update(data, expected):
+    assert main.route_update(data) == expected
+
+
+def test_ingest_rejects_wrong_secret(monkeypatch):
+    monkeypatch.setattr(main, "WEBHOOK_SECRET", "s3cret")
+    assert main.ingest_update(b"{}", "nope")[1] == 403
+    assert main.ingest_update(b"{}", None)[1] == 403
+
+
+@pytest.fixture
+def ready_bot(monkeypatch):
+    ready = main.threading.Event()
+    ready.set()
+    monkeypatch.setattr(main, "bot_ready", ready)
+    monkeypatch.setattr(main, "bot_app", object())
+    monkeypatch.setattr(main, "bot_loop", object())
+    monkeypatch.setattr(main, "dedup", main.UpdateDedup(16))
+    monkeypatch.setattr(main, "WEBHOOK_SECRET", None)
+    submitted = []
+    monkeypatch.setattr(main, "submit_update", lambda update: submitted.append(update) or True)
+    return submitted
+
+
+def test_ingest_drops_before_decoding(ready_bot, monkeypatch):
+    monkeypatch.setattr(main, "throttle", main.ChatThrottle(rate=0, burst=0))
+    unhandled = main.json.dumps({"update_id": 1, "edited_message": _message("hi")}).encode()
+    assert main.ingest_update(unhandled) == ("OK", 200, {})
+    assert main.ingest_update(unhandled) == ("OK", 200, {})  # duplicate
+    throttled = main.json.dumps({"update_id": 2, "message": _message("hi")}).encode()
+    body, status, headers = main.ingest_update(throttled)
+    assert status == 200 and headers == {"Content-Type": "application/json"}
+    assert main.json.loads(body)["method"] == "sendMessage"
+    assert ready_bot == []